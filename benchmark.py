@@ -0,0 +1,297 @@
+"""
+Benchmarks for retro_baselines.
+
+Measures the throughput of the hot paths: stepping and resetting the snake environments, the feedforward
+of WeightSets and Populations and whole generations of the GeneticModel. The results are written as json,
+so the results of two commits can be compared with --compare.
+"""
+import argparse
+import contextlib
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import gym
+import numpy as np
+
+import snake  # Required for registering games into gym
+from snake import constants
+from snake.env import SnakeEnv
+from snake.objects import constants as object_constants
+
+ENVIRONMENTS = ["Snake-v0", "Snake-v1", "Snake-v2", "SnakeGen-v0", "SnakeGen-v1"]
+
+# Results are compared on these fields, the other fields hold the measurements
+KEY_FIELDS = ["suite", "name", "board", "width", "height", "length", "hidden_layers", "population_size"]
+
+# Measurements where lower is better, for all other measurements higher is better
+LOWER_IS_BETTER = ["peak_bytes_per_step", "seconds_per_generation", "min_seconds_per_generation"]
+
+
+def benchmark_env(name, width, height, length=None, board="classic", steps=2000, seed=0):
+    """
+        Measure the steps and resets per second of a registered snake environment.
+
+        :param name: The id of the registered environment
+        :param width: The width of the board
+        :param height: The height of the board
+        :param length: The length the snake is grown to after every reset, the start length if None
+        :param board: The board engine, 'classic' or 'grid'
+        :param steps: The number of steps to measure
+        :param seed: The seed of the environment and the actions
+        :return: dict with the settings and the measurements
+    """
+    # The registered settings of the game, on a board of the given size
+    spec = gym.spec(name)
+    env = SnakeEnv(**dict(getattr(spec, "kwargs", None) or spec._kwargs, width=width, height=height, board=board))
+    env.seed(seed)
+    actions = np.random.default_rng(seed).integers(env.action_space.n, size=steps).tolist()
+
+    step_time, reset_time, resets = 0.0, 0.0, 0
+    env.reset()
+    _grow(env, length)
+    for action in actions:
+        start = time.perf_counter()
+        _, _, done, _ = env.step(action)
+        step_time += time.perf_counter() - start
+        if done:
+            start = time.perf_counter()
+            env.reset()
+            reset_time += time.perf_counter() - start
+            resets += 1
+            _grow(env, length)
+
+    # The peak memory of the steps is traced in a separate run, tracing slows down the steps
+    tracemalloc.start()
+    peak = 0
+    env.reset()
+    _grow(env, length)
+    for action in actions[:min(steps, 200)]:
+        current = _reset_peak()
+        _, _, done, _ = env.step(action)
+        peak += tracemalloc.get_traced_memory()[1] - current
+        if done:
+            env.reset()
+            _grow(env, length)
+    tracemalloc.stop()
+    env.close()
+
+    return dict(suite="env", name=name, board=board, width=width, height=height, length=length,
+                steps_per_sec=steps / step_time, resets_per_sec=resets / reset_time if resets else None,
+                peak_bytes_per_step=peak / min(steps, 200))
+
+
+def benchmark_feedforward(hidden_layers, population_size=500, repeat=200, seed=0):
+    """
+        Measure the feedforward throughput of a single WeightSet and of a whole Population.
+
+        :param hidden_layers: The sizes of the hidden layers, between the (24,) observation and the 5 actions
+        :param population_size: The number of agents of the Population
+        :param repeat: The number of feedforward passes to measure
+        :param seed: The seed of the weights and observations
+        :return: dict with the settings and the measurements
+    """
+    from models.tools.population import Population
+    from models.tools.weight_set import WeightSet
+
+    np.random.seed(seed)
+    layer_sizes = [24, *hidden_layers, constants.ACTION_SPACE]
+    weight_set = WeightSet(layer_sizes)
+    population = Population.from_weight_sets([WeightSet(layer_sizes) for _ in range(population_size)])
+    observations = np.random.randint(0, 20, size=(population_size, 24))
+
+    start = time.perf_counter()
+    for index in range(repeat):
+        weight_set.feedforward(observations[index % population_size])
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        population.feedforward(observations)
+    population_time = time.perf_counter() - start
+
+    return dict(suite="feedforward", name="WeightSet", hidden_layers=list(hidden_layers),
+                population_size=population_size, weight_set_per_sec=repeat / single_time,
+                population_agents_per_sec=repeat * population_size / population_time)
+
+
+def benchmark_generation(hidden_layers, population_size=100, generations=3, width=16, height=21, seed=0):
+    """
+        Measure the seconds per generation of the GeneticModel, with all games of a generation played at once.
+
+        :param hidden_layers: The sizes of the hidden layers
+        :param population_size: The number of agents of every generation
+        :param generations: The number of generations to measure
+        :param width: The width of the boards
+        :param height: The height of the boards
+        :param seed: The seed of the population and the games
+        :return: dict with the settings and the measurements
+    """
+    from models.genetic_model import GeneticModel
+    from models.tools.evaluation import Evaluator
+
+    # A headless model that does not log anything, so only the generations are measured
+    model_class = type("BenchmarkModel", (GeneticModel,), dict(
+        POPULATION_SIZE=population_size, HIDDEN_LAYERS=list(hidden_layers), HEADLESS=True, SAVE_BEST_WEIGHTSETS=False,
+        SAVE_GEN_SCORES=False, SAVE_CHECKPOINTS=False))
+    np.random.seed(seed)
+    model = model_class("SnakeGen-v1", (24,), gym.spaces.Discrete(constants.ACTION_SPACE))
+
+    # The model prints the scores of every generation, which should not end up between the results
+    times = []
+    evaluator = Evaluator(width, height, model.GAMES_PER_WEIGHTSET, seed=seed, cache_size=model.FITNESS_CACHE_SIZE,
+                          detect_cycles=model.DETECT_CYCLES)
+    with evaluator, contextlib.redirect_stdout(sys.stderr):
+        for _ in range(generations):
+            start = time.perf_counter()
+            model.run_generation(evaluator)
+            times.append(time.perf_counter() - start)
+    model.close()
+
+    return dict(suite="generation", name="GeneticModel", hidden_layers=list(hidden_layers),
+                population_size=population_size, width=width, height=height,
+                seconds_per_generation=float(np.mean(times)), min_seconds_per_generation=min(times))
+
+
+def compare(results, baseline, threshold=0.1):
+    """
+        Compare the measurements of two benchmark runs.
+
+        :param results: The results of the current run
+        :param baseline: The results of the run to compare with
+        :param threshold: The relative change that counts as a regression
+        :return: list of (key, measurement, baseline value, value, relative change, regression)
+    """
+    def key(result):
+        return json.dumps([result.get(field) for field in KEY_FIELDS])
+
+    baseline = {key(result): result for result in baseline}
+    rows = []
+    for result in results:
+        old = baseline.get(key(result))
+        if old is None:
+            continue
+        for measurement, value in result.items():
+            if measurement in KEY_FIELDS or not isinstance(value, float) or not old.get(measurement):
+                continue
+            change = value / old[measurement] - 1
+            worse = change > threshold if measurement in LOWER_IS_BETTER else change < -threshold
+            rows.append((key(result), measurement, old[measurement], value, change, worse))
+    return rows
+
+
+def _reset_peak():
+    """ Starts a new peak of the traced memory and returns the traced memory the peak is counted from.  """
+    if hasattr(tracemalloc, "reset_peak"):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        return current
+    # reset_peak is new in Python 3.9, restarting the trace forgets the memory that was traced before
+    tracemalloc.stop()
+    tracemalloc.start()
+    return 0
+
+
+def _grow(env, length):
+    """ Grows the first snake of a reset environment to the given length, nothing happens if length is None.  """
+    if length is not None:
+        env.unwrapped.env.board.grow(0, length - object_constants.LEN_SNAKE_START)
+
+
+def _metadata():
+    """ Returns the versions and commit the benchmarks ran on.  """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return dict(commit=commit or None, python=platform.python_version(), numpy=np.__version__,
+                platform=platform.platform(), time=time.strftime("%Y-%m-%dT%H:%M:%S"))
+
+
+def _size(value):
+    """ Parses a board size like 16x21.  """
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+def _layers(value):
+    """ Parses hidden layer sizes like 18,18,16.  """
+    return [int(size) for size in value.split(",") if size]
+
+
+def _args(argv=None):
+    """
+    Command line argument parser.
+    """
+    parser = argparse.ArgumentParser(description="Measure the throughput of the environments and models.")
+    parser.add_argument("-s", "--suites", nargs="+", choices=["env", "feedforward", "generation"],
+                        default=["env", "feedforward", "generation"], help="Choose which benchmarks to run.")
+    parser.add_argument("-e", "--envs", nargs="+", default=ENVIRONMENTS,
+                        help="Choose the environments to step. Default is all snake environments.")
+    parser.add_argument("-b", "--boards", nargs="+", choices=["classic", "grid"], default=["classic", "grid"],
+                        help="Choose the board engines to step.")
+    parser.add_argument("--sizes", nargs="+", type=_size, default=[(16, 21), (32, 42)],
+                        help="Choose the board sizes as WIDTHxHEIGHT. Default is 16x21 32x42.")
+    parser.add_argument("--lengths", nargs="+", type=int, default=[None, 50],
+                        help="Choose the snake lengths the snakes are grown to. Default is the start length and 50.")
+    parser.add_argument("--hidden", nargs="+", type=_layers, default=[[18, 18, 16], [64, 64]],
+                        help="Choose the hidden layer sizes as comma separated lists. Default is 18,18,16 64,64.")
+    parser.add_argument("--steps", type=int, default=2000, help="Choose how many steps to measure per environment.")
+    parser.add_argument("--population", type=int, default=100,
+                        help="Choose the population size of the generation benchmark. Default is 100.")
+    parser.add_argument("--generations", type=int, default=3,
+                        help="Choose how many generations to measure. Default is 3.")
+    parser.add_argument("-o", "--output", help="Choose the json file to write the results to. Default is stdout.")
+    parser.add_argument("-c", "--compare", help="Choose a json file with earlier results to compare with.")
+    parser.add_argument("-t", "--threshold", type=float, default=0.1,
+                        help="Choose the relative change that counts as a regression. Default is 0.1.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+        Runs the benchmarks and writes the results.
+
+        :return: int
+            The exit code, 1 if a regression was found while comparing
+    """
+    args = _args(argv)
+    runs = []
+    if "env" in args.suites:
+        runs += [(benchmark_env, dict(name=name, width=width, height=height, length=length, board=board,
+                                      steps=args.steps))
+                 for name in args.envs for board in args.boards for width, height in args.sizes
+                 for length in args.lengths]
+    if "feedforward" in args.suites:
+        runs += [(benchmark_feedforward, dict(hidden_layers=hidden)) for hidden in args.hidden]
+    if "generation" in args.suites:
+        runs += [(benchmark_generation, dict(hidden_layers=hidden, population_size=args.population,
+                                             generations=args.generations)) for hidden in args.hidden]
+
+    results = []
+    for benchmark, kwargs in runs:
+        print(f"{benchmark.__name__}({', '.join(f'{k}={v}' for k, v in kwargs.items())})", file=sys.stderr)
+        results.append(benchmark(**kwargs))
+
+    output = json.dumps(dict(metadata=_metadata(), results=results), indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as file:
+            rows = compare(results, json.load(file)["results"], args.threshold)
+        for key, measurement, old, new, change, worse in rows:
+            print(f"{'REGRESSION' if worse else 'ok':10} {key} {measurement}: {old:.4g} -> {new:.4g} "
+                  f"({change:+.1%})", file=sys.stderr)
+        return int(any(row[-1] for row in rows))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
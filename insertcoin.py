@@ -10,6 +10,8 @@ import numpy as np
 import importlib
 
 import snake  # Required for registering games into gym
+from models.base_model import BaseModel
+from models.tools.evaluation import Evaluator, PoolEvaluator
 from tools.progressbar import Progress
 from tools.finder import model_finder
 
@@ -23,14 +25,28 @@ class InsertCoin:
 
     def __init__(self, run_main=True):
         game_name, game_mode, render, step_limit, game_limit, clip, log = self._args()
-        if game_name not in self._get_all_gym_environments_names():
+        try:
+            gym.spec(game_name)
+        except gym.error.Error:
+            # Only list all games if the game is not found
             valid = '\n  '.join(self._get_all_gym_environments_names())
             raise ValueError(f"Game '{game_name}' not inside gym valid options:\n  {valid}")
 
         env = gym.make(game_name)
+        if self.headless:
+            BaseModel.HEADLESS = True
         if run_main:
-            self._main_loop(self._model(game_mode, game_name, self._input_shape(env), env.action_space),
-                            step_limit, game_limit, env, render, clip, log)
+            model = self._model(game_mode, game_name, self._input_shape(env), env.action_space)
+            try:
+                if self.resume:
+                    self._resume(model, self.resume)
+                if self.batch or self.workers > 1:
+                    self._batch_loop(model, game_limit, env, self.workers)
+                else:
+                    self._main_loop(model, step_limit, game_limit, env, render, clip, log)
+            finally:
+                # The loops end with exit, the model finishes its work before the process stops
+                model.close()
 
     @staticmethod
     def _main_loop(model, step_limit, game_limit, env, render, clip, log):
@@ -96,6 +112,55 @@ class InsertCoin:
                     print("Reached total step limit of: " + str(step_limit))
                     exit(0)
 
+    @staticmethod
+    def _batch_loop(model, game_limit, env, workers=1):
+        """
+            Run all games of a generation at once, until the maximum number of games is reached.
+
+            Only models that can play a whole generation at once (run_generation) are supported and only
+            on the snake games with the genetic observation.
+
+            :param model: Handle for model to run this snake
+            :param game_limit: Maximum amount of games per run.
+            :param env: Environment handle for the snake.
+            :param workers: Number of processes that play the games of a generation.
+        """
+        if not hasattr(model, "run_generation"):
+            raise ValueError("The selected model can not play games in batches")
+        if getattr(env.unwrapped, "_obs_type", None) != "gen":
+            raise ValueError("Games can only be played in batches on the SnakeGen games")
+
+        width, height = env.unwrapped.env.board.get_screen_dimensions()
+        if workers > 1:
+            evaluator = PoolEvaluator(workers, width, height, model.GAMES_PER_WEIGHTSET, model.layer_sizes,
+                                      model.POPULATION_SIZE, cache_size=model.FITNESS_CACHE_SIZE,
+                                      racing=model.racing(), detect_cycles=model.DETECT_CYCLES)
+        else:
+            evaluator = Evaluator(width, height, model.GAMES_PER_WEIGHTSET, cache_size=model.FITNESS_CACHE_SIZE,
+                                  racing=model.racing(), detect_cycles=model.DETECT_CYCLES)
+
+        games = 0
+        with evaluator:
+            while not 0 < game_limit <= games:
+                model.run_generation(evaluator)
+                games += model.POPULATION_SIZE * model.GAMES_PER_WEIGHTSET
+
+        print("Maximum number of games reached: " + str(game_limit))
+        exit(0)
+
+    @staticmethod
+    def _resume(model, path):
+        """
+            Continue the run of a model from a checkpoint.
+
+            :param model: Handle for model to run this snake
+            :param path: Path of the checkpoint saved by the model
+        """
+        if not hasattr(model, "resume"):
+            raise ValueError("The selected model can not be resumed from a checkpoint")
+        model.resume(path)
+        print("Resumed from checkpoint: " + str(path))
+
     @staticmethod
     def _input_shape(env):
         if hasattr(env.reset(), "size"):
@@ -110,9 +175,9 @@ class InsertCoin:
         Command line argument parser.
         """
         parser = argparse.ArgumentParser()
-        available_games = self._get_all_environment_names()
         parser.add_argument("-g", "--game",
-                            help="Choose from available games: " + str(available_games) + ". Default is 'Snake-v0'.",
+                            help="Choose from the available gym games, all games are listed if the game does not "
+                                 "exist. Default is 'Snake-v0'.",
                             default="Snake-v0")
         parser.add_argument("-m", "--model", help="Choose from available models: random_model."
                                                   " Default is 'random_model'.", default="random_model")
@@ -129,13 +194,37 @@ class InsertCoin:
         parser.add_argument("-l", "--log",
                             help="Choose whether we should save game results per game. Default is 'False'",
                             action="store_true")
+        parser.add_argument("-b", "--batch",
+                            help="Include to play all games of a generation at once (genetic_model on SnakeGen "
+                                 "games only).",
+                            action="store_true")
+        parser.add_argument("-w", "--workers",
+                            help="Choose how many processes play the games of a generation, implies --batch. "
+                                 "Default is 1.", default=1, type=int)
+        parser.add_argument("--resume",
+                            help="Choose a checkpoint to continue the run of the model from (genetic_model only, "
+                                 "see logs/checkpoints). Default is no checkpoint.", default=None)
+        parser.add_argument("--headless",
+                            help="Include to run without a display, models never render, plot or replay games and "
+                                 "never import pygame or matplotlib.",
+                            action="store_true")
         args = parser.parse_args()
+        if args.headless and args.render:
+            parser.error("--render can not be combined with --headless")
+        self.batch = args.batch
+        self.workers = args.workers
+        self.resume = args.resume
+        self.headless = args.headless
 
         print("Selected game: " + str(args.game))
         print("Selected model: " + str(args.model))
         print("Should render: " + str(args.render))
+        print("Headless: " + str(args.headless))
         print("Should clip: " + str(args.clip))
         print("Should log: " + str(args.log))
+        print("Play in batches: " + str(args.batch))
+        print("Workers: " + str(args.workers))
+        print("Resume from: " + str(args.resume))
         print("Total step limit: " + str(args.total_step_limit))
         print("Total game limit: " + str(args.total_game_limit))
 
@@ -17,6 +17,8 @@ class BaseModel(metaclass=ABCMeta):
         The base model class defines the interface for models in retro_baselines.
     """
 
+    HEADLESS = False  # Whether the models run without a display, so they never render, plot or replay games
+
     @abc.abstractmethod
     def __init__(self, game_name: str, input_shape: Union[tuple, list], action_space: int, logger_path: str):
         """
@@ -83,3 +85,10 @@ class BaseModel(metaclass=ABCMeta):
             :param run: Current run number.
         """
         pass
+
+    def close(self):
+        """
+            Called when the run of the model ends.
+            Models that save or log in the background finish their work here.
+        """
+        pass
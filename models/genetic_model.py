@@ -7,13 +7,14 @@
     More elaborately, the Genetic Model is a genetic algorithm that uses a population of many agents over multiple
     generations, improving them using elites, cross breeding and mutation in the generation of the next population.
 """
-import json
 import os
 
-import matplotlib.pyplot as plt
 import numpy as np
 from models.base_model import BaseModel
-from models.tools.play_weightset import PlayWeightSet
+from models.tools.checkpoint import CheckpointWriter, get_random_state, load_checkpoint, set_random_state
+from models.tools.evaluation import Racing
+from models.tools.population import Population
+from models.tools.reporter import StatsReporter
 from models.tools.weight_set import WeightSet
 
 
@@ -36,17 +37,28 @@ class GeneticModel(BaseModel):
     # mutate with a random value
     HIDDEN_LAYERS = [18, 18, 16]  # The sizes of the hidden layers
     GAMES_PER_WEIGHTSET = 4  # Number of games each WeightSet plays in each generation
-    PLOT_STATS = True  # Whether to plot stats of each generation
+    FITNESS_CACHE_SIZE = 1000  # Number of WeightSets whose game scores are reused when they return unchanged (like
+    # elites) in a later generation, only when all games of a generation are played at once. 0 replays all WeightSets.
+    RACING_KEEP_FRACTION = 1.0  # Fraction of the WeightSets that keeps playing after every round of games, the others
+    # keep the average score of the games they played so far. 1 plays all games of every WeightSet.
+    RACING_MIN_GAMES = 1  # Number of games every WeightSet plays before it can stop playing early
+    RACING_TOLERANCE = 0.0  # WeightSets that score at most this much below the kept fraction keep playing too
+    DETECT_CYCLES = True  # Whether to end games of WeightSets that loop without eating right away, with the score they
+    # would get when their life is up. Only when all games of a generation are played at once.
+    PLOT_STATS = True  # Whether to plot stats of each generation (to logs/scores/scores.png)
     SAVE_BEST_WEIGHTSETS = True  # Whether to save the best WeightSets of each generation
-    SAVE_GEN_SCORES = True  # Whether to save logs of the generation scores of each generation
+    SAVE_GEN_SCORES = True  # Whether to log the scores of each generation (to logs/scores/scores.csv)
+    SAVE_CHECKPOINTS = True  # Whether to save a checkpoint of each finished generation to resume the run from
     RENDER_BEST_WEIGHTSETS = True  # Whether to render (new) games with the best WeightSet of the last finished
     # generation.
+    # PLOT_STATS and RENDER_BEST_WEIGHTSETS are turned off in a headless run (see BaseModel.HEADLESS)
 
     # Directories of logging information (used only if above flags are enabled)
     dir_current = os.path.dirname(os.path.abspath(__file__))
     dir_logs = os.path.join(dir_current, "..", "logs")
     dir_scores = os.path.join(dir_logs, 'scores')
     dir_weightsets = os.path.join(dir_logs, 'weightsets')
+    dir_checkpoints = os.path.join(dir_logs, 'checkpoints')
 
     def __init__(self, game_name, input_shape, action_space, logger_path="output/genetic_model"):
         """
@@ -59,38 +71,41 @@ class GeneticModel(BaseModel):
         self.generation_id = 0  # The generation number we are currently in
         self.generation_outcomes = list()  # Stores results for each generation
         self.weight_set_score = list()  # The scores of the GAMES_PER_GENERATION games played with one WeightSet
+        self.racing_scores = list()  # When racing, the scores of the games every WeightSet played in this generation
+        self.racing_ids = list()  # When racing, the WeightSets that play in the current round
 
         # Calculate sizes of all layers of the neural net
         input_size = int(np.prod(input_shape))
         output_size = action_space.n
-        layer_sizes = [input_size, *self.HIDDEN_LAYERS, output_size]
+        self.layer_sizes = [input_size, *self.HIDDEN_LAYERS, output_size]
 
         # Populate with POPULATION_SIZE nets / WeightSets
         for i in range(self.POPULATION_SIZE):
-            self.population.append(WeightSet(layer_sizes))
+            self.population.append(WeightSet(self.layer_sizes))
 
         # If enabled, create a replayer that plays games with the best WeightSets of the previous generation
-        if self.RENDER_BEST_WEIGHTSETS:
+        # The replayer is only imported when it is used, so a headless run never loads pygame
+        self.replayer = None
+        if self.RENDER_BEST_WEIGHTSETS and not self.HEADLESS:
+            from models.tools.play_weightset import PlayWeightSet
             self.replayer = PlayWeightSet(game_name, self.population[0])
             self.replayer.start()
 
-        # Prevent any plots from making the terminal hang
-        if self.PLOT_STATS:
-            plt.ion()
+        # Checkpoints are written on a background thread, the last ones are written when the model is closed
+        self.checkpoint_writer = CheckpointWriter()
 
         # If saving certain logs, make sure the folders for it exists
-        if self.SAVE_BEST_WEIGHTSETS or self.SAVE_GEN_SCORES:
-            # Make sure the LOGS folder exists
-            if not os.path.exists(self.dir_logs):
-                os.makedirs(self.dir_logs)
-            if self.SAVE_GEN_SCORES:
-                # Make sure the SCORES folder exists
-                if not os.path.exists(self.dir_scores):
-                    os.makedirs(self.dir_scores)
-            if self.SAVE_GEN_SCORES:
-                # Make sure the WEIGHTSETS folder exists
-                if not os.path.exists(self.dir_weightsets):
-                    os.makedirs(self.dir_weightsets)
+        plot_stats = self.PLOT_STATS and not self.HEADLESS
+        if self.SAVE_GEN_SCORES or plot_stats:
+            os.makedirs(self.dir_scores, exist_ok=True)
+        if self.SAVE_BEST_WEIGHTSETS:
+            os.makedirs(self.dir_weightsets, exist_ok=True)
+
+        # Logging, plotting and saving the results of every generation is done on a background thread
+        self.reporter = StatsReporter(
+            scores_path=os.path.join(self.dir_scores, 'scores.csv') if self.SAVE_GEN_SCORES else None,
+            plot_path=os.path.join(self.dir_scores, 'scores.png') if plot_stats else None,
+            weightsets_dir=self.dir_weightsets if self.SAVE_BEST_WEIGHTSETS else None)
 
         super().__init__(game_name, input_shape, action_space, logger_path)
 
@@ -148,6 +163,11 @@ class GeneticModel(BaseModel):
             :param step: Amount of steps this run took.
             :param run: Current run number.
         """
+        racing = self.racing()
+        if racing is not None:
+            self.finalize_racing_game(score, racing)
+            return
+
         # Save the score the currently running WeightSet scored in the last game
         self.weight_set_score.append(score)
 
@@ -168,6 +188,79 @@ class GeneticModel(BaseModel):
                 self.generation_id += 1
                 self.current_weight_set_id = 0
 
+    def finalize_racing_game(self, score, racing):
+        """
+            Handle the finishing of a game run when racing, by selecting the WeightSet that will run next game.
+
+            The WeightSets play their games in rounds, in every round each racing WeightSet plays one game.
+            After a round only the WeightSets kept by the racing play the next round, the others keep the
+            average score of the games they played so far. If no WeightSets are left, compute a new generation.
+
+            :param score: Score of this game run.
+            :param racing: Racing that selects the WeightSets of the next round.
+        """
+        # In the first round all WeightSets play
+        if not self.racing_scores:
+            self.racing_scores = [list() for _ in range(self.POPULATION_SIZE)]
+            self.racing_ids = list(range(self.POPULATION_SIZE))
+        self.racing_scores[self.current_weight_set_id].append(score)
+
+        # Select the next WeightSet of this round
+        position = self.racing_ids.index(self.current_weight_set_id) + 1
+        if position < len(self.racing_ids):
+            self.current_weight_set_id = self.racing_ids[position]
+            return
+
+        # Select the WeightSets that did not play all their games and are still promising for the next round
+        ids = np.array([index for index in self.racing_ids
+                        if len(self.racing_scores[index]) < self.GAMES_PER_WEIGHTSET], dtype=int)
+        ids = ids[racing.keep([self.racing_scores[index] for index in ids])]
+        if len(ids):
+            self.racing_ids = ids.tolist()
+            self.current_weight_set_id = self.racing_ids[0]
+            return
+
+        # All WeightSets finished racing, generate a new generation of WeightSets and start from the first one again
+        self.scores = [np.average(each) for each in self.racing_scores]
+        self.racing_scores = list()
+        self.finalize_generation()
+        self.generation_id += 1
+        self.current_weight_set_id = 0
+
+    def close(self):
+        """
+            Write the queued checkpoints and results and stop the background threads.
+        """
+        self.checkpoint_writer.close()
+        self.reporter.close()
+
+    def racing(self):
+        """
+            Returns the Racing that stops playing hopeless WeightSets early, or None if every WeightSet plays all
+            GAMES_PER_WEIGHTSET games.
+        """
+        if self.RACING_KEEP_FRACTION >= 1:
+            return None
+        return Racing(self.RACING_KEEP_FRACTION, self.RACING_MIN_GAMES, self.RACING_TOLERANCE)
+
+    def run_generation(self, evaluator):
+        """
+            Play all games of the current generation at once and finalize the generation.
+
+            Every WeightSet plays the games of the evaluator on its own boards of a vectorized environment,
+            all WeightSets choose their actions in a single feedforward pass of the stacked population.
+
+            :param evaluator: Evaluator or PoolEvaluator that plays the games of the population
+        """
+        population = Population.from_weight_sets(self.population)
+        self.scores = evaluator.evaluate(population).tolist()
+        self.weight_set_score = list()
+        self.racing_scores = list()
+
+        self.finalize_generation()
+        self.generation_id += 1
+        self.current_weight_set_id = 0
+
     def finalize_generation(self):
         """
             Finalize a generation by generating the population for the next generation and optionally
@@ -187,26 +280,21 @@ class GeneticModel(BaseModel):
               f"with scores [MIN, 25%Q, AVG, 75%Q, MAX] = [{', '.join(stats_formatted)}]")
         self.generation_outcomes.append(stats)
 
-        # If enabled, save the stats
-        if self.SAVE_GEN_SCORES:
-            self.save_stats(stats)
-
         # Find best WeightSet of this generation
         best_index = np.argmax(self.scores)
         best_weightset = self.population[best_index]
 
-        # If enabled, save the best WeightSet
-        if self.SAVE_BEST_WEIGHTSETS:
-            best_weightset.save(
-                os.path.join('logs', 'weightsets', f'weightset_gen_{self.generation_id}.pickle'))
+        # Log, plot and save (if enabled) the results in the background
+        self.reporter.report(self.generation_id, stats,
+                             best_weightset.clone() if self.SAVE_BEST_WEIGHTSETS else None)
 
         # If enabled, update that a new WeightSet of last generation will now be live-played
-        if self.RENDER_BEST_WEIGHTSETS:
+        if self.replayer is not None:
             self.replayer.update_weightset(best_weightset.clone())
 
-        # If enabled, plot the stats over all generations if wanted
-        if self.PLOT_STATS:
-            self.plot_stats()
+        # If enabled, save the finished generation before it is replaced
+        if self.SAVE_CHECKPOINTS:
+            self.save_checkpoint(os.path.join(self.dir_checkpoints, 'checkpoint.npz'))
 
         # Generate the next generation's population
         self.generate_next_generation()
@@ -216,12 +304,11 @@ class GeneticModel(BaseModel):
             With the current generation and the achieved scores of each WeightSet, construct a new set of WeightSets
             to use for the next generation.
         """
-        # Create a list for the new population we are creating
-        new_population = list()
+        # Stack the population, so the next generation is bred with a few operations on the parameter matrix
+        population = Population.from_weight_sets(self.population)
 
         # Sort the population based on the achieved scores
-        sorted_population = [weight_set for _, weight_set in sorted(zip(self.scores, self.population),
-                                                                    key=lambda pair: pair[0], reverse=True)]
+        order = np.argsort(-np.asarray(self.scores), kind='stable')
 
         # Calculate how many of elites, crossovers and mutations we will have in the new population
         num_elites = int(self.POPULATION_SIZE * self.ELITE_FRACTION)
@@ -229,7 +316,7 @@ class GeneticModel(BaseModel):
         num_mutations = self.POPULATION_SIZE - num_elites - num_crossovers
 
         # Let the best elite percentage directly carry over
-        new_population.extend(sorted_population[:num_elites])
+        elites = population.select(order[:num_elites])
 
         # Scale the scores so that together they sum to 1 (used to then sample randomly from it)
         if np.sum(self.scores) <= 0:
@@ -239,50 +326,71 @@ class GeneticModel(BaseModel):
             scaled_scores = np.array(self.scores) / np.sum(self.scores)
 
         # Cross-overs from 2 parents sampled with probability linked to their score
-        for parent1, parent2 in np.random.choice(self.population, p=scaled_scores, size=(num_crossovers, 2)):
-            # New child from crossover
-            child = WeightSet.crossbreed(parent1, parent2)
-
-            # Also mutate a little bit if wanted
-            if self.CROSSOVER_MUTATION_PROBABILITY > 0:
-                child.mutate(self.CROSSOVER_MUTATION_PROBABILITY)
+        parents = np.random.choice(len(population), p=scaled_scores, size=(num_crossovers, 2))
+        children = population.crossbreed(parents[:, 0], parents[:, 1])
 
-            new_population.append(child)
+        # Also mutate a little bit if wanted
+        if self.CROSSOVER_MUTATION_PROBABILITY > 0:
+            children.mutate(self.CROSSOVER_MUTATION_PROBABILITY)
 
         # Mutate the remainder from current WeightSets sampled with probability linked to their score
-        for parent in np.random.choice(self.population, p=scaled_scores, size=num_mutations):
-            mutant: WeightSet = parent.clone()
-            mutant.mutate(self.MUTATION_PROBABILITY)
-            new_population.append(mutant)
+        mutants = population.select(np.random.choice(len(population), p=scaled_scores, size=num_mutations))
+        mutants.mutate(self.MUTATION_PROBABILITY)
+
+        # Every WeightSet of the new population is a view on one new parameter matrix
+        new_population = Population(population.layer_sizes,
+                                    np.concatenate([elites.params, children.params, mutants.params]),
+                                    activation=population.activation_name)
+        new_population = [new_population.weight_set(index, copy=False) for index in range(len(new_population))]
 
         # Replace the old generation's population with the new population (which now does not have a tested score yet)
         self.population = new_population
         self.scores = list()
 
-    def plot_stats(self):
+    def save_checkpoint(self, path):
         """
-            Plot the statistics over all generations
-        """
-        # Plot a line for each statistic
-        x = range(len(self.generation_outcomes))
-        for i in range(len(self.generation_outcomes[0])):
-            y = [entry[i] for entry in self.generation_outcomes]
-            plt.plot(x, y)
+            Save the finished generation in the background, see resume.
 
-        # Draw and pause so the graph can be interacted with each update
-        plt.draw()
-        plt.pause(0.0001)
+            The checkpoint holds the parameter matrix of the population, the scores it achieved, the stats of all
+            generations so far and the state of the random generator that breeds the next generation.
 
-    def save_stats(self, stats):
+            :param path: Path of the .npz file, an existing checkpoint is replaced
         """
-            Save stats of the current generation to a file in json format
+        population = Population.from_weight_sets(self.population)
+        self.checkpoint_writer.save(path, params=population.params, layer_sizes=np.array(self.layer_sizes),
+                                    activation=np.array(population.activation_name),
+                                    scores=np.array(self.scores, dtype=np.float64),
+                                    generation_outcomes=np.array(self.generation_outcomes,
+                                                                 dtype=np.float64).reshape(-1, 5),
+                                    generation_id=np.array(self.generation_id), **get_random_state())
+
+    def resume(self, path):
         """
-        # Convert stats from np.int64 to normal integers
-        stats_ints = [int(stat) for stat in stats]
+            Continue a run from a checkpoint saved by save_checkpoint.
 
-        # Find the correct file
-        file_path = os.path.join(self.dir_scores, f'scores_gen_{self.generation_id}.json')
+            The population of the checkpoint is restored together with its scores, after which the next
+            generation is bred just like it would have been in the run that saved the checkpoint.
 
-        # Output the stats to the file
-        with open(file_path, 'w') as file:
-            file.write(json.dumps(stats_ints))
+            :param path: Path of the .npz file
+        """
+        checkpoint = load_checkpoint(path)
+        if checkpoint['layer_sizes'].tolist() != self.layer_sizes:
+            raise ValueError(f"The checkpoint has layer sizes {checkpoint['layer_sizes'].tolist()}, "
+                             f"but the model has layer sizes {self.layer_sizes}")
+        if len(checkpoint['params']) != self.POPULATION_SIZE:
+            raise ValueError(f"The checkpoint has a population of {len(checkpoint['params'])}, "
+                             f"but the model has a population of {self.POPULATION_SIZE}")
+
+        population = Population(self.layer_sizes, checkpoint['params'], activation=str(checkpoint['activation']))
+        self.population = [population.weight_set(index, copy=False) for index in range(len(population))]
+        self.scores = checkpoint['scores'].tolist()
+        self.generation_outcomes = checkpoint['generation_outcomes'].tolist()
+        self.generation_id = int(checkpoint['generation_id'])
+        set_random_state(checkpoint)
+
+        # Breed the next generation from the restored one
+        self.generate_next_generation()
+        self.generation_id += 1
+        self.current_weight_set_id = 0
+        self.weight_set_score = list()
+        self.racing_scores = list()
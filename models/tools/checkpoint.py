@@ -0,0 +1,75 @@
+"""
+Checkpoints of a whole generation.
+
+A checkpoint is a compressed .npz file with plain arrays only, so it can be loaded without pickle.
+Checkpoints are written on a background thread, so the next generation does not wait for the disk.
+Every checkpoint is first written to a temporary file that is then moved in place, a crash while
+writing leaves the previous checkpoint intact.
+"""
+import os
+
+import numpy as np
+from models.tools.queue_thread import QueueThread
+
+
+def save_checkpoint(path, **arrays):
+    """
+        Atomically write the arrays to a compressed .npz file.
+
+        :param path: str
+            The file to write, the folder is created if it does not exist
+        :param arrays: NDArrays
+            The arrays to store under their keyword
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'wb') as file:
+        np.savez_compressed(file, **arrays)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+def load_checkpoint(path):
+    """
+        Read all arrays of a checkpoint.
+
+        :param path: str
+            The .npz file written by save_checkpoint
+        :return: dict with the arrays of the checkpoint
+    """
+    with np.load(path, allow_pickle=False) as data:
+        return {name: data[name] for name in data.files}
+
+
+def get_random_state():
+    """ Returns the state of the global numpy random generator as plain arrays.  """
+    _, keys, position, has_gauss, cached_gaussian = np.random.get_state()
+    return dict(random_keys=keys, random_position=np.array(position),
+                random_gauss=np.array([has_gauss, cached_gaussian], dtype=np.float64))
+
+
+def set_random_state(arrays):
+    """ Restores the state of the global numpy random generator stored by get_random_state.  """
+    has_gauss, cached_gaussian = arrays['random_gauss']
+    np.random.set_state(('MT19937', arrays['random_keys'], int(arrays['random_position']),
+                         int(has_gauss), float(cached_gaussian)))
+
+
+class CheckpointWriter(QueueThread):
+    """
+        Thread that writes the checkpoints in the order they are saved.
+
+        The arrays are written as given, so they should not be changed after saving them.
+        An error while writing is raised again on the next save, flush or close.
+    """
+
+    def save(self, path, **arrays):
+        """
+            Queue the arrays to be written to path, see save_checkpoint.
+        """
+        self.submit(path, arrays)
+
+    def handle(self, path, arrays):
+        """ Writes a single checkpoint.  """
+        save_checkpoint(path, **arrays)
@@ -1,10 +1,5 @@
 import numpy as np
-from tools.suppress import suppress_stdout
-
-# This suppresses the welcome message from pygame
-# Hello from the pygame community. https://www.pygame.org/contribute.html
-with suppress_stdout():
-    import pygame
+from tools.lazy_import import import_pygame
 
 
 class Image:
@@ -24,6 +19,7 @@ class Image:
 
     def _init_pygame(self, width, height, channels, scale, caption):
         """ Helper function to restart pygame if env is closed and you want to reset it.  """
+        pygame = import_pygame()
         pygame.init()
         pygame.display.set_caption(caption)
 
@@ -37,6 +33,7 @@ class Image:
             :return boolean
                 It is True when the pygame window is closed.
         """
+        pygame = import_pygame()
         obs = obs.transpose(1, 0, 2)
 
         # Lazy setup, only when called at rendering.
@@ -83,5 +80,6 @@ class Image:
 
     def close(self):
         """ Closes pygame and reset the setup value, so it can be restarted on a reset.  """
-        pygame.quit()
+        if self._setup:
+            import_pygame().quit()
         self._setup = not self._setup
@@ -0,0 +1,369 @@
+"""
+Evaluation of a whole population at once.
+
+Instead of playing the games of every agent one after another, all games of a generation are
+played at the same time on a SnakeVecEnv, with a single feedforward pass of the Population per step.
+The PoolEvaluator splits the population over worker processes that each play their part of the games.
+With Racing, the agents play their games in rounds and the hopeless agents stop playing early.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from models.tools.fitness_cache import FitnessCache
+from models.tools.population import Population
+from snake import seeding
+from snake.vec_env import SnakeVecEnv
+
+# State of a worker process of the PoolEvaluator, set once by _init_worker
+_worker = dict()
+
+
+def evaluate_population(population: Population, env, games_per_weight_set, max_steps=100000):
+    """
+        Play games_per_weight_set games with every agent of the population and return the average scores.
+
+        :param population: Population of agents to evaluate
+        :param env: SnakeVecEnv with (at least) len(population) * games_per_weight_set games
+        :param games_per_weight_set: Number of games every agent plays
+        :param max_steps: Maximum number of steps of a single game
+        :return: NDArray with the average score of every agent
+    """
+    return play_population(population, env, games_per_weight_set, max_steps).mean(axis=1)
+
+
+def play_population(population: Population, env, games_per_weight_set, max_steps=100000):
+    """
+        Play games_per_weight_set games with every agent of the population and return the score of every game.
+
+        :param population: Population of agents to evaluate
+        :param env: SnakeVecEnv with (at least) len(population) * games_per_weight_set games
+        :param games_per_weight_set: Number of games every agent plays
+        :param max_steps: Maximum number of steps of a single game
+        :return: NDArray of shape (len(population), games_per_weight_set) with the score of every game
+    """
+    n_games = len(population) * games_per_weight_set
+    assert env.num_envs >= n_games, 'The environment has to hold all games of the population'
+
+    # Game i is played by agent i // games_per_weight_set
+    obs = env.reset()[:n_games]
+    scores = np.zeros(n_games)
+    playing = np.arange(n_games)
+    observations = np.zeros((len(population), games_per_weight_set, obs.shape[1]), dtype=obs.dtype)
+
+    for _ in range(max_steps):
+        # Agents whose games are all finished still get a forward pass on their last observations
+        observations.reshape(n_games, -1)[playing] = obs
+        actions = population.feedforward(observations).reshape(-1)[playing]
+
+        # Only step the games that are still running, finished games are never played again
+        obs, rewards, dones, _ = env.step(actions, envs=playing)
+        scores[playing] += rewards
+        playing = playing[~dones]
+        obs = obs[~dones]
+        if not len(playing):
+            break
+
+    return scores.reshape(len(population), games_per_weight_set)
+
+
+class Racing:
+    """
+        Successive halving of the games of a population.
+
+        Instead of playing all games of every agent, the agents play their games in rounds of a single game.
+        After every round only the promising fraction of the agents that are still racing keeps playing,
+        the other agents keep the average score of the games they played so far.
+
+        :param keep_fraction: float
+            The fraction of the racing agents that plays the next round, 1 plays all games of every agent
+        :param min_games: int
+            The number of games every agent plays before it can drop out
+        :param tolerance: float
+            Agents whose average score is at most this much below the score of the kept fraction keep playing too
+    """
+
+    def __init__(self, keep_fraction=0.5, min_games=1, tolerance=0.0):
+        assert 0 < keep_fraction <= 1, 'The keep fraction has to be in (0, 1]'
+        assert min_games >= 1, 'Every agent has to play at least one game'
+        self.keep_fraction = keep_fraction
+        self.min_games = min_games
+        self.tolerance = tolerance
+
+    def keep(self, history):
+        """
+            Returns which racing agents play the next round.
+
+            :param history: list with the scores of the games every racing agent played so far
+            :return: NDArray of bool
+        """
+        if not len(history):
+            return np.zeros(0, dtype=bool)
+        means = np.array([np.mean(each) for each in history])
+        played = np.array([len(each) for each in history])
+        cutoff = np.quantile(means, 1 - self.keep_fraction)
+        return (played < self.min_games) | (means >= cutoff - self.tolerance)
+
+
+class Evaluator:
+    """
+        Plays all games of a population at once on a single SnakeVecEnv in this process.
+
+        :param width: int
+            The width of the boards
+        :param height: int
+            The height of the boards
+        :param games_per_weight_set: int
+            Number of games every agent plays
+        :param seed: int or None
+            The seed of the games of all generations, every evaluation plays new games spawned from it
+        :param cache_size: int
+            The number of agents whose game scores are remembered, agents that return unchanged in a later
+            evaluation reuse their scores instead of playing again, see evaluate. Nothing is remembered if 0.
+        :param racing: Racing or None
+            Plays the games in rounds and stops playing hopeless agents early, all agents play all games if None
+        :param detect_cycles: bool
+            End the games of snakes that loop without eating right away, with the score they would get when
+            their life is up. The agents only look at the board, so the scores are the same.
+    """
+
+    def __init__(self, width, height, games_per_weight_set, seed=None, cache_size=0, racing=None,
+                 detect_cycles=False):
+        self.width = width
+        self.height = height
+        self.games_per_weight_set = games_per_weight_set
+        self.racing = racing
+        self.detect_cycles = detect_cycles
+        self._seed_sequence = np.random.SeedSequence(seed)
+        self._env = None
+        self.cache = FitnessCache(cache_size) if cache_size else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def seeds(self, population_size, games=None):
+        """ Returns the seeds of the next games of a population, one for every game.  """
+        return seeding.spawn(self._seed_sequence, population_size * (games or self.games_per_weight_set))
+
+    def evaluate(self, population: Population, seeds=None):
+        """
+            Returns the average score of every agent of the population.
+
+            Without seeds, agents in the cache that played games_per_weight_set games before get the average
+            score of those games and do not play again, the other agents play the games they miss on new seeds.
+            With seeds, only the games on the given seeds count and agents in the cache only play the seeds
+            they did not play before.
+
+            :param population: Population of agents to evaluate
+            :param seeds: list with the seed of every game, agent i plays the games i * games_per_weight_set
+                up to (i + 1) * games_per_weight_set. New seeds are spawned if no seeds are given.
+            :return: NDArray with the average score of every agent
+        """
+        if self.racing is not None:
+            return self.race(population, seeds)
+
+        keys, history, todo, counted = self._games(population, seeds)
+
+        # The agents that miss the same number of games play them together
+        for count in sorted(set(map(len, todo)) - {0}):
+            group = np.array([index for index, each in enumerate(todo) if len(each) == count], dtype=int)
+            played = self.play(population if len(group) == len(population) else population.select(group),
+                               [seed for index in group.tolist() for seed in todo[index]], games=count)
+            for index, game_scores in zip(group.tolist(), played.tolist()):
+                self._record(keys, history, index, todo[index], game_scores)
+        return np.array([np.mean(each) for each in self._played(history, counted)])
+
+    def race(self, population: Population, seeds=None):
+        """
+            Returns the average score of every agent of the population, playing the games in racing rounds.
+
+            Every round, the racing agents play the next game they miss. Agents that played all their games
+            finish and the racing agents that are not kept by the Racing drop out. Agents in the cache continue
+            from the games they played before, see evaluate.
+
+            :param population: Population of agents to evaluate
+            :param seeds: list with the seed of every game, see evaluate. The k-th game of agent i is played
+                on seed i * games_per_weight_set + k. New seeds are spawned if no seeds are given.
+            :return: NDArray with the average score of the games every agent played
+        """
+        keys, history, todo, counted = self._games(population, seeds)
+
+        racing = np.array([index for index, each in enumerate(todo) if each], dtype=int)
+        while len(racing):
+            round_seeds = [todo[index].pop(0) for index in racing.tolist()]
+            played = self.play(population if len(racing) == len(population) else population.select(racing),
+                               round_seeds, games=1)
+            for index, seed, score in zip(racing.tolist(), round_seeds, played[:, 0].tolist()):
+                self._record(keys, history, index, [seed], [score])
+
+            racing = racing[np.array([len(todo[index]) > 0 for index in racing.tolist()], dtype=bool)]
+            racing = racing[self.racing.keep(self._played([history[index] for index in racing],
+                                                          [counted[index] for index in racing]))]
+        return np.array([np.mean(each) for each in self._played(history, counted)])
+
+    def _games(self, population, seeds):
+        """
+            Returns the games of every agent of the population.
+
+            :return: keys, history, todo, counted
+                The cache key of every agent (None without cache), a dict with the score of every game every
+                agent played before by the key of its seed, a list with the seeds every agent still has to play
+                and a list with the keys of the games that count for every agent
+        """
+        games = self.games_per_weight_set
+        if self.cache is None:
+            keys, history = None, [dict() for _ in range(len(population))]
+        else:
+            keys = [self.cache.key(params) for params in population.params]
+            history = [dict(self.cache.get(key) or {}) for key in keys]
+
+        if seeds is None:
+            # All games an agent played count, only the games it misses are played on new seeds
+            missing = [max(games - len(each), 0) for each in history]
+            new_seeds = seeding.spawn(self._seed_sequence, sum(missing))
+            bounds = np.cumsum([0, *missing]).tolist()
+            todo = [new_seeds[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+            counted = [[*each, *map(_game_key, agent_seeds)] for each, agent_seeds in zip(history, todo)]
+        else:
+            # Only the games on the given seeds count, the games are deterministic so played seeds are not replayed
+            agent_seeds = [seeds[index * games:(index + 1) * games] for index in range(len(population))]
+            counted = [[_game_key(seed) for seed in each] for each in agent_seeds]
+            todo = [[seed for seed, key in zip(each, game_keys) if key not in played]
+                    for each, game_keys, played in zip(agent_seeds, counted, history)]
+        return keys, history, todo, counted
+
+    def _record(self, keys, history, index, seeds, scores):
+        """ Adds the scores of the games an agent played to its history and the cache.  """
+        new_games = dict(zip(map(_game_key, seeds), scores))
+        history[index].update(new_games)
+        if keys is not None:
+            self.cache.update(keys[index], new_games)
+
+    @staticmethod
+    def _played(history, counted):
+        """ Returns the scores of the counted games every agent played.  """
+        return [[each[key] for key in game_keys if key in each] for each, game_keys in zip(history, counted)]
+
+    def play(self, population: Population, seeds=None, games=None):
+        """
+            Plays games_per_weight_set games with every agent of the population.
+
+            :param population: Population of agents to evaluate
+            :param seeds: list with the seed of every game, see evaluate
+            :param games: int or None
+                Plays this many games with every agent instead of games_per_weight_set
+            :return: NDArray of shape (len(population), games) with the score of every game
+        """
+        games = games or self.games_per_weight_set
+        n_games = len(population) * games
+        if self._env is None or self._env.num_envs != n_games:
+            self._env = SnakeVecEnv(n_games, self.width, self.height, detect_cycles=self.detect_cycles)
+        self._env.seed(self.seeds(len(population), games) if seeds is None else seeds)
+        return play_population(population, self._env, games)
+
+    def close(self):
+        """ Nothing to clean up, all games live in memory.  """
+        self._env = None
+
+
+class PoolEvaluator(Evaluator):
+    """
+        Plays all games of a population on a pool of worker processes.
+
+        Every worker holds its own SnakeVecEnv and plays the games of a consecutive part of the population.
+        The parameters of the population are shipped once per generation through shared memory
+        (Python 3.8 or newer), the tasks only contain the part of the population to play.
+
+        :param workers: int
+            The number of worker processes
+        :param width: int
+            The width of the boards
+        :param height: int
+            The height of the boards
+        :param games_per_weight_set: int
+            Number of games every agent plays
+        :param layer_sizes: Array of integers
+            The layer sizes of the agents
+        :param population_size: int
+            The number of agents of every population that is evaluated
+        :param activation: str
+            The activation function of the agents
+        :param seed: int or None
+            The seed of the games of all generations, the scores are the same as those of an Evaluator
+            with the same seed
+        :param cache_size: int
+            The number of agents whose game scores are remembered, see Evaluator
+        :param racing: Racing or None
+            Stops playing hopeless agents early, see Evaluator
+        :param detect_cycles: bool
+            End the games of snakes that loop without eating right away, see Evaluator
+    """
+
+    def __init__(self, workers, width, height, games_per_weight_set, layer_sizes, population_size,
+                 activation='relu', seed=None, cache_size=0, racing=None, detect_cycles=False):
+        from multiprocessing import shared_memory
+
+        super().__init__(width, height, games_per_weight_set, seed, cache_size, racing, detect_cycles)
+        self.workers = workers
+        self.population_size = population_size
+
+        shape = (population_size, Population.n_params(layer_sizes))
+        self._memory = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 8)
+        self._params = np.ndarray(shape, dtype=np.float64, buffer=self._memory.buf)
+        self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                             initargs=(self._memory.name, shape, list(layer_sizes), activation,
+                                                       width, height, games_per_weight_set, detect_cycles))
+
+    def play(self, population: Population, seeds=None, games=None):
+        """
+            Plays games_per_weight_set games with every agent of the population on the workers.
+
+            :param population: Population of agents to evaluate, with at most population_size agents
+            :param seeds: list with the seed of every game, see Evaluator.evaluate
+            :param games: int or None
+                Plays this many games with every agent instead of games_per_weight_set
+            :return: NDArray of shape (len(population), games) with the score of every game
+        """
+        assert len(population) <= len(self._params) and self._params.shape[1] == population.params.shape[1], \
+            'The population does not fit the shared memory'
+        self._params[:len(population)] = population.params
+        games = games or self.games_per_weight_set
+        seeds = self.seeds(len(population), games) if seeds is None else seeds
+
+        bounds = np.linspace(0, len(population), self.workers + 1).astype(int)
+        futures = [self._executor.submit(_play_part, start, stop, seeds[start * games:stop * games], games)
+                   for start, stop in zip(bounds[:-1], bounds[1:]) if start < stop]
+        return np.concatenate([future.result() for future in futures])
+
+    def close(self):
+        """ Stops the workers and releases the shared memory.  """
+        self._executor.shutdown()
+        del self._params
+        self._memory.close()
+        self._memory.unlink()
+
+
+def _game_key(seed):
+    """ Returns what identifies the game that is played on a seed.  """
+    if isinstance(seed, np.random.SeedSequence):
+        return str((seed.entropy, seed.spawn_key))
+    return str(seed)
+
+
+def _init_worker(name, shape, layer_sizes, activation, width, height, games_per_weight_set, detect_cycles):
+    """ Attaches a worker process to the shared parameters of the population.  """
+    from multiprocessing import shared_memory
+
+    memory = shared_memory.SharedMemory(name=name)
+    _worker.update(memory=memory, params=np.ndarray(shape, dtype=np.float64, buffer=memory.buf),
+                   layer_sizes=layer_sizes, activation=activation,
+                   evaluator=Evaluator(width, height, games_per_weight_set, detect_cycles=detect_cycles))
+
+
+def _play_part(start, stop, seeds, games):
+    """ Plays the given number of games with the agents start up to stop of the shared population.  """
+    population = Population(_worker['layer_sizes'], _worker['params'][start:stop], _worker['activation'])
+    return _worker['evaluator'].play(population, seeds, games)
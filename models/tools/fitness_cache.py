@@ -0,0 +1,78 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+
+class FitnessCache:
+    """
+        Bounded cache with the game scores of agents that were evaluated before.
+
+        Agents are identified by a hash of their parameters, every agent holds the score of every game it
+        played by the seed of that game. A game on the same seed gives the same score, so an agent that
+        returns unchanged (like the elites of a generation) only has to play the seeds it did not play before.
+        When the cache is full, the agent that was used the longest ago is evicted.
+
+        :param maxsize: int
+            The maximum number of agents in the cache
+    """
+
+    def __init__(self, maxsize=1000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._scores = OrderedDict()
+
+    def __len__(self):
+        return len(self._scores)
+
+    def __contains__(self, key):
+        return key in self._scores
+
+    @staticmethod
+    def key(params, seed_key=b''):
+        """
+            Returns the key of an agent.
+
+            :param params: NDArray
+                The flat parameter vector of the agent
+            :param seed_key: bytes
+                Hashed together with the parameters, the same agent has different keys for different seed keys
+            :return: bytes
+        """
+        params = np.ascontiguousarray(params)
+        digest = hashlib.blake2b(seed_key, digest_size=16)
+        digest.update(str((params.dtype.str, params.shape)).encode())
+        digest.update(params.data)
+        return digest.digest()
+
+    def get(self, key):
+        """
+            Returns a dict with the score of every game the agent played so far by the seed of the game,
+            or None if the agent is not in the cache.
+        """
+        scores = self._scores.get(key)
+        if scores is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._scores.move_to_end(key)
+        return scores
+
+    def update(self, key, scores):
+        """
+            Adds the scores of new games to the games the agent played so far.
+
+            :param key: bytes
+                The key of the agent
+            :param scores: dict
+                The score of every new game by the seed of the game
+        """
+        self._scores.setdefault(key, dict()).update(scores)
+        self._scores.move_to_end(key)
+        while len(self._scores) > self.maxsize:
+            self._scores.popitem(last=False)
+
+    def clear(self):
+        """ Removes all agents from the cache.  """
+        self._scores.clear()
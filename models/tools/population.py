@@ -0,0 +1,159 @@
+import numpy as np
+
+from models.tools.weight_set import WeightSet
+
+
+class Population:
+    """
+        All WeightSets of a generation stacked together, so every agent can be evaluated at once.
+
+        The weights and biases of all agents are stored in one (population_size, n_params) matrix.
+        For every layer the weights are exposed as a (population_size, n_rows, n_columns) view and
+        the biases as a (population_size, n_rows) view on that matrix.
+
+        :param layer_sizes: Array of integers
+            Indicating the sizes of the (dense) layers, starting at the input layer
+            and ending with the output layer
+
+        :param params: NDArray
+            The (population_size, n_params) matrix with the flattened weights and biases of every agent
+
+        :param activation: str
+            The activation function that is used to activate every layer (except the output layer)
+            The following activations can be used:
+            ['relu', 'leakyrelu', 'elu', 'gelu', 'softplus'].
+    """
+
+    def __init__(self, layer_sizes, params, activation='relu'):
+        self.layer_sizes = list(layer_sizes)
+        self.activation_name = activation
+        self.activation = getattr(WeightSet, activation)
+
+        assert params.ndim == 2 and params.shape[1] == self.n_params(self.layer_sizes), \
+            'params needs to be a (population_size, n_params) matrix'
+        self.params = params
+
+        # Views on the parameter matrix for every layer
+        self.layers = []
+        for (weight_start, weight_end), (bias_start, bias_end), shape in self.offsets(self.layer_sizes):
+            weights = self.params[:, weight_start:weight_end].reshape(len(self), *shape)
+            biases = self.params[:, bias_start:bias_end]
+            self.layers.append((weights, biases))
+
+    def __len__(self):
+        return self.params.shape[0]
+
+    # The parameters of every agent are laid out like the parameter vector of a single WeightSet
+    offsets = staticmethod(WeightSet.offsets)
+    n_params = staticmethod(WeightSet.n_params)
+
+    @classmethod
+    def from_weight_sets(cls, weight_sets):
+        """
+            Stack a list of WeightSets with the same layer sizes into a Population.
+
+            :param weight_sets: list of WeightSets
+            :return: Population
+        """
+        first = weight_sets[0]
+        params = np.stack([weight_set.params for weight_set in weight_sets])
+        return cls(first.layer_sizes, params, activation=first.activation_name)
+
+    def segments(self):
+        """
+            Returns the layout of the weight matrices and bias vectors in the parameter vector of an agent.
+
+            :return: (starts, sizes, shapes)
+                The start and size of every weight matrix and bias vector, in order, and their shapes
+        """
+        starts, sizes, shapes = [], [], []
+        for (weight_start, weight_end), (bias_start, bias_end), shape in self.offsets(self.layer_sizes):
+            starts.extend([weight_start, bias_start])
+            sizes.extend([weight_end - weight_start, bias_end - bias_start])
+            shapes.extend([shape, shape[:1]])
+        return np.array(starts), np.array(sizes), shapes
+
+    def select(self, indices):
+        """
+            Returns a new Population with a copy of the given agents.
+
+            :param indices: array of int
+            :return: Population
+        """
+        return Population(self.layer_sizes, self.params[indices], activation=self.activation_name)
+
+    def crossbreed(self, first, second):
+        """
+            Cross-breed pairs of agents into a new Population, one child for every pair.
+
+            Like WeightSet.crossbreed, every weight matrix and bias vector of a child takes the values
+            before a random break point from the first parent and the rest from the second parent.
+
+            :param first: array of int
+                The indices of the first parents
+            :param second: array of int
+                The indices of the second parents
+            :return: Population
+        """
+        starts, sizes, _ = self.segments()
+        segment = np.repeat(np.arange(len(sizes)), sizes)
+        position = np.arange(self.params.shape[1]) - starts[segment]
+
+        break_points = (np.random.random_sample((len(first), len(sizes))) * sizes).astype(np.intp)
+        mask = position < break_points[:, segment]
+        params = np.where(mask, self.params[first], self.params[second])
+        return Population(self.layer_sizes, params, activation=self.activation_name)
+
+    def mutate(self, mutation_probability, initialization='random'):
+        """
+            Mutate the weights and biases of all agents in-place, like WeightSet.mutate does for a single agent.
+
+            :param mutation_probability: float
+                The probability [0,1] for each value to mutate to a random value
+            :param initialization: str
+                The initialization scheme that sets the standard deviation of the random values
+        """
+        _, sizes, shapes = self.segments()
+        std = np.repeat([WeightSet.init_std(initialization, *shape) for shape in shapes], sizes)
+
+        mutation_values = np.random.normal(size=self.params.shape) * std
+        mask = np.random.random_sample(self.params.shape) < mutation_probability
+        # Same as WeightSet.mutate, the values that do not mutate are added to themselves
+        np.clip(self.params + np.where(mask, mutation_values, self.params), a_min=-1.0, a_max=1.0, out=self.params)
+
+    def weight_set(self, index, copy=True):
+        """
+            Returns a single agent of the population as WeightSet.
+
+            :param index: int
+            :param copy: bool
+                Return a WeightSet with its own copy of the parameters, otherwise the WeightSet is
+                a view on the row of the agent and changes to it change the population
+            :return: WeightSet
+        """
+        params = self.params[index].copy() if copy else self.params[index]
+        return WeightSet(layer_sizes=self.layer_sizes, activation=self.activation_name, params=params)
+
+    def feedforward(self, observations):
+        """
+            Compute the action of every agent on its own observations.
+
+            :param observations: NDArray
+                Either a (population_size, input_size) array with one observation per agent, or a
+                (population_size, batch, input_size) array with a batch of observations per agent
+            :return: NDArray of int
+                The action of every agent for every observation, shape (population_size,) or
+                (population_size, batch)
+        """
+        x = np.asarray(observations, dtype=self.params.dtype)
+        single = x.ndim == 2
+        if single:
+            x = x[:, None, :]
+
+        # Perform matrix multiplication, bias adding and activation on all layers except the last
+        for weights, biases in self.layers[:-1]:
+            x = self.activation(np.matmul(x, weights.transpose(0, 2, 1)) + biases[:, None, :])
+        # Argmax over the last layer to get predicted action
+        weights, biases = self.layers[-1]
+        actions = np.argmax(np.matmul(x, weights.transpose(0, 2, 1)) + biases[:, None, :], axis=2)
+        return actions[:, 0] if single else actions
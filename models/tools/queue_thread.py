@@ -0,0 +1,74 @@
+import abc
+import queue
+import threading
+from abc import ABC
+
+
+class QueueThread(threading.Thread, ABC):
+    """
+        Thread that handles queued items one by one, in the order they were submitted.
+
+        Subclasses implement handle, which is called on the thread with the arguments of every submitted item.
+        The thread is started on the first submit. An error while handling an item is raised again on the
+        next submit, flush or close.
+    """
+
+    def __init__(self):
+        threading.Thread.__init__(self, daemon=True)
+        self._queue = queue.Queue()
+        self._error = None
+
+    def submit(self, *args):
+        """
+            Queue an item to be handled on the thread.
+        """
+        self._raise_error()
+        if not self.is_alive():
+            self.start()
+        self._queue.put(args)
+
+    def flush(self):
+        """
+            Wait until all queued items are handled.
+        """
+        if self.is_alive():
+            self._queue.join()
+        self._raise_error()
+
+    def close(self):
+        """
+            Handle the queued items and stop the thread.
+        """
+        if self.is_alive():
+            self._queue.put(None)
+            self.join()
+        self._raise_error()
+
+    @abc.abstractmethod
+    def handle(self, *args):
+        """
+            Handle a single item, called on the thread.
+        """
+        pass
+
+    def run(self):
+        """
+            Main Thread loop.
+            Handles queued items until it is closed.
+        """
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self.handle(*item)
+            except Exception as error:
+                self._error = error
+            finally:
+                self._queue.task_done()
+
+    def _raise_error(self):
+        """ Raises the last error of the thread, only once.  """
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
@@ -4,11 +4,17 @@ Replay memory class
 This class is used to keep track of the past states, rewards, actions and other information relevant to the game.
 Models can retrieve this information on demand.
 
+The MemmapReplayMemory keeps the transitions in memory mapped files, for memories that do not fit in RAM.
+
 """
 
-from collections import deque
-import random
-import pickle
+import json
+import os
+
+import numpy as np
+
+# The fields of a transition, in the order of remember
+FIELDS = ('state', 'action', 'reward', 'next_state', 'done')
 
 
 class ReplayMemory:
@@ -16,15 +22,35 @@ class ReplayMemory:
     This class is used to keep track of the past states, rewards, actions and other information relevant to the game.
     Models can retrieve this information on demand.
 
+    Every field of the transitions is stored in its own preallocated array, which is used as a ring buffer.
+    When the memory is full, a new transition replaces the oldest one. Samples are drawn as a list of transition
+    tuples, or as whole batches with one array per field.
+
     :param memory_length: The maximum amount of frame tuples in the memory.
     :param input_shape: Shape of the input array.
     :param action_space: Set of actions that are available in the game.
+    :param dtype: Data type of the stored states, the type of the first remembered state if None.
+    :param seed: Seed of the random generator that draws the samples.
     """
 
-    def __init__(self, memory_length, input_shape, action_space):
-        self.memory = deque(maxlen=memory_length)
+    def __init__(self, memory_length, input_shape, action_space, dtype=None, seed=None):
+        self.memory_length = memory_length
         self.action_space = action_space
         self.input_shape = input_shape
+        self.state_shape = tuple(np.atleast_1d(input_shape).tolist())
+        self.rng = np.random.default_rng(seed)
+
+        # Position of the oldest transition in the arrays and the number of transitions
+        self._start = 0
+        self._size = 0
+
+        self.actions = self._allocate('action', (memory_length,), np.int64)
+        self.rewards = self._allocate('reward', (memory_length,), np.float64)
+        self.dones = self._allocate('done', (memory_length,), np.bool_)
+        self.states = None
+        self.next_states = None
+        if dtype is not None:
+            self._allocate_states(dtype)
 
     def remember(self, state, action, reward, next_state, done):
         """
@@ -36,16 +62,34 @@ class ReplayMemory:
         :param next_state: State after action has been executed.
         :param done: Game flag. True if game run is over and has to be reset.
         """
-        self.memory.append((state, action, reward, next_state, done))
+        if self._size < self.memory_length:
+            index = (self._start + self._size) % self.memory_length
+            self._size += 1
+        else:
+            index = self._start
+            self._start = (self._start + 1) % self.memory_length
+        self._write(index, (state, action, reward, next_state, done))
 
     def get_random_sample(self, sample_size=32):
         """
-        Get a random tuple sample from the past array.
+        Get a random sample of different transitions from the memory.
 
-        :param sample_size: Total amount of steps taken.
-        :return sample: A Numpy array containing sample_size tuples from the ReplayMemory.
+        :param sample_size: Number of transitions in the sample.
+        :return sample: A list containing sample_size tuples from the ReplayMemory.
         """
-        return random.sample(self.memory, sample_size)
+        return [self[item] for item in self._sample(sample_size).tolist()]
+
+    def get_random_batch(self, sample_size=32):
+        """
+        Get a random sample of different transitions from the memory, with one array per field.
+
+        :param sample_size: Number of transitions in the sample.
+        :return sample: Tuple with a batch of states, actions, rewards, next states and done flags,
+            every batch is an array with sample_size rows.
+        """
+        index = self._index(self._sample(sample_size))
+        return self.states[index], self.actions[index], self.rewards[index], self.next_states[index], \
+            self.dones[index]
 
     def save(self, path):
         """
@@ -53,8 +97,11 @@ class ReplayMemory:
 
         :param path: Stores the memory for later restoration.
         """
+        index = self._index(np.arange(self._size))
+        arrays = dict(state=self.states, action=self.actions, reward=self.rewards, next_state=self.next_states,
+                      done=self.dones)
         with open(path, 'wb') as output:
-            pickle.dump(self.memory, output, pickle.HIGHEST_PROTOCOL)
+            np.savez(output, **{name: array[index] for name, array in arrays.items() if array is not None})
 
     def load(self, path):
         """
@@ -62,8 +109,58 @@ class ReplayMemory:
 
         :param path: Stores the memory for later restoration.
         """
-        with open(path, 'wb') as output:
-            self.memory = pickle.load(output, pickle.HIGHEST_PROTOCOL)
+        with np.load(path, allow_pickle=False) as arrays:
+            transitions = {name: arrays[name] for name in FIELDS if name in arrays}
+        if 'state' in transitions and transitions['state'].shape[1:] != self.state_shape:
+            raise ValueError(f"The memory holds states of shape {transitions['state'].shape[1:]}, "
+                             f"expected {self.state_shape}")
+
+        # The most recent transitions are kept if the memory holds more than fit
+        size = min(len(transitions['action']), self.memory_length)
+        self._start, self._size = 0, size
+        if 'state' in transitions:
+            self._allocate_states(transitions['state'].dtype)
+            self.states[:size] = transitions['state'][-size:]
+            self.next_states[:size] = transitions['next_state'][-size:]
+        self.actions[:size] = transitions['action'][-size:]
+        self.rewards[:size] = transitions['reward'][-size:]
+        self.dones[:size] = transitions['done'][-size:]
+
+    def _allocate_states(self, dtype):
+        """ Allocates the arrays of the states and the next states.  """
+        self.states = self._allocate('state', (self.memory_length, *self.state_shape), dtype)
+        self.next_states = self._allocate('next_state', (self.memory_length, *self.state_shape), dtype)
+
+    def _allocate(self, name, shape, dtype):
+        """ Returns the array that stores a field of the transitions.  """
+        return np.zeros(shape, dtype=dtype)
+
+    def _sample(self, sample_size):
+        """ Returns sample_size different items drawn at random, counted from the oldest transition.  """
+        if sample_size > self._size:
+            raise ValueError("Sample larger than the number of transitions in the memory")
+        return self.rng.choice(self._size, size=sample_size, replace=False)
+
+    def _index(self, item):
+        """ Returns the position in the arrays of the item-th oldest transition.  """
+        return (self._start + item) % self.memory_length
+
+    def _write(self, index, value):
+        """ Writes a transition tuple at a position in the arrays, the states are allocated on the first write.  """
+        state, action, reward, next_state, done = value
+        if self.states is None:
+            self._allocate_states(np.asarray(state).dtype)
+        self.states[index] = state
+        self.actions[index] = action
+        self.rewards[index] = reward
+        self.next_states[index] = next_state
+        self.dones[index] = done
+
+    def _check_item(self, item):
+        """ Returns the index of an item counted from the oldest transition, negative items count from the end.  """
+        if not -self._size <= item < self._size:
+            raise IndexError("ReplayMemory index out of range")
+        return item % self._size
 
     def __getitem__(self, item):
         """"
@@ -72,7 +169,9 @@ class ReplayMemory:
         :param item: Index of the tuple that should be retrieved.
         :return tuple: Tuple containing info about the state, reward, action, next_state and done.
         """
-        return self.memory[item]
+        index = self._index(self._check_item(item))
+        return np.array(self.states[index]), self.actions[index].item(), self.rewards[index].item(), \
+            np.array(self.next_states[index]), self.dones[index].item()
 
     def __setitem__(self, key, value):
         """
@@ -81,7 +180,7 @@ class ReplayMemory:
         :param key: Index where the tuple should be stored.
         :param value: Tuple that should be stored in the ReplayMemory.
         """
-        self.memory[key] = value
+        self._write(self._index(self._check_item(key)), value)
 
     def __len__(self):
         """"
@@ -89,4 +188,97 @@ class ReplayMemory:
 
         :return length: The number of stored tuples.
         """
-        return len(self.memory)
+        return self._size
+
+
+class MemmapReplayMemory(ReplayMemory):
+    """
+    ReplayMemory that keeps the transitions in memory mapped files, so it can hold more transitions than fit in RAM.
+
+    Every field is stored in its own .npy file in a directory, next to a json header with the shapes and data
+    types of the fields and the position of the transitions in the ring buffer. New transitions are written
+    straight into the mapped files and samples are gathered straight from them, the operating system decides
+    which parts are kept in memory. Saving only flushes the files and writes the header, a memory is restored
+    by creating a MemmapReplayMemory on the same directory. Transitions remembered after the last save are not
+    restored, once the memory is full they have replaced the oldest saved transitions in the files.
+
+    :param directory: Directory of the files, the memory that was saved in the directory before is restored.
+    :param memory_length: The maximum amount of frame tuples in the memory.
+    :param input_shape: Shape of the input array.
+    :param action_space: Set of actions that are available in the game.
+    :param dtype: Data type of the stored states, the type of the saved or first remembered state if None.
+    :param seed: Seed of the random generator that draws the samples.
+    """
+
+    HEADER = 'header.json'
+
+    def __init__(self, directory, memory_length, input_shape, action_space, dtype=None, seed=None):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+        header = self._read_header()
+        if header is not None:
+            if header['memory_length'] != memory_length or tuple(header['state_shape']) != \
+                    tuple(np.atleast_1d(input_shape).tolist()):
+                raise ValueError(f"The memory in {directory} holds {header['memory_length']} states of shape "
+                                 f"{tuple(header['state_shape'])}")
+            if 'state' in header['fields']:
+                saved_dtype = np.dtype(header['fields']['state']['dtype'])
+                if dtype is not None and np.dtype(dtype) != saved_dtype:
+                    raise ValueError(f"The memory in {directory} holds states of type {saved_dtype}")
+                dtype = saved_dtype
+
+        super().__init__(memory_length, input_shape, action_space, dtype, seed)
+        if header is not None:
+            self._start, self._size = header['start'], header['size']
+
+    def save(self, path=None):
+        """
+        Save the memory for later usage, by flushing the files and writing the header.
+
+        :param path: If given, a copy of the memory is stored at this path like a ReplayMemory does.
+        """
+        if path is not None:
+            super().save(path)
+            return
+
+        fields = dict(state=self.states, action=self.actions, reward=self.rewards, next_state=self.next_states,
+                      done=self.dones)
+        fields = {name: array for name, array in fields.items() if array is not None}
+        for array in fields.values():
+            array.flush()
+
+        header = dict(memory_length=self.memory_length, state_shape=list(self.state_shape), start=self._start,
+                      size=self._size, fields={name: dict(shape=list(array.shape), dtype=array.dtype.str)
+                                               for name, array in fields.items()})
+        # The header is replaced at once, so it always describes complete files
+        header_path = os.path.join(self.directory, self.HEADER)
+        with open(f"{header_path}.tmp", 'w') as file:
+            json.dump(header, file)
+        os.replace(f"{header_path}.tmp", header_path)
+
+    def close(self):
+        """
+        Save the memory and release the files.
+        """
+        self.save()
+        self.states = self.next_states = self.actions = self.rewards = self.dones = None
+
+    def _read_header(self):
+        """ Returns the header of the memory saved in the directory, or None if there is none.  """
+        try:
+            with open(os.path.join(self.directory, self.HEADER)) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    def _allocate(self, name, shape, dtype):
+        """ Returns the memory mapped file that stores a field of the transitions, an existing file is reused.  """
+        path = os.path.join(self.directory, f'{name}.npy')
+        if os.path.exists(path):
+            array = np.load(path, mmap_mode='r+')
+            if array.shape == shape and array.dtype == np.dtype(dtype):
+                return array
+            del array
+        return np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+
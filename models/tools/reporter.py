@@ -0,0 +1,82 @@
+"""
+Reporting of the generation stats on a background thread.
+
+The stats of every generation are appended as a row to a single csv file and the plot of all generations
+is updated with the new points only. All file I/O and plotting happens on the reporter thread, so the
+training loop only pays for putting the stats on a queue.
+"""
+import os
+
+from models.tools.queue_thread import QueueThread
+
+STATS_COLUMNS = ['generation', 'min', 'q25', 'avg', 'q75', 'max']
+
+
+class StatsReporter(QueueThread):
+    """
+        Thread that logs, plots and saves the results of every generation.
+
+        :param scores_path: str or None
+            The csv file the stats of every generation are appended to, nothing is logged if None
+        :param plot_path: str or None
+            The image the stats of all generations are plotted to, nothing is plotted if None
+        :param weightsets_dir: str or None
+            The folder the best WeightSet of every generation is saved to, nothing is saved if None
+    """
+
+    def __init__(self, scores_path=None, plot_path=None, weightsets_dir=None):
+        QueueThread.__init__(self)
+        self.scores_path = scores_path
+        self.plot_path = plot_path
+        self.weightsets_dir = weightsets_dir
+        self._plot = None
+
+    def report(self, generation_id, stats, best_weight_set=None):
+        """
+            Queue the results of a generation.
+
+            :param generation_id: int
+            :param stats: The [MIN, 25%Q, AVG, 75%Q, MAX] scores of the generation
+            :param best_weight_set: The best WeightSet of the generation, it should not be changed afterwards
+        """
+        self.submit(generation_id, [float(stat) for stat in stats], best_weight_set)
+
+    def handle(self, generation_id, stats, best_weight_set):
+        """ Logs, plots and saves the results of a single generation.  """
+        if self.scores_path is not None:
+            self._log(generation_id, stats)
+        if self.plot_path is not None:
+            self._update_plot(generation_id, stats)
+        if self.weightsets_dir is not None and best_weight_set is not None:
+            best_weight_set.save(os.path.join(self.weightsets_dir, f'weightset_gen_{generation_id}.npz'))
+
+    def _log(self, generation_id, stats):
+        """ Appends a row to the csv file, a header is written first to a new file.  """
+        new_file = not os.path.exists(self.scores_path) or os.path.getsize(self.scores_path) == 0
+        with open(self.scores_path, 'a') as file:
+            if new_file:
+                file.write(','.join(STATS_COLUMNS) + '\n')
+            file.write(','.join([str(generation_id), *[repr(stat) for stat in stats]]) + '\n')
+
+    def _update_plot(self, generation_id, stats):
+        """ Adds the points of a generation to the lines of the plot and saves it.  """
+        if self._plot is None:
+            # The figure is not managed by pyplot, so it can be drawn off the main thread without a display
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.figure import Figure
+
+            figure = Figure()
+            FigureCanvasAgg(figure)
+            axes = figure.add_subplot()
+            axes.set_xlabel('generation')
+            axes.set_ylabel('score')
+            lines = [axes.plot([], [], label=name)[0] for name in STATS_COLUMNS[1:]]
+            axes.legend(loc='upper left')
+            self._plot = figure, axes, lines
+
+        figure, axes, lines = self._plot
+        for line, stat in zip(lines, stats):
+            line.set_data([*line.get_xdata(), generation_id], [*line.get_ydata(), stat])
+        axes.relim()
+        axes.autoscale_view()
+        figure.savefig(self.plot_path)
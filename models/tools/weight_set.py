@@ -1,8 +1,6 @@
-import pickle
 from random import random
 
 import numpy as np
-from copy import deepcopy
 
 
 class WeightSet:
@@ -31,9 +29,18 @@ class WeightSet:
             The following initialization schemes can be used:
             ['random', 'glorot_normal', 'glorot_uniform', 'he_normal',
              'he_uniform', 'lecun_normal', 'lecun_uniform']
+
+        :param params: NDArray
+            A flat float64 vector with the weights and biases of all layers, laid out as given by offsets.
+            The WeightSet uses this vector as its storage, so it can be a view into a larger buffer,
+            like a row of a Population, shared memory or a memory mapped file.
+            Requires layer sizes to be given.
+
+        All weights and biases are stored in the flat params vector, the weights attribute holds
+        (weight matrix, bias vector) views on it for every layer.
     """
 
-    def __init__(self, layer_sizes=None, weights=None, activation='relu', initialization='random'):
+    def __init__(self, layer_sizes=None, weights=None, activation='relu', initialization='random', params=None):
         """
         Initialize the model based on layer sizes or given weights
         """
@@ -51,14 +58,78 @@ class WeightSet:
         # Save initialization scheme
         self.initialization_name = initialization
 
-        # Use specified weights
-        if weights is not None:
+        # Use specified parameter buffer or weights
+        if params is not None:
+            assert self.layer_sizes is not None, 'If a parameter buffer is provided, specify layer sizes'
+            self._use_params(params, self.layer_sizes)
+        elif weights is not None:
             assert isinstance(weights, np.ndarray), 'weights argument needs to be an ndarray'
             self.weights = weights
         else:
             assert self.layer_sizes is not None, 'If no weights are provided, specify layer sizes'
             self.weights = self.randn_init()
 
+    @property
+    def weights(self):
+        """ The (weight matrix, bias vector) views on the parameter buffer for every layer.  """
+        return self._weights
+
+    @weights.setter
+    def weights(self, weights):
+        """ Copies the weights and biases of every layer into a new parameter buffer.  """
+        layer_sizes = [weights[0][0].shape[1]] + [layer[0].shape[0] for layer in weights]
+        if self.layer_sizes is None:
+            self.layer_sizes = layer_sizes
+        self._use_params(np.concatenate([np.ravel(arr) for layer in weights for arr in layer]), layer_sizes)
+
+    def _use_params(self, params, layer_sizes):
+        """ Uses the flat params vector as storage and creates the views of every layer on it.  """
+        assert params.shape == (self.n_params(layer_sizes),), 'params needs to be a flat vector of n_params values'
+        self.params = params
+
+        self._weights = np.empty((len(layer_sizes) - 1, 2), dtype=object)
+        for layer, ((weight_start, weight_end), (bias_start, bias_end), shape) in enumerate(self.offsets(layer_sizes)):
+            self._weights[layer, 0] = params[weight_start:weight_end].reshape(shape)
+            self._weights[layer, 1] = params[bias_start:bias_end]
+
+    @staticmethod
+    def offsets(layer_sizes):
+        """
+            Returns for every layer where its weights and biases are stored in the flat parameter vector.
+
+            :param layer_sizes: Array of integers
+            :return: list of ((weight_start, weight_end), (bias_start, bias_end), weight_shape)
+        """
+        offsets = []
+        start = 0
+        for n_columns, n_rows in zip(layer_sizes[:-1], layer_sizes[1:]):
+            weight_end = start + n_rows * n_columns
+            bias_end = weight_end + n_rows
+            offsets.append(((start, weight_end), (weight_end, bias_end), (n_rows, n_columns)))
+            start = bias_end
+        return offsets
+
+    @staticmethod
+    def n_params(layer_sizes):
+        """ Returns the number of weights and biases of a network with the given layer sizes.  """
+        return sum(n_rows * n_columns + n_rows for n_columns, n_rows in zip(layer_sizes[:-1], layer_sizes[1:]))
+
+    @classmethod
+    def from_buffer(cls, buffer, layer_sizes, offset=0, activation='relu', initialization='random'):
+        """
+            Create a WeightSet that stores its weights and biases in an existing buffer, without copying.
+
+            :param buffer: An object exposing the buffer interface, like multiprocessing.shared_memory.SharedMemory.buf
+                or a mmap.mmap, holding float64 values
+            :param layer_sizes: Array of integers
+            :param offset: int
+                The position in bytes in the buffer where the parameters start
+            :return: WeightSet
+        """
+        params = np.frombuffer(buffer, dtype=np.float64, count=cls.n_params(layer_sizes), offset=offset)
+        return cls(layer_sizes=list(layer_sizes), activation=activation, initialization=initialization,
+                   params=params)
+
     def feedforward(self, observation):
         """
             Use the model to compute which output is taken for a given observation
@@ -82,7 +153,8 @@ class WeightSet:
 
             :return: A WeightSet with identical weights and biases as this WeightSet
         """
-        return deepcopy(self)
+        return WeightSet(layer_sizes=list(self.layer_sizes), activation=self.activation_name,
+                         initialization=self.initialization_name, params=self.params.copy())
 
     def mutate(self, mutation_probability):
         """
@@ -92,14 +164,14 @@ class WeightSet:
             :param: mutation_probability: float
                 The probability [0,1] for each value to mutate to a random value
         """
-        for i, layer in enumerate(self.weights):
-            for j, arr in enumerate(layer):
+        for layer in self.weights:
+            for arr in layer:
                 init_std = self.get_init_std(*arr.shape)
                 mutation_values = np.random.normal(loc=0, scale=init_std, size=arr.shape)
                 mask = np.random.binomial(1, mutation_probability, arr.shape)
                 mutated_arr = np.where(mask, mutation_values, arr)
-                # Set the added and clipped weights
-                self.weights[i][j] = np.clip(arr + mutated_arr, a_min=-1.0, a_max=1.0)
+                # Write the added and clipped weights into the parameter buffer
+                np.clip(arr + mutated_arr, a_min=-1.0, a_max=1.0, out=arr)
         return
 
     @staticmethod
@@ -113,25 +185,21 @@ class WeightSet:
             :param second: The second WeightSet to cross-breed
             :return: A WeightSet resulting from cross-breeding
         """
-        new_weight_set = []
-        for layer_first, layer_second in zip(first.weights, second.weights):
+        # Only the layers both WeightSets have are cross-bred
+        n_layers = min(len(first.weights), len(second.weights))
+        child = WeightSet(layer_sizes=list(first.layer_sizes[:n_layers + 1]), activation=first.activation_name,
+                          params=np.empty(WeightSet.n_params(first.layer_sizes[:n_layers + 1])))
+
+        for layer_child, layer_first, layer_second in zip(child.weights, first.weights, second.weights):
             # Each layer is a list containing a weight matrix and a bias vector
-            new_layer_array = []
-            for arr_first, arr_second in zip(layer_first, layer_second):
+            for arr_child, arr_first, arr_second in zip(layer_child, layer_first, layer_second):
                 assert arr_first.shape == arr_second.shape, 'Both weight matrices need to have the same shape'
-                # Do breeding based on mask
-                total_size = int(np.prod(arr_first.shape))
-                break_point = int(random() * total_size)
-                ones = np.ones(break_point)
-                zeroes = np.zeros(total_size - break_point)
-                mask = np.concatenate((ones, zeroes))
-                mask = mask.reshape(arr_first.shape)
-
-                arr_breeded = np.where(mask, arr_first, arr_second)
-                new_layer_array.append(arr_breeded)
-            new_weight_set.append(new_layer_array)
-        breeded_weight_set = np.array(new_weight_set)
-        return WeightSet(weights=breeded_weight_set, activation=first.activation_name)
+                # Take the values before the break point from the first and the rest from the second WeightSet
+                flat_child = arr_child.reshape(-1)
+                break_point = int(random() * flat_child.size)
+                flat_child[:break_point] = arr_first.reshape(-1)[:break_point]
+                flat_child[break_point:] = arr_second.reshape(-1)[break_point:]
+        return child
 
     def randn_init(self):
         """
@@ -147,7 +215,8 @@ class WeightSet:
             :return: ndarray with weights and biases for every layer
         """
         n_layers = len(self.layer_sizes) - 1
-        weight_set = []
+        # An object array, so layers whose weight matrix and bias vector could broadcast are not merged
+        weight_set = np.empty((n_layers, 2), dtype=object)
 
         for i in range(n_layers):
             # Get standard deviation that is used to generate random weights
@@ -155,9 +224,9 @@ class WeightSet:
             # Generate arrays
             weight_array = np.random.normal(loc=0, scale=init_std, size=(self.layer_sizes[i + 1], self.layer_sizes[i]))
             bias_array = np.random.normal(loc=0, scale=init_std, size=(self.layer_sizes[i + 1], 1)).ravel()
-            layer_array = [np.clip(weight_array, a_min=-1.0, a_max=1.0), np.clip(bias_array, a_min=-1.0, a_max=1.0)]
-            weight_set.append(layer_array)
-        return np.array(weight_set)
+            weight_set[i, 0] = np.clip(weight_array, a_min=-1.0, a_max=1.0)
+            weight_set[i, 1] = np.clip(bias_array, a_min=-1.0, a_max=1.0)
+        return weight_set
 
     def get_init_std(self, n_rows, n_columns=1):
         """
@@ -168,7 +237,20 @@ class WeightSet:
                 If a vector is passed, columns will be 1.
             :return: The standard deviation for initialization according to the chosen scheme
         """
-        # Save initialization scheme
+        return self.init_std(self.initialization_name, n_rows, n_columns)
+
+    @staticmethod
+    def init_std(initialization, n_rows, n_columns=1):
+        """
+            :param initialization: str
+                The initialization scheme, see get_init_std
+            :param n_rows: int
+                The number of rows in the tensor
+            :param n_columns: int
+                The number of columns in the tensor.
+                If a vector is passed, columns will be 1.
+            :return: The standard deviation for initialization according to the given scheme
+        """
         init_dir = dict(random=np.float64(1.0) / 3,
                         glorot_normal=np.sqrt(2 / (n_rows + n_columns)),
                         glorot_uniform=np.sqrt(6 / (n_rows + n_columns)),
@@ -176,7 +258,7 @@ class WeightSet:
                         he_uniform=np.sqrt(6 / n_columns),
                         lecun_normal=np.sqrt(1 / n_columns),
                         lecun_uniform=np.sqrt(3 / n_columns))
-        return init_dir[self.initialization_name]
+        return init_dir[initialization]
 
     @staticmethod
     def relu(arr):
@@ -247,9 +329,20 @@ class WeightSet:
         return np.logaddexp(0, x)
 
     def save(self, path):
+        """
+            Save the layer sizes and the flat parameter vector in the numpy .npz format.
+
+            :param path: Path of the file to write to
+        """
         with open(path, 'wb') as file:
-            pickle.dump(self.weights, file)
+            np.savez(file, layer_sizes=np.array(self.layer_sizes), params=self.params)
 
     def load(self, path):
-        with open(path, 'rb') as file:
-            self.weights = pickle.load(file)
+        """
+            Load weights and biases saved with save, without unpickling any objects.
+
+            :param path: Path of the file to read from
+        """
+        with np.load(path, allow_pickle=False) as data:
+            self.layer_sizes = data['layer_sizes'].tolist()
+            self._use_params(data['params'], self.layer_sizes)
@@ -38,6 +38,11 @@ class BaseBoard(ABC):
         """ Returns extra information about the current game step.  """
         pass
 
+    @abc.abstractmethod
+    def vision(self, *args, **kwargs) -> np.array:
+        """ Returns the distances to the nearest wall, snake and apple in 8 directions for every snake.  """
+        pass
+
     @abc.abstractmethod
     def step(self, action: int) -> (np.array, int, bool, dict):
         """
@@ -70,3 +75,8 @@ class BaseBoard(ABC):
     def seed(self, seed: [list, None]) -> list:
         """ Set the seed of the game, makes it possible to reproduce games.  """
         pass
+
+    @abc.abstractmethod
+    def grow(self, snake: int = 0, length: int = 1):
+        """ Grows a snake by a number of segments over its next steps, without giving it more life.  """
+        pass
@@ -1,13 +1,18 @@
+import itertools
 import numpy as np
 
 from .base_board import BaseBoard
+from .free_cells import FreeCells
+from .moves import resolve_moves
+from .palette import render
+from .rays import ray_table, distances
 from snake.objects.wall import Wall
 from snake.objects.ground import Ground
 from snake.objects.snake import Snake
 from snake.objects.apple import Apple
-from snake.objects.utils import Point
+from snake.objects.utils import Point, board_points
 
-from snake import constants
+from snake import constants, seeding
 
 
 class Board(BaseBoard):
@@ -18,23 +23,29 @@ class Board(BaseBoard):
             The width of the board
         :param height: int
             The height of the board
+        :param detect_cycles: bool
+            Not supported by this board, see GridBoard
     """
 
-    def __init__(self, width=None, height=None):
+    def __init__(self, width=None, height=None, detect_cycles=False):
+        if detect_cycles:
+            raise ValueError("Cycle detection is only supported on the grid board")
         self.width = width if width is not None else constants.WIDTH
         self.height = height if height is not None else constants.HEIGHT
         self.board = self._create_board(self.width, self.height)
+        self.cells = self._create_cells(self.board)
+        self.free_cells = FreeCells(self.cells)
 
         # Keeps track of all the objects in the game
         self.objects = dict(ground=[], wall=[], snake=[], apple=[])
         self.object_types = dict(ground=Ground, wall=Wall, snake=Snake, apple=Apple)
 
         # placeholder for the actual gym step return variables
-        self._obs = np.zeros((self.width, self.height), dtype=np.object)
-        self._reward = []
+        self._reward = 0
+        self._snakes_alive = 0
         self._done = False
         self._info = dict()
-        self._seed = None
+        self.np_random, self._seed = seeding.np_random()
 
         self.action_space = constants.ACTION_SPACE
         self.action_set = constants.GET_ACTION_MEANING
@@ -61,8 +72,11 @@ class Board(BaseBoard):
         walls = walls if walls > 0 else constants.DEFAULT_START_WALLS
 
         self.board = self._create_board(self.width, self.height)
+        self.cells = self._create_cells(self.board)
+        self.free_cells = FreeCells(self.cells)
         for k, v in self.objects.items():
             self.objects[k] = []
+        self._snakes_alive = 0
 
         for name, numbers in [("snake", snakes), ("apple", apples), ("wall", walls)]:
             for _ in range(numbers):
@@ -87,38 +101,44 @@ class Board(BaseBoard):
 
             if not self._collision_new_object(new_object):
                 self.objects[name].append(new_object)
-                self.board[start_pos.x, start_pos.y] = new_object
+                self._place(new_object, start_pos)
+                if isinstance(new_object, Snake):
+                    self._snakes_alive += 1
             else:
-                options = self._locate_object(Ground)
-                if not options:
-                    raise ValueError("No space to put the new object.")
-                new_pos = np.random.choice(range(len(options)))
-                self.add_object(name, position=Point(*options[new_pos]))
+                index = self.free_cells.random(self.np_random)
+                self.add_object(name, position=board_points(self.width, self.height)[index])
         else:
             raise ValueError(f"Object '{name}' not familiar")
 
-    def obs(self, attribute="rgb"):
+    def obs(self, attribute="rgb", out=None):
         """ Returns the game grid.
 
             :param attribute: str
                 The attribute of the objects inside the game of what has to returned,
                 valid inputs are: ['rgb', 'ansi', 'ansi_fancy']
+            :param out: NDArray
+                Optional preallocated array to write the grid into
         """
-        for x in range(self.width):
-            for y in range(self.height):
-                self._obs[x, y] = getattr(self.board[x, y], attribute)
-        return self._obs
+        return render(self.cells, attribute, out)
+
+    def vision(self):
+        """
+            Generates the distances to the nearest objects seen from the head of every snake.
+            The output will be a (snakes, 3, 8) numpy array, with 3 times 8 directions.
+
+            wall distance, snake distance, food distance
+            ["UP", "DOWN", "LEFT", "LEFT UP", "LEFT DOWN", "RIGHT", "RIGHT UP", "RIGHT DOWN"]
+        """
+        heads = [snake.position.x * self.height + snake.position.y for snake in self.objects['snake']]
+        return distances(self.cells.reshape(-1)[ray_table(self.width, self.height)[heads]])
 
     def reward(self):
         """ Returns the reward for a single step.  """
-        return sum(self._reward)
+        return self._reward
 
     def done(self):
         """ Returns a boolean if the game is over or not. (True is game over) """
-        living_snakes = [snake for snake in self.objects['snake'] if snake.alive]
-        if not living_snakes:
-            return True
-        return False
+        return self._snakes_alive == 0
 
     def info(self):
         """ Returns additional info about the game.  """
@@ -134,8 +154,8 @@ class Board(BaseBoard):
     def step(self, action, values=True):
         """ Executes a step in the game.
 
-            :param action: int
-                The action that has to be performed
+            :param action: int or array of int
+                The action that has to be performed, or one action for every snake
             :param values: bool
                 If the game is used as a standalone it has to return gym actions.
                 But sometimes we want to get different observations and then
@@ -157,20 +177,33 @@ class Board(BaseBoard):
 
     def random_step(self):
         """ Returns a random step in the environment.  """
-        return np.random.choice(range(self.action_space))
+        return int(self.np_random.integers(self.action_space))
 
     def seed(self, seed=None):
         """
-            Either restores a seed if a seed list is given, otherwise
-            returns the seed that is initialized in this game.
+            Seeds the random generator of this board, a new seed is drawn if no seed is given.
+            Seeding again with the returned seed list reproduces the same games.
         """
-        if seed is None:
-            self._seed = np.random.get_state()
-        else:
-            self._seed = seed[0]
-            np.random.set_state(self._seed)
+        if isinstance(seed, (list, tuple)):
+            seed = seed[0]
+        self.np_random, self._seed = seeding.np_random(seed)
         return [self._seed]
 
+    def grow(self, snake=0, length=1):
+        """
+            Grows a snake by a number of segments over its next steps, without giving it more life.
+
+            :param snake: int
+                The index of the snake
+            :param length: int
+                The number of segments, the snake does not grow beyond its maximum length
+        """
+        snake = self.objects['snake'][snake]
+        life_left = snake.life_left
+        for _ in range(min(length, snake.LEN_SNAKE_MAX - len(snake))):
+            snake.increase_length()
+        snake.life_left = life_left
+
     def get_screen_dimensions(self):
         """ Returns the width and height of the board.  """
         return self.width, self.height
@@ -189,26 +222,26 @@ class Board(BaseBoard):
                 border_col = (x % (width - 1)) == 0
 
                 if border_row or border_col:
-                    board[x, y] = Wall(Point(x, y))
+                    board[x, y] = Wall(Point.at(x, y))
                 else:
-                    board[x, y] = Ground(Point(x, y))
+                    board[x, y] = Ground(Point.at(x, y))
         return board
 
-    def _locate_object(self, object_type):
-        """
-            Locates all x, y positions of a type on the playing field.
-
-            :param object_type: Object
-                Any object that is located in self.Objects
-            :return: list(int, int)
-                A list of all the locations of the specific type as tuples
-        """
-        indices = []
-        for x, row in enumerate(self.board):
-            for y, item in enumerate(row):
-                if isinstance(item, object_type):
-                    indices.append((x, y))
-        return indices
+    @staticmethod
+    def _create_cells(board):
+        """ Creates a uint8 array with the cell codes of the objects on the board.  """
+        return np.array([[item.cell for item in row] for row in board], dtype=np.uint8)
+
+    def _place(self, new_object, position):
+        """ Puts an object on the board, while keeping the cell codes and free cells up to date.  """
+        self.board[position.x, position.y] = new_object
+        self.cells[position.x, position.y] = new_object.cell
+
+        index = position.x * self.height + position.y
+        if new_object.cell == Ground.cell:
+            self.free_cells.add(index)
+        else:
+            self.free_cells.remove(index)
 
     def _random_point(self, min_distance=constants.MIN_SPAWN_WALL_DISTANCE):
         """
@@ -220,8 +253,8 @@ class Board(BaseBoard):
             :return Point
                 A position on the board at least min_distance away from the boarder
         """
-        return Point(x=np.random.randint(min_distance, self.width - min_distance),
-                     y=np.random.randint(min_distance, self.height - min_distance))
+        return Point.at(int(self.np_random.integers(min_distance, self.width - min_distance)),
+                        int(self.np_random.integers(min_distance, self.height - min_distance)))
 
     def _collision_new_object(self, new_object):
         """
@@ -237,10 +270,7 @@ class Board(BaseBoard):
 
     def _step_snake(self, snake):
         """
-            Test for collisions and handles interaction, should be called after a step.
-
-            :return int
-                Returns the reward value obtained in the step
+            Steps a single snake, which can not collide with any other snake.
         """
         new_head_location = snake.next_step_head()
         new_position_board = self.board[new_head_location.as_value()]
@@ -251,35 +281,76 @@ class Board(BaseBoard):
         time_up = snake.life_left <= 0
         if wall_hit or snake_hit or time_up:
             self._collision_dead(snake)
-            return 0
+            return
 
         # If apple is eaten
         next_is_apple = isinstance(new_position_board, Apple)
         if next_is_apple:
-            self._reward.append(constants.DEFAULT_REWARD_PER_APPLE)
+            self._reward += constants.DEFAULT_REWARD_PER_APPLE
             self._collision_apple(snake, new_head_location)
+        self._move_snake(snake, ate=next_is_apple)
 
-        if not next_is_apple or len(snake) > snake.LEN_SNAKE_MAX:
+    def _move_snake(self, snake, ate=False):
+        """
+            Moves a surviving snake one step forward, removing its tail unless it ate.
+
+            :param snake: Snake
+            :param ate: bool
+                True if the snake ate an apple in this step
+        """
+        if not ate or len(snake) > snake.LEN_SNAKE_MAX:
             # Remove tail if apple is not eaten and no more object following it
             if len(snake) > 1 and snake.body[-2] != snake.get_tail():
-                self.board[snake.get_tail().as_value()] = Ground(snake.get_tail())
+                self._place(Ground(snake.get_tail()), snake.get_tail())
 
         # Reward for every step
-        self._reward.append(constants.DEFAULT_REWARD_PER_STEP)
+        self._reward += constants.DEFAULT_REWARD_PER_STEP
 
-        # If snake still lives update head position
-        if snake.alive:
-            snake.step()
-            self.board[snake.get_head().as_value()] = snake
+        snake.step()
+        self._place(snake, snake.get_head())
 
-    def _step(self, action: int):
-        """ Perform step function for all living snakes.  """
-        self._reward = []
-        living_snakes = [snake for snake in self.objects['snake'] if snake.alive]
+    def _step(self, action):
+        """
+            Perform step function for all living snakes at once.
 
-        for snake in living_snakes:
-            snake.direction = self.action_set[action]
+            :param action: int or array of int
+                The action of every snake, in the order of self.objects['snake']. A single action is
+                performed by all snakes.
+        """
+        self._reward = 0
+        actions = itertools.repeat(action) if np.ndim(action) == 0 else action
+        living = [(snake, snake_action) for snake, snake_action in zip(self.objects['snake'], actions) if snake.alive]
+        self._snakes_alive = len(living)
+        if len(living) == 1:
+            # A single snake can not collide with other snakes, so it is stepped on its own
+            snake, snake_action = living[0]
+            snake.turn(constants.ACTION_DIRECTION[snake_action])
             self._step_snake(snake)
+            return
+        if not living:
+            return
+
+        # Turn all snakes and resolve the collisions of all new heads at once
+        living_snakes = [snake for snake, _ in living]
+        new_heads = []
+        for snake, snake_action in living:
+            snake.turn(constants.ACTION_DIRECTION[snake_action])
+            new_heads.append(snake.next_step_head())
+        flat_heads = np.array([head.x * self.height + head.y for head in new_heads])
+        life_left = np.array([snake.life_left for snake in living_snakes])
+        dead, ate = resolve_moves(self.cells.reshape(-1), flat_heads, life_left)
+
+        for snake in itertools.compress(living_snakes, dead):
+            self._collision_dead(snake)
+        for snake in itertools.compress(living_snakes, ~dead & ~ate):
+            self._move_snake(snake)
+
+        # New apples spawn after the other snakes moved, on a random point away from the walls or on a random free
+        # cell if that point is taken. The eaten apple still holds its cell, so no new apple spawns on the head.
+        for snake, head in itertools.compress(zip(living_snakes, new_heads), ate):
+            self._reward += constants.DEFAULT_REWARD_PER_APPLE
+            self._collision_apple(snake, head)
+            self._move_snake(snake, ate=True)
 
     def _collision_apple(self, snake, position):
         """
@@ -299,3 +370,4 @@ class Board(BaseBoard):
             :param snake: Snake
         """
         snake.alive = False
+        self._snakes_alive -= 1
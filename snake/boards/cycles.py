@@ -0,0 +1,64 @@
+"""
+Zobrist hashing of the state of a snake, to end games of snakes that loop without eating.
+
+The state of a snake is its head, its direction and its body. Every body segment is hashed together with
+the direction to the segment in front of it, so the hash holds the order of the body and not only the cells
+it covers. The hash is updated incrementally: a step adds the new head and the old head as a segment and
+drops the tail segment, growing adds a segment on the tail.
+
+A snake that is played by a deterministic agent that only looks at the board (like the genetic models) and
+reaches a state it was in before without eating in between, will loop through the same states until its
+life is up. The loops are found with Brent's algorithm, which only has to remember a single earlier state.
+"""
+import functools
+import numpy as np
+
+from snake.objects import constants
+
+# The keys are the same in every process, so the hashes of two games can be compared
+ZOBRIST_SEED = 5318008
+
+# The direction of a segment that lies on the same cell as the segment in front of it (a growing tail)
+STAY = len(constants.DIRECTION_VALID)
+
+
+@functools.lru_cache(maxsize=16)
+def zobrist_keys(width, height):
+    """
+        Returns the random keys of the snake states on a board, the keys of the 16 board sizes used last are kept.
+
+        :param width: int
+            The width of the board
+        :param height: int
+            The height of the board
+        :return: segment_keys, head_keys, direction_keys
+            NDArrays of uint64 with a key for every segment (cells, 5) given the direction to the segment
+            in front of it (or STAY), for every head cell (cells,) and for every direction of the snake (4,)
+    """
+    rng = np.random.default_rng(ZOBRIST_SEED)
+    cells = width * height
+    keys = rng.integers(0, np.iinfo(np.uint64).max, size=cells * (STAY + 2) + STAY, dtype=np.uint64,
+                        endpoint=True)
+    segment_keys = keys[:cells * (STAY + 1)].reshape(cells, STAY + 1)
+    head_keys = keys[cells * (STAY + 1):cells * (STAY + 2)]
+    direction_keys = keys[cells * (STAY + 2):]
+    for array in (segment_keys, head_keys, direction_keys):
+        array.setflags(write=False)
+    return segment_keys, head_keys, direction_keys
+
+
+@functools.lru_cache(maxsize=16)
+def segment_directions(height):
+    """
+        Returns the direction of a segment for every flat index offset to the segment in front of it.
+
+        :param height: int
+            The height of the board
+        :return: NDArray of shape (2 * height + 1,), the direction of offset o is at o + height
+    """
+    directions = np.full(2 * height + 1, -1, dtype=np.intp)
+    for direction, (dx, dy) in enumerate(constants.DIRECTION_DELTA):
+        directions[dx * height + dy + height] = direction
+    directions[height] = STAY
+    directions.setflags(write=False)
+    return directions
@@ -0,0 +1,60 @@
+import numpy as np
+
+from snake.objects import constants as object_constants
+
+
+class FreeCells:
+    """
+        Index of the free (ground) cells of a board, so a random free cell can be picked in constant time.
+
+        The flat indices of the free cells are kept in an array, with their position in that array per cell.
+        A removed cell is replaced by the last free cell and an added cell is appended, so both are O(1).
+        The cells start in ascending order, every board using this index picks the same cells for the same seed.
+
+        :param cells: NDArray
+            The integer coded cells of the board
+    """
+
+    def __init__(self, cells):
+        flat = cells.reshape(-1)
+        free = np.flatnonzero(flat == object_constants.CELL_GROUND)
+
+        self.cells = np.zeros(flat.size, dtype=np.intp)
+        self.cells[:len(free)] = free
+        self.position = np.full(flat.size, -1, dtype=np.intp)
+        self.position[free] = np.arange(len(free))
+        self.size = len(free)
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, index):
+        return self.position[index] >= 0
+
+    def add(self, index):
+        """ Marks the cell with the flat index as free.  """
+        if self.position[index] < 0:
+            self.cells[self.size] = index
+            self.position[index] = self.size
+            self.size += 1
+
+    def remove(self, index):
+        """ Marks the cell with the flat index as taken.  """
+        position = self.position[index]
+        if position >= 0:
+            self.size -= 1
+            last = self.cells[self.size]
+            self.cells[position] = last
+            self.position[last] = position
+            self.position[index] = -1
+
+    def random(self, np_random):
+        """
+            Returns the flat index of a random free cell.
+
+            :param np_random: Generator
+                The random generator of the board
+        """
+        if not self.size:
+            raise ValueError("No space to put the new object.")
+        return int(self.cells[np_random.integers(self.size)])
@@ -0,0 +1,495 @@
+import numpy as np
+
+from .base_board import BaseBoard
+from .cycles import STAY, segment_directions, zobrist_keys
+from .free_cells import FreeCells
+from .moves import resolve_moves, step_offsets
+from .palette import PALETTE, render
+from .rays import ray_table, distances
+from snake.objects.wall import Wall
+from snake.objects.ground import Ground
+from snake.objects.snake import Snake
+from snake.objects.apple import Apple
+from snake.objects.utils import Point, board_points
+from snake.objects import constants as object_constants
+
+from snake import constants, seeding
+
+GROUND = object_constants.CELL_GROUND
+WALL = object_constants.CELL_WALL
+SNAKE = object_constants.CELL_SNAKE
+APPLE = object_constants.CELL_APPLE
+
+# (dx, dy) per direction in the order of constants.DIRECTION_VALID and the direction that reverses it
+DIRECTION_DELTA = np.array(object_constants.DIRECTION_DELTA, dtype=np.intp)
+DIRECTION_OPPOSITE = np.array(object_constants.DIRECTION_OPPOSITE, dtype=np.intp)
+ACTION_DIRECTION = np.array(constants.ACTION_DIRECTION, dtype=np.intp)
+
+OBJECT_TYPES = dict(ground=Ground, wall=Wall, snake=Snake, apple=Apple)
+
+
+class GridBoard(BaseBoard):
+    """
+        Board with the same rules as the classic board, but the grid is stored as an
+        integer coded (uint8) array and the snakes as ring buffers of flat cell indices.
+
+        No objects are created while playing, which makes this board a lot faster to step.
+
+        :param width: int
+            The width of the board
+        :param height: int
+            The height of the board
+        :param detect_cycles: bool
+            End the game of a single snake as soon as it loops without eating, with the score it would get
+            when its life is up. Only valid for agents that always act the same on the same board.
+    """
+
+    def __init__(self, width=None, height=None, detect_cycles=False):
+        self.width = width if width is not None else constants.WIDTH
+        self.height = height if height is not None else constants.HEIGHT
+        self.cells = self._create_board(self.width, self.height)
+        self.free_cells = FreeCells(self.cells)
+
+        self.object_types = OBJECT_TYPES
+        self.palette = PALETTE
+
+        # Snake state, one entry per snake. The body holds flat cell indices where
+        # the head is stored at self._head and the rest of the body before it.
+        self._capacity = Snake.LEN_SNAKE_MAX + 1
+        self._body = np.zeros((0, self._capacity), dtype=np.intp)
+        self._head = np.zeros(0, dtype=np.intp)
+        self._length = np.zeros(0, dtype=np.intp)
+        self._direction = np.zeros(0, dtype=np.intp)
+        self._life_left = np.zeros(0, dtype=np.intp)
+        self._life_time = np.zeros(0, dtype=np.intp)
+        self._alive = np.zeros(0, dtype=np.bool_)
+        self._apples = []
+        self._snake_arrays = ["_body", "_head", "_length", "_direction", "_life_left", "_life_time", "_alive"]
+        self._step_offset = step_offsets(self.height)
+
+        # Zobrist hash of the state of a single snake and the state it is compared with to find loops
+        self.detect_cycles = detect_cycles
+        if detect_cycles:
+            keys = zobrist_keys(self.width, self.height)
+            self._segment_keys, self._head_keys, self._direction_keys = (each.tolist() for each in keys)
+            self._segment_direction = segment_directions(self.height).tolist()
+        self._hash = 0
+        self._saved_hash = 0
+        self._steps_saved = 0
+        self._power = 1
+
+        # placeholder for the actual gym step return variables
+        self._reward = 0
+        self._snakes_alive = 0
+        self.np_random, self._seed = seeding.np_random()
+
+        self.action_space = constants.ACTION_SPACE
+        self.action_set = constants.GET_ACTION_MEANING
+
+    def __str__(self):
+        return "<class GridBoard>"
+
+    def __repr__(self):
+        return f"<class GridBoard (np.array(width={self.width}, height={self.height}), dtype=np.uint8)"
+
+    @property
+    def snakes(self):
+        """ Returns the number of snakes on the board.  """
+        return len(self._alive)
+
+    def setup(self, snakes=1, apples=1, walls=0):
+        """
+            init settings for starting the board
+
+            :param snakes: int
+                The number of snakes that will randomly spawn on the board
+            :param apples: int
+                The number of apples that will randomly spawn on the board
+            :param walls: int
+                The number of walls that will randomly spawn
+        """
+        snakes = snakes if snakes > 1 else constants.DEFAULT_START_SNAKES
+        apples = apples if apples > 1 else constants.DEFAULT_START_APPLES
+        walls = walls if walls > 0 else constants.DEFAULT_START_WALLS
+
+        self.cells = self._create_board(self.width, self.height)
+        self.free_cells = FreeCells(self.cells)
+        self._clear_snakes()
+        self._apples = []
+
+        for name, numbers in [("snake", snakes), ("apple", apples), ("wall", walls)]:
+            for _ in range(numbers):
+                self.add_object(name)
+
+    def add_object(self, name, position=None):
+        """
+            Add an object to the board
+
+            :param name: str
+                Name of the object you want to add, valid options are currently
+                'wall', 'snake', 'ground', 'apple'
+
+            :param position: Point
+                Defines the position of the object on the board, if none is provided
+                it will pick a random position on the board
+        """
+        name = name.lower().strip()
+        if name not in self.object_types:
+            raise ValueError(f"Object '{name}' not familiar")
+
+        start_pos = position if position is not None else self._random_point()
+        index = start_pos.x * self.height + start_pos.y
+
+        flat = self.cells.reshape(-1)
+        if flat[index] != GROUND:
+            index = self.free_cells.random(self.np_random)
+
+        flat[index] = self.object_types[name].cell
+        if flat[index] == GROUND:
+            self.free_cells.add(index)
+        else:
+            self.free_cells.remove(index)
+        if name == "snake":
+            self._add_snake(index)
+        elif name == "apple":
+            self._apples.append(index)
+
+    def obs(self, attribute="rgb", out=None):
+        """ Returns the game grid.
+
+            :param attribute: str
+                The attribute of the objects inside the game of what has to returned,
+                valid inputs are: ['rgb', 'ansi', 'ansi_fancy']
+            :param out: NDArray
+                Optional preallocated array to write the grid into
+        """
+        return render(self.cells, attribute, out)
+
+    def vision(self):
+        """
+            Generates the distances to the nearest objects seen from the head of every snake.
+            The output will be a (snakes, 3, 8) numpy array, with 3 times 8 directions.
+
+            wall distance, snake distance, food distance
+            ["UP", "DOWN", "LEFT", "LEFT UP", "LEFT DOWN", "RIGHT", "RIGHT UP", "RIGHT DOWN"]
+        """
+        heads = self._body[np.arange(self.snakes), self._head]
+        return distances(self.cells.reshape(-1)[ray_table(self.width, self.height)[heads]])
+
+    def reward(self):
+        """ Returns the reward for a single step.  """
+        return self._reward
+
+    def done(self):
+        """ Returns a boolean if the game is over or not. (True is game over) """
+        return self._snakes_alive == 0
+
+    def info(self):
+        """ Returns additional info about the game.  """
+        info = dict()
+        alive = self._alive
+
+        info["snakes_alive"] = int(alive.sum())
+        info["snakes_dead"] = int(self.snakes - alive.sum())
+        info["life_left"] = self._life_left[alive].tolist()
+        info["direction"] = [constants.DIRECTION_VALID[each] for each in self._direction[alive]]
+        return info
+
+    def step(self, action, values=True):
+        """ Executes a step in the game.
+
+            :param action: int or array of int
+                The action that has to be performed, or one action for every snake
+            :param values: bool
+                If the game is used as a standalone it has to return gym actions.
+                But sometimes we want to get different observations and then
+                disabling the return values saves a lot of time.
+        """
+        self._step(action)
+        if values:
+            return self.obs(), self.reward(), self.done(), self.info()
+        return None
+
+    def reset(self):
+        """ Reset the environment.  """
+        self.setup()
+        return self.obs()
+
+    def close(self):
+        """ Performs a clean sweep of the game when closed.  """
+        self.setup()
+
+    def random_step(self):
+        """ Returns a random step in the environment.  """
+        return int(self.np_random.integers(self.action_space))
+
+    def seed(self, seed=None):
+        """
+            Seeds the random generator of this board, a new seed is drawn if no seed is given.
+            Seeding again with the returned seed list reproduces the same games.
+        """
+        if isinstance(seed, (list, tuple)):
+            seed = seed[0]
+        self.np_random, self._seed = seeding.np_random(seed)
+        return [self._seed]
+
+    def grow(self, snake=0, length=1):
+        """
+            Grows a snake by a number of segments over its next steps, without giving it more life.
+
+            :param snake: int
+                The index of the snake
+            :param length: int
+                The number of segments, the snake does not grow beyond its maximum length
+        """
+        life_left = self._life_left[snake]
+        for _ in range(length):
+            self._increase_length(snake)
+        self._life_left[snake] = life_left
+
+    def get_screen_dimensions(self):
+        """ Returns the width and height of the board.  """
+        return self.width, self.height
+
+    def get_head(self, snake=0):
+        """ Returns the head position of a snake.  """
+        return board_points(self.width, self.height)[self._body[snake, self._head[snake]]]
+
+    def get_length(self, snake=0):
+        """ Returns the length of a snake.  """
+        return int(self._length[snake])
+
+    @staticmethod
+    def _create_board(width, height):
+        """ Creates a uint8 array with only ground cells surrounded by walls.  """
+        board = np.full((width, height), WALL, dtype=np.uint8)
+        board[1:-1, 1:-1] = GROUND
+        return board
+
+    def _random_point(self, min_distance=constants.MIN_SPAWN_WALL_DISTANCE):
+        """
+            Returns a random point on the board at least min_distance away from the sides.
+
+            :param min_distance: int
+                The minimum distance to the borders of the snake
+
+            :return Point
+                A position on the board at least min_distance away from the boarder
+        """
+        return Point.at(int(self.np_random.integers(min_distance, self.width - min_distance)),
+                        int(self.np_random.integers(min_distance, self.height - min_distance)))
+
+    def _clear_snakes(self):
+        """ Removes all snakes from the snake state arrays.  """
+        for name in self._snake_arrays:
+            setattr(self, name, getattr(self, name)[:0])
+        self._snakes_alive = 0
+
+    def _add_snake(self, index):
+        """ Adds a snake of start length, folded onto a single cell.  """
+        snake = self.snakes
+        for name in self._snake_arrays:
+            array = getattr(self, name)
+            setattr(self, name, np.concatenate([array, np.zeros((1, *array.shape[1:]), dtype=array.dtype)]))
+
+        self._body[snake] = index
+        self._head[snake] = 0
+        self._length[snake] = 1
+        self._direction[snake] = object_constants.DIRECTION_START_INDEX
+        self._life_left[snake] = object_constants.LIFE_START
+        self._life_time[snake] = 0
+        self._alive[snake] = True
+        self._snakes_alive += 1
+        if self.detect_cycles:
+            self._hash = self._head_keys[index]
+        for _ in range(1, Snake.LEN_SNAKE_START):
+            self._increase_length(snake)
+        if self.detect_cycles:
+            self._save_state(snake)
+
+    def _tail(self, snake, offset=0):
+        """ Returns the ring index of the tail, or of the segments before it with an offset.  """
+        return (self._head[snake] - self._length[snake] + 1 + offset) % self._capacity
+
+    def _increase_length(self, snake):
+        """ Copies the tail, so the snake grows on the next step.  """
+        if self._length[snake] < Snake.LEN_SNAKE_MAX:
+            tail = self._body[snake, self._tail(snake)]
+            self._length[snake] += 1
+            self._body[snake, self._tail(snake)] = tail
+            if self.detect_cycles:
+                self._hash ^= self._segment_keys[tail][STAY]
+        self._life_left[snake] = min(self._life_left[snake] + Snake.APPLE_TIME, Snake.LIFE_MAX)
+
+    def _free_tail(self, snake):
+        """ Clears the cell of the tail of a snake, unless the segment before it lies on the same cell.  """
+        tail = self._body[snake, self._tail(snake)]
+        if self._length[snake] > 1 and self._body[snake, self._tail(snake, 1)] != tail:
+            self.cells.reshape(-1)[tail] = GROUND
+            self.free_cells.add(tail)
+
+    def _advance(self, snakes, new_heads):
+        """ Moves the heads of the snakes forward, which drops the last tail entry from their ring buffers.  """
+        self._reward += constants.DEFAULT_REWARD_PER_STEP * len(snakes)
+        self._head[snakes] = (self._head[snakes] + 1) % self._capacity
+        self._body[snakes, self._head[snakes]] = new_heads
+        self._life_time[snakes] += 1
+        self._life_left[snakes] -= 1
+        self.cells.reshape(-1)[new_heads] = SNAKE
+
+    def _step_snake(self, snake):
+        """
+            Steps a single snake, which can not collide with any other snake.
+        """
+        flat = self.cells.reshape(-1)
+        dx, dy = DIRECTION_DELTA[self._direction[snake]]
+        new_head = self._body[snake, self._head[snake]] + dx * self.height + dy
+        new_position_board = flat[new_head]
+
+        # If crashed
+        if new_position_board == WALL or new_position_board == SNAKE or self._life_left[snake] <= 0:
+            self._alive[snake] = False
+            self._snakes_alive -= 1
+            return
+
+        # If apple is eaten
+        next_is_apple = new_position_board == APPLE
+        length = self._length[snake]
+        if next_is_apple:
+            self._reward += constants.DEFAULT_REWARD_PER_APPLE
+            self._increase_length(snake)
+            self._apples.remove(new_head)
+            self.add_object("apple")
+
+        # Only a single snake is hashed, the moves of other snakes are not part of the hash
+        detect_cycles = self.detect_cycles and self.snakes == 1
+        if detect_cycles:
+            self._hash_step(snake, new_head, drop_tail=self._length[snake] == length)
+
+        # Remove tail if the snake did not grow, a snake of maximum length also moves its tail when it eats
+        if self._length[snake] == length:
+            self._free_tail(snake)
+
+        # Reward for every step
+        self._reward += constants.DEFAULT_REWARD_PER_STEP
+
+        # Move the head forward, which drops the last tail entry from the ring buffer
+        self._head[snake] = (self._head[snake] + 1) % self._capacity
+        self._body[snake, self._head[snake]] = new_head
+        self._life_time[snake] += 1
+        self._life_left[snake] -= 1
+        flat[new_head] = SNAKE
+        self.free_cells.remove(new_head)
+
+        if detect_cycles:
+            if next_is_apple:
+                self._save_state(snake)
+            elif self._looped(snake):
+                # The snake would loop until its life is up, so it gets the rewards of those steps right away
+                life_left = int(self._life_left[snake])
+                self._reward += constants.DEFAULT_REWARD_PER_STEP * life_left
+                self._life_time[snake] += life_left
+                self._life_left[snake] = 0
+                self._alive[snake] = False
+                self._snakes_alive -= 1
+
+    def _hash_step(self, snake, new_head, drop_tail):
+        """
+            Updates the hash of a snake for a step to new_head, before its head moves.
+
+            :param snake: int
+                The index of the snake
+            :param new_head: int
+                The flat index of the new head
+            :param drop_tail: bool
+                True if the tail segment is dropped, which is the case unless the snake grows
+        """
+        head = self._body[snake, self._head[snake]]
+        self._hash ^= self._head_keys[head] ^ self._head_keys[new_head]
+        self._hash ^= self._segment_keys[head][self._direction[snake]]
+        if drop_tail:
+            tail_index = self._tail(snake)
+            tail = self._body[snake, tail_index]
+            front = self._body[snake, (tail_index + 1) % self._capacity]
+            self._hash ^= self._segment_keys[tail][self._segment_direction[front - tail + self.height]]
+
+    def _save_state(self, snake):
+        """ Saves the current state of a snake to compare the next states with, after it spawns or eats.  """
+        self._saved_hash = self._hash ^ self._direction_keys[self._direction[snake]]
+        self._steps_saved = 0
+        self._power = 1
+
+    def _looped(self, snake):
+        """
+            Returns True if the snake is in a state it was in before, since it last ate.
+
+            Brent's algorithm: the current state is compared with a saved state, which is replaced by the
+            current state after 1, 2, 4, 8, ... steps. Every loop is found once the steps reach its length.
+        """
+        state = self._hash ^ self._direction_keys[self._direction[snake]]
+        if state == self._saved_hash:
+            return True
+        self._steps_saved += 1
+        if self._steps_saved == self._power:
+            self._saved_hash, self._steps_saved, self._power = state, 0, 2 * self._power
+        return False
+
+    def _step(self, action):
+        """
+            Perform step function for all living snakes at once.
+
+            :param action: int or array of int
+                The action of every snake, a single action is performed by all snakes.
+        """
+        self._reward = 0
+        living = np.flatnonzero(self._alive)
+        if len(living) == 1:
+            # A single snake can not collide with other snakes, so it is stepped on its own
+            snake = living[0]
+            direction = constants.ACTION_DIRECTION[action if np.ndim(action) == 0 else action[snake]]
+            if direction >= 0 and DIRECTION_OPPOSITE[self._direction[snake]] != direction:
+                self._direction[snake] = direction
+            self._step_snake(snake)
+            return
+        if not len(living):
+            return
+
+        # Turn unless the action is a NOOP or would reverse the snake into its own body
+        direction = self._direction[living]
+        new_direction = ACTION_DIRECTION[np.broadcast_to(action, self.snakes)[living]]
+        turn = (new_direction >= 0) & (DIRECTION_OPPOSITE[direction] != new_direction)
+        direction = np.where(turn, new_direction, direction)
+        self._direction[living] = direction
+
+        # Resolve the collisions of all new heads at once
+        flat = self.cells.reshape(-1)
+        new_heads = self._body[living, self._head[living]] + self._step_offset[direction]
+        dead, ate = resolve_moves(flat, new_heads, self._life_left[living])
+        self._alive[living[dead]] = False
+        self._snakes_alive -= int(dead.sum())
+
+        # Remove the tail if no more body part is following it and move the heads of the snakes that did not eat
+        moved = ~dead & ~ate
+        movers, mover_heads = living[moved], new_heads[moved]
+        tail_index = self._tail(movers)
+        tails = self._body[movers, tail_index]
+        clear = (self._length[movers] > 1) & (self._body[movers, (tail_index + 1) % self._capacity] != tails)
+        flat[tails[clear]] = GROUND
+        self._advance(movers, mover_heads)
+        for tail, cleared, head in zip(tails, clear, mover_heads):
+            if cleared:
+                self.free_cells.add(tail)
+            self.free_cells.remove(head)
+
+        # New apples spawn after the other snakes moved, on a random point away from the walls or on a random free
+        # cell if that point is taken. The eaten apple still holds its cell, so no new apple spawns on the head.
+        for snake, head in zip(living[ate], new_heads[ate]):
+            self._reward += constants.DEFAULT_REWARD_PER_APPLE
+            length = self._length[snake]
+            self._increase_length(snake)
+            self._apples.remove(head)
+            self.add_object("apple")
+            if self._length[snake] == length:
+                self._free_tail(snake)
+            self._advance(snake[None], head[None])
+            self.free_cells.remove(head)
@@ -0,0 +1,41 @@
+import numpy as np
+
+from snake.objects import constants
+
+# (dx, dy) per direction in the order of constants.DIRECTION_VALID
+DIRECTION_DELTA = np.array(constants.DIRECTION_DELTA, dtype=np.intp)
+
+
+def step_offsets(height):
+    """ Returns the flat index offset of a step in every direction on a board with the given height.  """
+    return DIRECTION_DELTA[:, 0] * height + DIRECTION_DELTA[:, 1]
+
+
+def resolve_moves(flat, new_heads, life_left):
+    """
+        Resolves the moves of all snakes on a board at once.
+
+        All snakes move at the same time, so the outcome does not depend on the order of the snakes.
+        The board before the step decides, a snake dies when it moves into a wall or any snake cell
+        (tails included) or when its life is up. Snakes that would survive but move into the same cell
+        collide head to head and all of them die.
+
+        :param flat: NDArray
+            The flat cell codes of the board before the step
+        :param new_heads: NDArray of int
+            The flat index of the new head of every moving snake
+        :param life_left: NDArray of int
+            The life left of every moving snake
+        :return: dead, ate
+            Boolean arrays with the snakes that die and the snakes that eat an apple
+    """
+    target = flat[new_heads]
+    dead = (target == constants.CELL_WALL) | (target == constants.CELL_SNAKE) | (life_left <= 0)
+
+    # Head to head collisions between the snakes that would survive
+    if len(new_heads) > 1:
+        _, inverse, counts = np.unique(np.where(dead, -1, new_heads), return_inverse=True, return_counts=True)
+        dead |= ~dead & (counts[inverse] > 1)
+
+    ate = ~dead & (target == constants.CELL_APPLE)
+    return dead, ate
@@ -0,0 +1,40 @@
+import numpy as np
+
+from snake.objects.wall import Wall
+from snake.objects.ground import Ground
+from snake.objects.snake import Snake
+from snake.objects.apple import Apple
+
+# Lookup tables from cell code to the display attributes of the objects
+PALETTE = {attribute: np.array([getattr(each, attribute) for each in sorted([Ground, Wall, Snake, Apple],
+                                                                             key=lambda each: each.cell)])
+           for attribute in ['rgb', 'ansi', 'ansi_fancy']}
+PALETTE['rgb'] = PALETTE['rgb'].astype(np.uint8)
+
+
+def render(cells, attribute="rgb", out=None):
+    """
+        Looks up the display attribute of every cell.
+
+        :param cells: NDArray
+            The integer coded cells of a board
+        :param attribute: str
+            The attribute of the objects, valid inputs are: ['rgb', 'ansi', 'ansi_fancy']
+        :param out: NDArray
+            Optional preallocated array the result is written into, of shape cells.shape (+ (3,) for rgb)
+        :return: NDArray
+            The rgb values (uint8) or the characters of every cell
+    """
+    return np.take(PALETTE[attribute], cells, axis=0, out=out, mode='clip')
+
+
+def render_text(cells, attribute="ansi"):
+    """
+        Returns the characters of all cells as a single string, with a line for every row of the cells.
+
+        :param cells: NDArray
+            The integer coded cells of a board
+        :param attribute: str
+            Either 'ansi' or 'ansi_fancy'
+    """
+    return "\n".join(map("".join, render(cells, attribute).tolist()))
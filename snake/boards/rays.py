@@ -0,0 +1,51 @@
+import functools
+import itertools
+import numpy as np
+
+from snake.objects import constants
+
+# The 8 directions the snakes look in, in the order of the genetic observation
+DIRECTIONS = np.array([x for x in itertools.product([0, 1, -1], repeat=2)][1:])
+
+
+@functools.lru_cache(maxsize=16)
+def ray_table(width, height):
+    """
+        Returns the flat indices of the cells seen from every cell in all 8 directions.
+
+        The tables of the 16 board sizes used last are kept. Rays are clipped to the board, so every ray
+        ends on (repetitions of) a border cell.
+
+        :param width: int
+            The width of the board
+        :param height: int
+            The height of the board
+        :return: NDArray of shape (width * height, 8, max(width, height) - 1)
+    """
+    x, y = np.divmod(np.arange(width * height), height)
+    steps = np.arange(1, max(width, height))
+
+    ray_x = np.clip(x[:, None, None] + DIRECTIONS[None, :, 0, None] * steps, 0, width - 1)
+    ray_y = np.clip(y[:, None, None] + DIRECTIONS[None, :, 1, None] * steps, 0, height - 1)
+    rays = ray_x * height + ray_y
+    rays.setflags(write=False)
+    return rays
+
+
+def distances(seen):
+    """
+        Converts the cells seen along the rays into distances to the first wall, snake or apple.
+
+        :param seen: NDArray of shape (n, 8, L)
+            The cell codes along the rays of n heads, as gathered with the ray_table
+        :return: NDArray of shape (n, 3, 8)
+            wall distance, snake distance, food distance in every direction
+    """
+    first = np.argmax(seen != constants.CELL_GROUND, axis=2)
+    found = np.take_along_axis(seen, first[..., None], axis=2)[..., 0]
+
+    # Wall, snake and apple codes follow each other, so they map directly on the object index
+    out = np.zeros((seen.shape[0], 3, seen.shape[1]), dtype=int)
+    index, direction = np.indices(first.shape)
+    out[index, found.astype(np.intp) - constants.CELL_WALL, direction] = first + 1
+    return out
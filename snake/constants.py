@@ -15,3 +15,7 @@ DEFAULT_REWARD_PER_STEP = 1
 # Atari environment constants
 GET_ACTION_MEANING = ["NOOP"] + DIRECTION_VALID
 ACTION_SPACE = len(GET_ACTION_MEANING)
+
+# The direction (index in DIRECTION_VALID) every action turns to, NOOP keeps the direction (-1)
+ACTION_DIRECTION = [DIRECTION_VALID.index(meaning) if meaning in DIRECTION_VALID else -1
+                    for meaning in GET_ACTION_MEANING]
@@ -3,11 +3,7 @@
 import numpy as np
 
 from snake.displays.base_display import BaseDisplay
-from utils.suppress import suppress_stdout
-
-
-with suppress_stdout():
-    import pygame
+from tools.lazy_import import import_pygame
 
 
 class SingleImage(BaseDisplay):
@@ -22,6 +18,7 @@ class SingleImage(BaseDisplay):
 
     def _init_pygame(self, width, height, scale_factor):
         """ Helper function to restart pygame if env is closed and you want to reset it.  """
+        pygame = import_pygame()
         pygame.init()
         pygame.display.set_caption('Snakes')
 
@@ -31,6 +28,7 @@ class SingleImage(BaseDisplay):
                                                          height * scale_factor))
 
     def render(self, obs):
+        pygame = import_pygame()
 
         # Lazy starting of rendering
         if not self._setup:
@@ -70,5 +68,6 @@ class SingleImage(BaseDisplay):
         return obs
 
     def close(self):
-        pygame.quit()
+        if self._setup:
+            import_pygame().quit()
         self._setup = not self._setup
@@ -1,17 +1,30 @@
+from types import MappingProxyType
+
 import gym
-import itertools
 import numpy as np
 
-from snake.objects.utils import Point
+from snake.boards.palette import render_text
 from snake.game import SnakeGame
 
+# Info returned by every step in fast step mode, SnakeEnv.info computes the actual info on request
+NO_INFO = MappingProxyType({})
+
 
 class SnakeEnv(gym.Env):
+    """
+        Gym environment of a snake game.
+
+        In fast step mode a step writes the observation into a buffer that is owned by the environment
+        (or the out array given to step) and is overwritten every step. Instead of the info of the
+        game every step returns the empty NO_INFO mapping, the info can be requested with info().
+    """
     metadata = {'render.modes': ['human', 'ansi', 'ansi_fancy', 'rgb_array', 'gen']}
 
-    def __init__(self, game="snake", mode='human', obs_type="image", width=None, height=None, scale=None):
+    def __init__(self, game="snake", mode='human', obs_type="image", width=None, height=None, scale=None,
+                 board="classic", fast_step=False, detect_cycles=False):
         self.game = game
-        self.env = SnakeGame(width, height)
+        self.env = SnakeGame(width, height, board, detect_cycles)
+        self._fast_step = fast_step
 
         self._scale = scale
         self._obs_type = obs_type
@@ -28,6 +41,9 @@ class SnakeEnv(gym.Env):
         self.env.obs = self._get_obs(self._mode)
         self.viewer = None
 
+        # The rgb observations are already written into the image of the game
+        self._obs_buffer = np.zeros(24, dtype=int) if mode == 'gen' else None
+
     def _get_observation_space(self):
         """ Define the observation space depending on the observation type.  """
         (screen_width, screen_height) = self.env.board.get_screen_dimensions()
@@ -58,8 +74,8 @@ class SnakeEnv(gym.Env):
     def _get_image_dimension(self):
         """ Pre allocates new image space and maintains aspect ratio while clipping at width=500, height=500.  """
         scale = 1
-        obs = self.env.reset()
-        width, height = obs.shape
+        self.env.reset()
+        width, height = self.env.board.get_screen_dimensions()
         while width * scale < 500 and height * scale < 500 and scale < self._scale:
             scale += 1
         self._scale = self._scale if self._scale <= scale else scale - 1
@@ -68,9 +84,27 @@ class SnakeEnv(gym.Env):
     def seed(self, seed=None):
         return self.env.seed(seed)
 
-    def step(self, action: int):
-        self._obs_store, reward, done, info = self.env.step(action)
-        return self._obs_store, reward, done, info
+    def step(self, action: int, out=None):
+        """
+            Takes a step in the game.
+
+            :param action: int
+                The action that has to be performed
+            :param out: NDArray
+                In fast step mode, an optional array to write the observation into
+        """
+        if not self._fast_step:
+            self._obs_store, reward, done, info = self.env.step(action)
+            return self._obs_store, reward, done, info
+
+        board = self.env.board
+        board.step(action, values=False)
+        self._obs_store = self.env.obs(out=self._obs_buffer if out is None else out)
+        return self._obs_store, board.reward(), board.done(), NO_INFO
+
+    def info(self):
+        """ Returns the info of the game after the last step.  """
+        return self.env.info()
 
     def reset(self):
         return self.env.reset()
@@ -114,7 +148,7 @@ class SnakeEnv(gym.Env):
             self.viewer.close()
             self.viewer = None
 
-    def _observation_genetic(self):
+    def _observation_genetic(self, out=None):
         """
             Generates the output array.
             The output will be a (24,) numpy array, with 3 times 8 directions.
@@ -122,37 +156,21 @@ class SnakeEnv(gym.Env):
             wall distance, snake distance, food distance
             ["UP", "DOWN", "LEFT", "LEFT UP", "LEFT DOWN", "RIGHT", "RIGHT UP", "RIGHT DOWN"]
         """
-        object_types = [v for k, v in self.env.board.object_types.items() if k != "ground"]
-        obs_directions = [x for x in itertools.product([0, 1, -1], repeat=2)][1:]
-        obs_out = np.zeros((len(self.env.board.objects['snake']), len(object_types), len(obs_directions)), dtype=np.int)
-
-        for idx_snake, snake in enumerate(self.env.board.objects['snake']):
-            for idx_direction, direction in enumerate(obs_directions):
-                scan_direction = Point(*direction)
-                object_found = False
-                scan_counter = 1
-                while not object_found:
-                    scan_x = snake.position.x + scan_direction.x * scan_counter
-                    scan_y = snake.position.y + scan_direction.y * scan_counter
-                    for idx_object, object_type in enumerate(object_types):
-                        if isinstance(self.env.board.board[scan_x, scan_y], object_type):
-                            obs_out[idx_snake, idx_object, idx_direction] = scan_counter
-                            object_found = True
-                    scan_counter += 1
-        return obs_out.flatten()
-
-    def _observation_ansi(self):
-        """ Returns a string of the game.  """
-        obs = self.env.board.obs(attribute=self._mode)
-        return "\n".join(map(str, ["".join(row.tolist()) for row in obs]))
-
-    def _observation_rgb(self):
-        """ Returns a numpy array with rgb values of shape (board.width, board.height, 3).  """
-        obs = self.env.board.obs()
-        for x in range(obs.shape[0]):
-            for y in range(obs.shape[1]):
-                self.env.image[x, y] = obs[x, y]
-        return np.transpose(self.env.image, axes=(1, 0, 2))
+        if out is None:
+            return self.env.board.vision().flatten()
+        out[:] = self.env.board.vision().reshape(-1)
+        return out
+
+    def _observation_ansi(self, out=None):
+        """ Returns a string of the game, strings can not be written into a buffer.  """
+        return render_text(self.env.board.cells, attribute=self._mode)
+
+    def _observation_rgb(self, out=None):
+        """ Returns a numpy array with rgb values of shape (board.height, board.width, 3).  """
+        if out is None:
+            out = np.transpose(self.env.image, axes=(1, 0, 2))
+        self.env.board.obs(out=np.transpose(out, axes=(1, 0, 2)))
+        return out
 
     def _observation_rgb_scaled(self, observation):
         """ Returns a scaled version of the _observation_rgb.  """
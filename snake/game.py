@@ -2,13 +2,19 @@
 import numpy as np
 
 from snake.boards.classic import Board
+from snake.boards.grid import GridBoard
+
+# Board engines that can be selected by name
+BOARDS = dict(classic=Board, grid=GridBoard)
 
 
 class SnakeGame:
     """ Remapping of all board functions to the public available environment functions.  """
 
-    def __init__(self, width=None, height=None):
-        self.board = Board(width, height)
+    def __init__(self, width=None, height=None, board="classic", detect_cycles=False):
+        if board not in BOARDS:
+            raise ValueError(f"Board '{board}' not familiar, valid options are: {list(BOARDS)}")
+        self.board = BOARDS[board](width, height, detect_cycles=detect_cycles)
         self.image = np.zeros((self.board.width, self.board.height, 3), dtype=np.uint8)
 
     def obs(self, attribute="rgb"):
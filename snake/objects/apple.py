@@ -10,6 +10,7 @@ class Apple(Object):
     rgb = constants.RED
     ansi_fancy = constants.FISH_EYE
     ansi = "A"
+    cell = constants.CELL_APPLE
 
     def __init__(self, position: Point):
         self.position = position
@@ -1,13 +1,14 @@
 
 from .utils import Point
 from abc import ABC, abstractmethod
-from copy import deepcopy
+from copy import copy
 
 
 class AbstractObject(ABC):
     position: Point     # Position
     rgb: tuple       # For image displaying
     ansi: str           # For string display
+    cell: int           # For integer coded boards
 
     @abstractmethod
     def __str__(self): ...
@@ -42,10 +43,10 @@ class Object(AbstractObject):
 
     def clone(self):
         """
-            Clones the object
+            Clones the object, the position is immutable and shared with the clone
         :return: a copy of itself
         """
-        return deepcopy(self)
+        return copy(self)
 
     def collide(self, other):
         """
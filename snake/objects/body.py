@@ -0,0 +1,101 @@
+class Body:
+    """
+        Ring buffer with the positions of a snake body, with the head first and the tail last.
+
+        Besides the positions, the number of body parts on every position is counted, so testing
+        if a position is part of the body is a single lookup instead of a scan over the body.
+        Like a deque with a maxlen, adding a body part to a full body drops one from the other end.
+
+        :param maxlen: int
+            The maximum number of body parts
+    """
+
+    def __init__(self, maxlen):
+        self.maxlen = maxlen
+        self._items = [None] * maxlen
+        self._start = 0
+        self._length = 0
+        self._occupied = dict()
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield self._items[(self._start + index) % self.maxlen]
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Body index out of range")
+        return self._items[(self._start + index) % self.maxlen]
+
+    def __contains__(self, position):
+        return self._key(position) in self._occupied
+
+    def __repr__(self):
+        return f"Body({list(self)})"
+
+    def copy(self):
+        """ Returns a copy of the body, the positions are immutable and shared.  """
+        body = Body(self.maxlen)
+        body._items = self._items.copy()
+        body._start = self._start
+        body._length = self._length
+        body._occupied = self._occupied.copy()
+        return body
+
+    @staticmethod
+    def _key(position):
+        """ Packs the x, y position into a single int.  """
+        return (position.x << 32) + position.y
+
+    def _occupy(self, position):
+        key = self._key(position)
+        self._occupied[key] = self._occupied.get(key, 0) + 1
+
+    def _release(self, position):
+        key = self._key(position)
+        count = self._occupied[key] - 1
+        if count:
+            self._occupied[key] = count
+        else:
+            del self._occupied[key]
+
+    def append(self, position):
+        """ Adds a body part after the tail.  """
+        if self._length == self.maxlen:
+            self.popleft()
+        self._items[(self._start + self._length) % self.maxlen] = position
+        self._length += 1
+        self._occupy(position)
+
+    def appendleft(self, position):
+        """ Adds a body part before the head.  """
+        if self._length == self.maxlen:
+            self.pop()
+        self._start = (self._start - 1) % self.maxlen
+        self._items[self._start] = position
+        self._length += 1
+        self._occupy(position)
+
+    def pop(self):
+        """ Removes and returns the tail.  """
+        if not self._length:
+            raise IndexError("pop from an empty body")
+        self._length -= 1
+        index = (self._start + self._length) % self.maxlen
+        position, self._items[index] = self._items[index], None
+        self._release(position)
+        return position
+
+    def popleft(self):
+        """ Removes and returns the head.  """
+        if not self._length:
+            raise IndexError("pop from an empty body")
+        position, self._items[self._start] = self._items[self._start], None
+        self._start = (self._start + 1) % self.maxlen
+        self._length -= 1
+        self._release(position)
+        return position
@@ -19,6 +19,12 @@ GREEN_SERPENTINE = (94, 195, 0)
 BLUE = (0, 0, 255)
 BLACK = (0, 0, 0)
 
+# Cell codes of the objects on an integer coded board
+CELL_GROUND = 0
+CELL_WALL = 1
+CELL_SNAKE = 2
+CELL_APPLE = 3
+
 # Snake constants
 APPLE_TIME = 200
 LIFE_MAX = 500
@@ -31,6 +37,11 @@ DIRECTION_START = "UP"
 DIRECTION_VALID = ["LEFT", "RIGHT", "UP", "DOWN"]
 DIRECTION_VALUE = dict(LEFT=1, RIGHT=-1, UP=2, DOWN=-2)
 
+# Directions as ints in the order of DIRECTION_VALID, with the (dx, dy) of a step and the direction that reverses it
+DIRECTION_DELTA = ((-1, 0), (1, 0), (0, -1), (0, 1))
+DIRECTION_OPPOSITE = (1, 0, 3, 2)
+DIRECTION_START_INDEX = DIRECTION_VALID.index(DIRECTION_START)
+
 # Atari environment constants
 GET_ACTION_MEANING = ["NOOP"] + DIRECTION_VALID
 ACTION_SPACE = len(GET_ACTION_MEANING)
@@ -10,6 +10,7 @@ class Ground(Object):
     rgb = constants.WHITE
     ansi_fancy = constants.SQUARE_BLACK_SMALL
     ansi = "."
+    cell = constants.CELL_GROUND
 
     def __init__(self, position):
         self.position = position
@@ -1,8 +1,10 @@
 
-from collections import deque
+from copy import copy
 
 from snake.objects import constants
 from .base_object import Object
+from .body import Body
+from .utils import Point
 
 
 class Snake(Object):
@@ -15,6 +17,7 @@ class Snake(Object):
     rgb = constants.GREEN_SERPENTINE
     ansi_fancy = constants.SQUARE_BLACK
     ansi = "0"
+    cell = constants.CELL_SNAKE
 
     APPLE_TIME = constants.APPLE_TIME
     LIFE_MAX = constants.LIFE_MAX
@@ -25,31 +28,31 @@ class Snake(Object):
         self.position = position
 
         # Define start direction and timers
-        self._direction = constants.DIRECTION_START
+        self._direction = constants.DIRECTION_START_INDEX
         self.life_left = constants.LIFE_START    # Time until snake dies
         self.life_time = 0                       # Time snake lives
         self.alive = True
 
         # Create the snake body
-        self.body = deque(maxlen=self.LEN_SNAKE_MAX)
+        self.body = Body(maxlen=self.LEN_SNAKE_MAX)
         self.body.append(self.position)
         for _ in range(1, self.LEN_SNAKE_START):
             self.increase_length()
 
     def __contains__(self, item):
         """ Check if a snake is colliding with another snake.  """
-        return bool(set(item.body) & set(self.body))
+        return any(position in self.body for position in item.body)
 
     def __eq__(self, other):
         """ Check if the snake is the same one, by checking all body positions.  """
         if hasattr(other, "body"):
-            return not (set(self.body) - set(other.body))
+            return all(position in other.body for position in self.body)
         return False
 
     def __ne__(self, other):
         """ Check if the snake is not the same one, by checking all body positions.  """
         if hasattr(other, "body"):
-            return bool(set(self.body) - set(other.body))
+            return not all(position in other.body for position in self.body)
         return False
 
     def __len__(self):
@@ -70,7 +73,8 @@ class Snake(Object):
 
     @property
     def direction(self):
-        return self._direction
+        """ The name of the direction the snake is moving in.  """
+        return constants.DIRECTION_VALID[self._direction]
 
     @direction.setter
     def direction(self, value):
@@ -78,14 +82,21 @@ class Snake(Object):
             Only set the value if it is a valid direction and
             you do not try to return in the opposite direction(against the body)
 
-            :param value: int
+            :param value: str
                 New direction of the snake
         """
         if value in constants.DIRECTION_VALID:
-            value_current = constants.DIRECTION_VALUE.get(self.direction)
-            value_new = constants.DIRECTION_VALUE.get(value)
-            if value_current != -value_new:
-                self._direction = value
+            self.turn(constants.DIRECTION_VALID.index(value))
+
+    def turn(self, direction):
+        """
+            Turn the snake, unless it would return in the opposite direction (against the body)
+
+            :param direction: int
+                Index of the new direction in DIRECTION_VALID, a negative direction keeps the current direction
+        """
+        if direction >= 0 and constants.DIRECTION_OPPOSITE[self._direction] != direction:
+            self._direction = direction
 
     def get_head(self):
         """ Returns the head position of the snake.  """
@@ -122,14 +133,9 @@ class Snake(Object):
             :return: Point
                 New location of the head
         """
-        new_head = self.body[0].clone()
-        if self.direction in ["LEFT", "RIGHT"]:
-            new_head.x += 1 if self.direction == "RIGHT" else -1
-
-        if self.direction in ["UP", "DOWN"]:
-            new_head.y += 1 if self.direction != "UP" else -1
-
-        return new_head
+        head = self.body[0]
+        dx, dy = constants.DIRECTION_DELTA[self._direction]
+        return Point.at(head.x + dx, head.y + dy)
 
     def collide(self, other):
         """
@@ -137,10 +143,13 @@ class Snake(Object):
 
             :param other: Point
         """
-        for body in self.body:
-            if body == other.position:
-                return True
-        return False
+        return other.position in self.body
+
+    def clone(self):
+        """ Clones the snake with its own copy of the body.  """
+        clone = copy(self)
+        clone.body = self.body.copy()
+        return clone
 
     def location(self):
         return self.body
@@ -1,19 +1,15 @@
+import functools
+from collections import namedtuple
 
 
-class Point:
+class Point(namedtuple("Point", ["x", "y"])):
     """
         Helper function to maintain x, y position on the board.
-    """
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-
-    def __hash__(self):
-        # Required for set comparisons
-        return hash((self.x, self.y))
 
-    def __eq__(self, other):
-        return self.x == other.x and self.y == other.y
+        Points are immutable tuples without an instance dict, so they can be shared instead of cloned.
+        Point.at returns the interned point of a position, board_points all points of a board.
+    """
+    __slots__ = ()
 
     def __str__(self):
         return f"(x={self.x}, y={self.y})"
@@ -21,8 +17,29 @@ class Point:
     def __repr__(self):
         return self.__str__()
 
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def at(cls, x, y):
+        """ Returns the interned point of the position, the same object for every call.  """
+        return cls(x, y)
+
     def clone(self):
-        return Point(self.x, self.y)
+        """ Points are immutable, so the point itself can be used as its clone.  """
+        return self
 
     def as_value(self):
         return self.x, self.y
+
+
+@functools.lru_cache(maxsize=None)
+def board_points(width, height):
+    """
+        Returns the interned points of all cells of a board, indexed by flat index x * height + y.
+
+        :param width: int
+            The width of the board
+        :param height: int
+            The height of the board
+        :return: tuple of Points
+    """
+    return tuple(Point.at(x, y) for x in range(width) for y in range(height))
@@ -10,6 +10,7 @@ class Wall(Object):
     rgb = constants.BLACK
     ansi_fancy = constants.SQUARE_WHITE
     ansi = "X"
+    cell = constants.CELL_WALL
 
     def __init__(self, position):
         self.position = position
@@ -0,0 +1,35 @@
+"""
+Random number generators of the games.
+
+Every board and environment owns a numpy Generator, so games never share or disturb each other's random state.
+The seeds of games that are played together are derived from a single seed with SeedSequence.spawn.
+"""
+import numpy as np
+
+
+def np_random(seed=None):
+    """
+        Returns a new Generator and the seed it is created from.
+
+        :param seed: int, SeedSequence or None
+            When no seed is given, a new seed is drawn from the entropy of the operating system
+        :return: (Generator, seed)
+    """
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    return np.random.default_rng(seed), seed
+
+
+def spawn(seed, n):
+    """
+        Derives n independent seeds from a single seed.
+
+        Spawning from the same SeedSequence again gives new seeds, spawning from the same int gives the same seeds.
+
+        :param seed: int, SeedSequence or None
+        :param n: int
+            The number of seeds
+        :return: list of SeedSequence
+    """
+    sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return sequence.spawn(n)
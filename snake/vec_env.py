@@ -0,0 +1,341 @@
+import gym
+import numpy as np
+
+from snake.boards.grid import GridBoard, GROUND, WALL, SNAKE, APPLE, DIRECTION_DELTA, DIRECTION_OPPOSITE, \
+    ACTION_DIRECTION
+from snake.boards.cycles import STAY, segment_directions, zobrist_keys
+from snake.boards.palette import render
+from snake.boards.free_cells import FreeCells
+from snake.boards.rays import ray_table, distances
+from snake.objects import constants as object_constants
+from snake import constants, seeding
+
+
+class SnakeVecEnv:
+    """
+        Runs N independent single snake games with the classic rules in stacked arrays.
+
+        All games are advanced at once with a single vectorized step. Finished games are
+        reset automatically, the observation of the finished game is kept in the info.
+
+        :param num_envs: int
+            The number of games that are played at the same time
+        :param width: int
+            The width of every board
+        :param height: int
+            The height of every board
+        :param obs_type: str
+            Either 'gen' for the (24,) distance observation or 'image' for rgb images
+        :param detect_cycles: bool
+            End a game as soon as the snake loops without eating, with the score it would get when its
+            life is up. Only valid for agents that always act the same on the same board, see GridBoard.
+
+        Every game has its own random generator, so game i plays the same as a GridBoard seeded with
+        the i-th seed, no matter which other games are played next to it.
+    """
+    metadata = {'obs_types': ['gen', 'image']}
+
+    def __init__(self, num_envs, width=None, height=None, obs_type="gen", detect_cycles=False):
+        if obs_type not in self.metadata['obs_types']:
+            raise gym.error.Error('Unrecognized observation type: {}'.format(obs_type))
+
+        self.num_envs = num_envs
+        self.width = width if width is not None else constants.WIDTH
+        self.height = height if height is not None else constants.HEIGHT
+        self._obs_type = obs_type
+
+        # Board state of all games, the flat view shares memory with the cells
+        self._board = GridBoard._create_board(self.width, self.height)
+        self.cells = np.repeat(self._board[None], num_envs, axis=0)
+        self._flat = self.cells.reshape(num_envs, -1)
+        self._rows = np.arange(num_envs)
+
+        # Snake state of all games, the body is a ring buffer of flat cell indices with the head at self._head
+        self._capacity = object_constants.LEN_SNAKE_MAX + 1
+        self._body = np.zeros((num_envs, self._capacity), dtype=np.intp)
+        self._head = np.zeros(num_envs, dtype=np.intp)
+        self._length = np.zeros(num_envs, dtype=np.intp)
+        self._direction = np.zeros(num_envs, dtype=np.intp)
+        self._life_left = np.zeros(num_envs, dtype=np.intp)
+        self._life_time = np.zeros(num_envs, dtype=np.intp)
+
+        # Free cells of all games, kept in the same order as the FreeCells of a GridBoard
+        free = FreeCells(self._board)
+        self._free_start = (free.cells, free.position, len(free))
+        self._free = np.zeros((num_envs, self._board.size), dtype=np.intp)
+        self._free_position = np.zeros((num_envs, self._board.size), dtype=np.intp)
+        self._free_count = np.zeros(num_envs, dtype=np.intp)
+
+        # A new snake gets extra life for every body part it starts with
+        self._life_start = object_constants.LIFE_START
+        for _ in range(1, object_constants.LEN_SNAKE_START):
+            self._life_start = min(self._life_start + object_constants.APPLE_TIME, object_constants.LIFE_MAX)
+
+        # Flat index offsets of a step in every direction and the rays used for the gen observation
+        self._step_offset = DIRECTION_DELTA[:, 0] * self.height + DIRECTION_DELTA[:, 1]
+        self._rays = ray_table(self.width, self.height)
+
+        # Zobrist hash of the state of every snake and the state it is compared with to find loops
+        self.detect_cycles = detect_cycles
+        if detect_cycles:
+            self._segment_keys, self._head_keys, self._direction_keys = zobrist_keys(self.width, self.height)
+            self._segment_direction = segment_directions(self.height)
+            self._hash = np.zeros(num_envs, dtype=np.uint64)
+            self._saved_hash = np.zeros(num_envs, dtype=np.uint64)
+            self._steps_saved = np.zeros(num_envs, dtype=np.intp)
+            self._power = np.ones(num_envs, dtype=np.intp)
+        self.seed()
+
+        self.action_space = gym.spaces.Discrete(constants.ACTION_SPACE)
+        if obs_type == 'gen':
+            self.observation_space = gym.spaces.Box(low=0, high=max(self.width, self.height), shape=(24,),
+                                                    dtype=np.uint8)
+        else:
+            self.observation_space = gym.spaces.Box(low=0, high=255, shape=(self.height, self.width, 3),
+                                                    dtype=np.uint8)
+
+    def __len__(self):
+        return self.num_envs
+
+    def reset(self):
+        """ Resets all games and returns the batched start observations.  """
+        self._reset_envs(self._rows)
+        return self.obs()
+
+    def step(self, actions, envs=None):
+        """
+            Takes a step in every game.
+
+            :param actions: array of int
+                One action for every game
+            :param envs: array of int
+                Only step these games, the actions and all returned arrays follow this order
+            :return: obs, rewards, dones, info
+                Batched observations, rewards and done flags. The info holds the life left and length
+                of every snake and the final observation of the games that are done.
+        """
+        envs = self._rows if envs is None else np.asarray(envs)
+        actions = np.asarray(actions)
+
+        # Change direction unless the action is a NOOP or would reverse the snake into its own body
+        direction = self._direction[envs]
+        new_direction = ACTION_DIRECTION[actions]
+        turn = (new_direction >= 0) & (DIRECTION_OPPOSITE[direction] != new_direction)
+        direction = np.where(turn, new_direction, direction)
+        self._direction[envs] = direction
+
+        new_head = self._body[envs, self._head[envs]] + self._step_offset[direction]
+        target = self._flat[envs, new_head]
+
+        dead = (target == WALL) | (target == SNAKE) | (self._life_left[envs] <= 0)
+        ate = ~dead & (target == APPLE)
+        moved = ~dead & ~ate
+        rewards = np.where(dead, 0, constants.DEFAULT_REWARD_PER_STEP + ate * constants.DEFAULT_REWARD_PER_APPLE)
+
+        # Copy the tail of snakes that ate, so they grow on this step and spawn a new apple
+        eaters = envs[ate]
+        length = self._length[envs]
+        if len(eaters):
+            self._increase_length(eaters)
+            self._spawn_apples(eaters)
+        if self.detect_cycles:
+            self._hash_step(envs[~dead], new_head[~dead], self._length[envs[~dead]] == length[~dead])
+
+        # Remove the tail if the snake did not grow and no more body part is following it, snakes of maximum
+        # length also move their tail when they eat
+        movers = envs[moved]
+        dropping = envs[~dead & (self._length[envs] == length)]
+        tail_index = self._tail(dropping)
+        tail = self._body[dropping, tail_index]
+        follow = self._body[dropping, (tail_index + 1) % self._capacity]
+        clear = (self._length[dropping] > 1) & (follow != tail)
+        self._flat[dropping[clear], tail[clear]] = GROUND
+        self._add_free(dropping[clear], tail[clear])
+
+        # Move the heads of all living snakes forward
+        living = envs[~dead]
+        self._head[living] = (self._head[living] + 1) % self._capacity
+        self._body[living, self._head[living]] = new_head[~dead]
+        self._flat[living, new_head[~dead]] = SNAKE
+        self._remove_free(movers, new_head[moved])
+        self._life_time[living] += 1
+        self._life_left[living] -= 1
+
+        if self.detect_cycles:
+            self._save_state(eaters)
+            looped = np.zeros_like(dead)
+            looped[moved] = self._looped(movers)
+            if looped.any():
+                # The snakes would loop until their life is up, so they get the rewards of those steps right away
+                finished = envs[looped]
+                rewards[looped] += constants.DEFAULT_REWARD_PER_STEP * self._life_left[finished]
+                self._life_time[finished] += self._life_left[finished]
+                self._life_left[finished] = 0
+                dead = dead | looped
+
+        obs = self.obs(envs)
+        info = dict(life_left=self._life_left[envs], length=self._length[envs])
+        if dead.any():
+            finished = envs[dead]
+            info["terminal_observation"] = obs[dead]
+            info["finished"] = finished
+            self._reset_envs(finished)
+            obs[dead] = self.obs(finished)
+        return obs, rewards, dead, info
+
+    def seed(self, seed=None):
+        """
+            Seeds the random generator of every game.
+
+            :param seed: int, SeedSequence or None, or a list with a seed for every game
+                A single seed is spawned into a seed for every game, a new seed is drawn if no seed is given
+            :return: list with the seed of every game
+        """
+        seeds = seeding.spawn(seed, self.num_envs) if seed is None or np.ndim(seed) == 0 else list(seed)
+        assert len(seeds) == self.num_envs, 'Every game needs its own seed'
+        self._rngs = [np.random.default_rng(each) for each in seeds]
+        return seeds
+
+    def obs(self, envs=None):
+        """
+            Returns the batched observation of all games.
+
+            :param envs: array of int
+                Only return the observations of these games
+        """
+        envs = self._rows if envs is None else envs
+        if self._obs_type == 'gen':
+            return self._observation_genetic(envs)
+        return render(self.cells[envs]).transpose(0, 2, 1, 3)
+
+    def close(self):
+        """ Nothing to clean up, all games live in memory.  """
+        pass
+
+    def _observation_genetic(self, envs):
+        """
+            Generates the (N, 24) output array, with 3 times 8 directions for every game.
+
+            wall distance, snake distance, food distance
+        """
+        seen = self._flat[envs[:, None, None], self._rays[self._body[envs, self._head[envs]]]]
+        return distances(seen).reshape(len(envs), -1)
+
+    def _tail(self, envs, offset=0):
+        """ Returns the ring index of the tail, or of the segments before it with an offset.  """
+        return (self._head[envs] - self._length[envs] + 1 + offset) % self._capacity
+
+    def _increase_length(self, envs):
+        """ Copies the tail of the snakes, so they grow on the next step.  """
+        growing = envs[self._length[envs] < object_constants.LEN_SNAKE_MAX]
+        tail = self._body[growing, self._tail(growing)]
+        self._length[growing] += 1
+        self._body[growing, self._tail(growing)] = tail
+        if self.detect_cycles:
+            self._hash[growing] ^= self._segment_keys[tail, STAY]
+        self._life_left[envs] = np.minimum(self._life_left[envs] + object_constants.APPLE_TIME,
+                                           object_constants.LIFE_MAX)
+
+    def _hash_step(self, envs, new_head, drop_tail):
+        """
+            Updates the hashes of the snakes for a step to new_head, before their heads move.
+
+            :param envs: array of int
+                The games of the snakes that move
+            :param new_head: array of int
+                The flat index of the new head of every snake
+            :param drop_tail: array of bool
+                True for the snakes that drop their tail segment, which are the snakes that do not grow
+        """
+        head = self._body[envs, self._head[envs]]
+        self._hash[envs] ^= self._head_keys[head] ^ self._head_keys[new_head] ^ \
+            self._segment_keys[head, self._direction[envs]]
+
+        envs = envs[drop_tail]
+        tail_index = self._tail(envs)
+        tail = self._body[envs, tail_index]
+        front = self._body[envs, (tail_index + 1) % self._capacity]
+        self._hash[envs] ^= self._segment_keys[tail, self._segment_direction[front - tail + self.height]]
+
+    def _save_state(self, envs):
+        """ Saves the current state of the snakes to compare the next states with, after they spawn or eat.  """
+        self._saved_hash[envs] = self._hash[envs] ^ self._direction_keys[self._direction[envs]]
+        self._steps_saved[envs] = 0
+        self._power[envs] = 1
+
+    def _looped(self, envs):
+        """
+            Returns which snakes are in a state they were in before, since they last ate.
+
+            The states are compared with Brent's algorithm, see GridBoard._looped.
+        """
+        state = self._hash[envs] ^ self._direction_keys[self._direction[envs]]
+        looped = state == self._saved_hash[envs]
+        self._steps_saved[envs] += 1
+        save = ~looped & (self._steps_saved[envs] == self._power[envs])
+        self._saved_hash[envs[save]] = state[save]
+        save = envs[save]
+        self._steps_saved[save] = 0
+        self._power[save] *= 2
+        return looped
+
+    def _random_index(self, envs, min_distance=constants.MIN_SPAWN_WALL_DISTANCE):
+        """ Returns a random flat index for every game, at least min_distance away from the sides.  """
+        index = np.empty(len(envs), dtype=np.intp)
+        for idx, env in enumerate(envs):
+            rng = self._rngs[env]
+            x = rng.integers(min_distance, self.width - min_distance)
+            index[idx] = x * self.height + rng.integers(min_distance, self.height - min_distance)
+        return index
+
+    def _spawn_apples(self, envs):
+        """ Spawns an apple in the given games, on a random free cell if the random point is taken.  """
+        index = self._random_index(envs)
+        for idx in np.flatnonzero(self._flat[envs, index] != GROUND):
+            env = envs[idx]
+            if not self._free_count[env]:
+                raise ValueError("No space to put the new object.")
+            index[idx] = self._free[env, self._rngs[env].integers(self._free_count[env])]
+        self._flat[envs, index] = APPLE
+        self._remove_free(envs, index)
+
+    def _add_free(self, envs, index):
+        """ Appends the cells with the flat indices to the free cells of the games.  """
+        count = self._free_count[envs]
+        self._free[envs, count] = index
+        self._free_position[envs, index] = count
+        self._free_count[envs] = count + 1
+
+    def _remove_free(self, envs, index):
+        """ Removes the free cells with the flat indices, by moving the last free cell of the games in their place.  """
+        position = self._free_position[envs, index]
+        last = self._free_count[envs] - 1
+        moved = self._free[envs, last]
+        self._free[envs, position] = moved
+        self._free_position[envs, moved] = position
+        self._free_position[envs, index] = -1
+        self._free_count[envs] = last
+
+    def _reset_envs(self, envs):
+        """ Resets the given games to a new random start position.  """
+        self.cells[envs] = self._board
+
+        head = self._random_index(envs)
+        self._body[envs] = head[:, None]
+        self._head[envs] = 0
+        self._length[envs] = object_constants.LEN_SNAKE_START
+        self._direction[envs] = object_constants.DIRECTION_START_INDEX
+        self._life_left[envs] = self._life_start
+        self._life_time[envs] = 0
+        self._flat[envs, head] = SNAKE
+
+        self._free[envs], self._free_position[envs], self._free_count[envs] = self._free_start
+        self._remove_free(envs, head)
+        self._spawn_apples(envs)
+
+        if self.detect_cycles:
+            # The start length is folded onto the head, every extra segment stays on the cell of the one before it
+            self._hash[envs] = self._head_keys[head]
+            if (object_constants.LEN_SNAKE_START - 1) % 2:
+                self._hash[envs] ^= self._segment_keys[head, STAY]
+            self._save_state(envs)
@@ -23,6 +23,7 @@ class TestGeneticModel(unittest.TestCase):
         GeneticModel.SAVE_GEN_SCORES = False
         GeneticModel.PLOT_STATS = False
         GeneticModel.RENDER_BEST_WEIGHTSETS = False
+        GeneticModel.SAVE_CHECKPOINTS = False
 
     def test_init(self):
         """
@@ -140,3 +141,39 @@ class TestGeneticModel(unittest.TestCase):
 
     def finalize_generate_next_generation(self):
         pass
+
+
+class TestGeneticModelRacing(unittest.TestCase):
+    """
+    Tests of the racing rounds, on the action space of the snake game.
+    """
+
+    def setUp(self):
+        # Turn off logging and auto-rendering, the class settings are restored after the test
+        settings = dict(SAVE_BEST_WEIGHTSETS=False, SAVE_GEN_SCORES=False, PLOT_STATS=False,
+                        RENDER_BEST_WEIGHTSETS=False, SAVE_CHECKPOINTS=False, POPULATION_SIZE=4)
+        for name, value in settings.items():
+            self.addCleanup(setattr, GeneticModel, name, getattr(GeneticModel, name))
+            setattr(GeneticModel, name, value)
+
+    @patch('models.genetic_model.GeneticModel.finalize_generation')
+    def test_finalize_racing_game(self, mock_finalize_generation):
+        """
+        Test that when racing, the WeightSets play their games in rounds and only the promising half plays the next
+        round, while every WeightSet still gets the average score of its games
+        """
+        genetic_model = GeneticModel(game_name="SnakeGen-v1", input_shape=(2,), action_space=gym.spaces.Discrete(5))
+        self.addCleanup(genetic_model.close)
+        genetic_model.GAMES_PER_WEIGHTSET = 4
+        genetic_model.RACING_KEEP_FRACTION = 0.5
+
+        # Every WeightSet scores its own id, the rounds are played by [0, 1, 2, 3], [2, 3], [3] and [3]
+        played = list()
+        while not mock_finalize_generation.called:
+            played.append(genetic_model.current_weight_set_id)
+            genetic_model.finalize_game(genetic_model.current_weight_set_id, 6, 7)
+
+        self.assertEqual([0, 1, 2, 3, 2, 3, 3, 3], played)
+        self.assertEqual([0, 1, 2, 3], genetic_model.scores)
+        self.assertEqual(1, genetic_model.generation_id)
+        self.assertEqual(0, genetic_model.current_weight_set_id)
@@ -0,0 +1,53 @@
+"""
+Test script for running the genetic model without a display.
+"""
+import os
+import subprocess
+import sys
+import unittest
+
+import gym
+from models.base_model import BaseModel
+from models.genetic_model import GeneticModel
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+
+
+class TestHeadlessModel(unittest.TestCase):
+    """
+        Test class for the headless run profile.
+    """
+    def setUp(self):
+        for flag in ['SAVE_BEST_WEIGHTSETS', 'SAVE_GEN_SCORES', 'SAVE_CHECKPOINTS']:
+            self.addCleanup(setattr, GeneticModel, flag, getattr(GeneticModel, flag))
+            setattr(GeneticModel, flag, False)
+        self.addCleanup(setattr, GeneticModel, 'POPULATION_SIZE', GeneticModel.POPULATION_SIZE)
+        GeneticModel.POPULATION_SIZE = 5
+
+    def test_no_gui_imports(self):
+        """
+            Importing the model and the command line interface should not load any GUI library
+        """
+        code = "import sys, insertcoin, models.genetic_model; " \
+               "print(sorted(set(sys.modules) & {'pygame', 'matplotlib', 'pyglet'}))"
+        output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual('[]', output.stdout.strip())
+
+    def test_headless(self):
+        """
+            A headless model never replays or plots, even if it is enabled
+        """
+        for flag in ['PLOT_STATS', 'RENDER_BEST_WEIGHTSETS']:
+            self.addCleanup(setattr, GeneticModel, flag, getattr(GeneticModel, flag))
+            setattr(GeneticModel, flag, True)
+        self.addCleanup(setattr, BaseModel, 'HEADLESS', BaseModel.HEADLESS)
+        BaseModel.HEADLESS = True
+
+        model = GeneticModel("SnakeGen-v1", (24,), gym.spaces.Discrete(5))
+        self.addCleanup(model.close)
+        self.assertIsNone(model.replayer)
+        self.assertIsNone(model.reporter.plot_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
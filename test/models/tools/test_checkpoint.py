@@ -0,0 +1,109 @@
+"""
+Test script for checkpoint.py and resuming the genetic model from a checkpoint.
+"""
+import os
+import tempfile
+import unittest
+
+import gym
+import numpy as np
+from models.genetic_model import GeneticModel
+from models.tools.checkpoint import CheckpointWriter, save_checkpoint, load_checkpoint, get_random_state, \
+    set_random_state
+from models.tools.evaluation import Evaluator
+from models.tools.population import Population
+
+
+class TestCheckpoint(unittest.TestCase):
+    """
+        Test class for the checkpoints of generations.
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'checkpoint.npz')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_save_load(self):
+        """
+            Test if the arrays are written atomically and loaded without pickle
+        """
+        save_checkpoint(self.path, params=np.arange(6.0).reshape(2, 3), name=np.array('relu'))
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+        checkpoint = load_checkpoint(self.path)
+        self.assertEqual([[0, 1, 2], [3, 4, 5]], checkpoint['params'].tolist())
+        self.assertEqual('relu', str(checkpoint['name']))
+
+    def test_random_state(self):
+        """
+            Test if the global random generator continues the same after restoring its state
+        """
+        np.random.normal()
+        state = get_random_state()
+        expected = np.random.normal(size=5)
+
+        np.random.seed(0)
+        set_random_state(state)
+        self.assertEqual(expected.tolist(), np.random.normal(size=5).tolist())
+
+    def test_writer(self):
+        """
+            Test if the writer writes all checkpoints in order and raises write errors
+        """
+        writer = CheckpointWriter()
+        for value in range(3):
+            writer.save(self.path, value=np.array(value))
+        writer.flush()
+        self.assertEqual(2, int(load_checkpoint(self.path)['value']))
+
+        writer.save(os.path.join(self.path, 'not_a_folder.npz'), value=np.array(0))
+        with self.assertRaises(OSError):
+            writer.flush()
+        writer.close()
+        self.assertFalse(writer.is_alive())
+
+    def test_resume(self):
+        """
+            Test if a resumed model breeds the same generations as the run that saved the checkpoint
+        """
+        # Turn off logging and auto-rendering, the checkpoint is saved by hand
+        for flag in ['PLOT_STATS', 'SAVE_BEST_WEIGHTSETS', 'SAVE_GEN_SCORES', 'RENDER_BEST_WEIGHTSETS',
+                     'SAVE_CHECKPOINTS']:
+            self.addCleanup(setattr, GeneticModel, flag, getattr(GeneticModel, flag))
+            setattr(GeneticModel, flag, False)
+        self.addCleanup(setattr, GeneticModel, 'POPULATION_SIZE', GeneticModel.POPULATION_SIZE)
+        GeneticModel.POPULATION_SIZE = 20
+
+        def new_model():
+            return GeneticModel("SnakeGen-v1", (24,), gym.spaces.Discrete(5))
+
+        evaluator = Evaluator(10, 10, GeneticModel.GAMES_PER_WEIGHTSET, seed=3)
+        seeds = [evaluator.seeds(GeneticModel.POPULATION_SIZE) for _ in range(2)]
+
+        model = new_model()
+        model.scores = evaluator.evaluate(Population.from_weight_sets(model.population), seeds[0]).tolist()
+        model.save_checkpoint(self.path)
+        model.close()
+        model.generate_next_generation()
+        model.generation_id += 1
+        expected = evaluator.evaluate(Population.from_weight_sets(model.population), seeds[1])
+
+        resumed = new_model()
+        self.addCleanup(resumed.close)
+        resumed.resume(self.path)
+        self.assertEqual(1, resumed.generation_id)
+        self.assertEqual(np.stack([each.params for each in model.population]).tolist(),
+                         np.stack([each.params for each in resumed.population]).tolist())
+        resumed_scores = evaluator.evaluate(Population.from_weight_sets(resumed.population), seeds[1])
+        self.assertEqual(expected.tolist(), resumed_scores.tolist())
+
+        # A checkpoint only fits a model with the same population size
+        GeneticModel.POPULATION_SIZE = 10
+        with self.assertRaises(ValueError):
+            new_model().resume(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+"""
+Test script for evaluation.py.
+"""
+import unittest
+from mock import patch
+import numpy as np
+from models.tools.evaluation import evaluate_population, Evaluator, PoolEvaluator, Racing
+from models.tools.population import Population
+from models.tools.weight_set import WeightSet
+from snake.vec_env import SnakeVecEnv
+from snake import constants
+
+
+class TestEvaluation(unittest.TestCase):
+    """
+        Test class for the population evaluation.
+    """
+    def setUp(self):
+        """
+            Setup a small Population and an environment for all its games
+        """
+        self.population = Population.from_weight_sets([WeightSet(layer_sizes=[24, 8, 5]) for _ in range(10)])
+        self.env = SnakeVecEnv(30, width=16, height=21)
+
+    def test_evaluate_population(self):
+        """
+            Test if every agent gets an average score of its games
+        """
+        scores = evaluate_population(self.population, self.env, games_per_weight_set=3)
+
+        self.assertEqual((len(self.population),), scores.shape)
+        self.assertTrue(np.all(scores >= 0))
+
+    def test_noop_agents(self):
+        """
+            Agents that never turn walk straight into the top wall, unless they eat an apple on their way
+        """
+        self.population.params[:] = 0
+        self.population.layers[-1][1][:, constants.GET_ACTION_MEANING.index("NOOP")] = 1
+        scores = evaluate_population(self.population, self.env, games_per_weight_set=1)
+
+        steps = scores % constants.DEFAULT_REWARD_PER_APPLE
+        self.assertTrue(np.all(steps >= 1))
+        self.assertTrue(np.all(steps <= self.env.height))
+
+    def test_environment_too_small(self):
+        """
+            All games have to fit in the environment
+        """
+        with self.assertRaises(AssertionError):
+            evaluate_population(self.population, SnakeVecEnv(5), games_per_weight_set=3)
+
+    def test_evaluator(self):
+        """
+            Test if the evaluator plays the games of every agent
+        """
+        with Evaluator(16, 21, games_per_weight_set=2) as evaluator:
+            scores = evaluator.evaluate(self.population)
+        self.assertEqual((len(self.population),), scores.shape)
+        self.assertTrue(np.all(scores >= 0))
+
+    def test_pool_evaluator(self):
+        """
+            Test if the workers play the games of the agents in the shared memory, in population order
+        """
+        noop = constants.GET_ACTION_MEANING.index("NOOP")
+        self.population.params[:] = 0
+        self.population.layers[-1][1][:, noop] = 1
+        self.population.layers[-1][1][5:, noop] = -1
+
+        with PoolEvaluator(2, 16, 21, 1, self.population.layer_sizes, len(self.population)) as evaluator:
+            scores = evaluator.evaluate(self.population)
+
+        # The first agents walk straight up, the others turn left and are both the same length away from a wall
+        self.assertEqual((len(self.population),), scores.shape)
+        steps = scores % constants.DEFAULT_REWARD_PER_APPLE
+        self.assertTrue(np.all(steps[:5] <= 21))
+        self.assertTrue(np.all(steps[5:] <= 16))
+
+    def test_seed(self):
+        """
+            Test if the same seed leads to the same scores, in this process and on the workers
+        """
+        scores = Evaluator(16, 21, 2, seed=42).evaluate(self.population)
+        np.testing.assert_array_equal(scores, Evaluator(16, 21, 2, seed=42).evaluate(self.population))
+
+        with PoolEvaluator(2, 16, 21, 2, self.population.layer_sizes, len(self.population), seed=42) as evaluator:
+            np.testing.assert_array_equal(scores, evaluator.evaluate(self.population))
+
+    def test_cache(self):
+        """
+            Test if unchanged agents reuse their scores and only the changed agents play new games
+        """
+        seeds = Evaluator(16, 21, 2, seed=7).seeds(len(self.population))
+        with Evaluator(16, 21, 2, seed=7, cache_size=100) as evaluator:
+            scores = evaluator.evaluate(self.population, seeds)
+            np.testing.assert_array_equal(scores, Evaluator(16, 21, 2, seed=7).evaluate(self.population, seeds))
+
+            # Only the changed agent plays, on the seeds of its own games
+            changed = self.population.select(np.arange(len(self.population)))
+            changed.params[3] += 0.5
+            new_scores = evaluator.evaluate(changed, seeds)
+            self.assertEqual(len(self.population) + 1, len(evaluator.cache))
+            np.testing.assert_array_equal(np.delete(scores, 3), np.delete(new_scores, 3))
+            np.testing.assert_array_equal(new_scores[3], Evaluator(16, 21, 2).evaluate(changed.select([3]), seeds[6:8]))
+
+            # On other seeds the agents play again and only the games on those seeds count
+            other_seeds = Evaluator(16, 21, 2, seed=8).seeds(len(self.population))
+            np.testing.assert_array_equal(Evaluator(16, 21, 2).evaluate(self.population, other_seeds),
+                                          evaluator.evaluate(self.population, other_seeds))
+            self.assertEqual(4, len(evaluator.cache.get(evaluator.cache.key(self.population.params[0]))))
+
+        with PoolEvaluator(2, 16, 21, 2, self.population.layer_sizes, len(self.population), seed=7,
+                           cache_size=100) as evaluator:
+            np.testing.assert_array_equal(scores, evaluator.evaluate(self.population, seeds))
+            np.testing.assert_array_equal(new_scores, evaluator.evaluate(changed, seeds))
+
+    def test_cache_generations(self):
+        """
+            Test if agents that return unchanged in a later generation do not play again
+        """
+        with Evaluator(16, 21, 2, seed=7, cache_size=100) as evaluator:
+            scores = evaluator.evaluate(self.population)
+            np.testing.assert_array_equal(scores, Evaluator(16, 21, 2, seed=7).evaluate(self.population))
+
+            with patch.object(evaluator, 'play', wraps=evaluator.play) as play:
+                np.testing.assert_array_equal(scores, evaluator.evaluate(self.population))
+                play.assert_not_called()
+
+                # Only the new agent plays its games
+                changed = self.population.select(np.arange(len(self.population)))
+                changed.params[3] += 0.5
+                evaluator.evaluate(changed)
+                self.assertEqual(1, play.call_count)
+                self.assertEqual(1, len(play.call_args[0][0]))
+
+    def test_detect_cycles(self):
+        """
+            Test if ending the games of looping snakes early does not change the scores
+        """
+        seeds = Evaluator(16, 21, 2, seed=3).seeds(len(self.population))
+        scores = Evaluator(16, 21, 2).evaluate(self.population, seeds)
+        np.testing.assert_array_equal(scores, Evaluator(16, 21, 2, detect_cycles=True).evaluate(self.population, seeds))
+
+    def test_racing_keep(self):
+        """
+            Test if only the promising fraction of the racing agents keeps playing
+        """
+        history = [[1], [2], [3], [4]]
+        np.testing.assert_array_equal([False, False, True, True], Racing(0.5).keep(history))
+        np.testing.assert_array_equal([True] * 4, Racing(1).keep(history))
+        np.testing.assert_array_equal([True] * 4, Racing(0.5, min_games=2).keep(history))
+        np.testing.assert_array_equal([False, True, True, True], Racing(0.5, tolerance=1).keep(history))
+        self.assertEqual((0,), Racing(0.5).keep([]).shape)
+
+    def test_racing(self):
+        """
+            Test if agents stop playing when they drop out of the race and keep the average of the games they played
+        """
+        seeds = Evaluator(16, 21, 3, seed=7).seeds(len(self.population))
+        games = Evaluator(16, 21, 3).play(self.population, seeds)
+
+        # When all agents keep playing, every agent plays all its games
+        scores = Evaluator(16, 21, 3, racing=Racing(1)).evaluate(self.population, seeds)
+        np.testing.assert_array_equal(games.mean(axis=1), scores)
+
+        with Evaluator(16, 21, 3, cache_size=100, racing=Racing(0.5)) as evaluator:
+            scores = evaluator.evaluate(self.population, seeds)
+            played = [len(evaluator.cache.get(evaluator.cache.key(params)))
+                      for params in self.population.params]
+        self.assertTrue(all(1 <= each <= 3 for each in played))
+        self.assertLess(sum(played), games.size)
+        np.testing.assert_array_equal([games[index, :each].mean() for index, each in enumerate(played)], scores)
+
+        with PoolEvaluator(2, 16, 21, 3, self.population.layer_sizes, len(self.population),
+                           racing=Racing(0.5)) as evaluator:
+            np.testing.assert_array_equal(scores, evaluator.evaluate(self.population, seeds))
+
@@ -0,0 +1,51 @@
+"""
+Test script for fitness_cache.py.
+"""
+import unittest
+import numpy as np
+from models.tools.fitness_cache import FitnessCache
+
+
+class TestFitnessCache(unittest.TestCase):
+    """
+        Test class for the cache of game scores.
+    """
+    def test_key(self):
+        """
+            Test if the key depends on the parameters and the seed of the games only
+        """
+        params = np.arange(10.0)
+        self.assertEqual(FitnessCache.key(params, b'1'), FitnessCache.key(params.copy(), b'1'))
+        self.assertEqual(FitnessCache.key(params[::2], b'1'), FitnessCache.key(params[::2].copy(), b'1'))
+        self.assertNotEqual(FitnessCache.key(params, b'1'), FitnessCache.key(params, b'2'))
+        self.assertNotEqual(FitnessCache.key(params, b'1'), FitnessCache.key(params + 1e-12, b'1'))
+        self.assertNotEqual(FitnessCache.key(params, b'1'), FitnessCache.key(params.reshape(2, 5), b'1'))
+
+    def test_update(self):
+        """
+            Test if the scores of new games are added to the history of an agent
+        """
+        cache = FitnessCache()
+        self.assertIsNone(cache.get(b'a'))
+        cache.update(b'a', {'1': 1.0, '2': 2.0})
+        cache.update(b'a', {'3': 3.0})
+        self.assertEqual({'1': 1.0, '2': 2.0, '3': 3.0}, cache.get(b'a'))
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+    def test_lru(self):
+        """
+            Test if the agent that was used the longest ago is evicted when the cache is full
+        """
+        cache = FitnessCache(maxsize=2)
+        cache.update(b'a', {'1': 1.0})
+        cache.update(b'b', {'2': 2.0})
+        cache.get(b'a')
+        cache.update(b'c', {'3': 3.0})
+        self.assertEqual(2, len(cache))
+        self.assertIn(b'a', cache)
+        self.assertNotIn(b'b', cache)
+        self.assertIn(b'c', cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Test script for population.py.
+"""
+import unittest
+import numpy as np
+from models.tools.population import Population
+from models.tools.weight_set import WeightSet
+
+
+class TestPopulation(unittest.TestCase):
+    """
+        Test class for the Population class.
+    """
+    def setUp(self):
+        """
+            Setup a Population from random WeightSets for every test
+        """
+        self.layer_sizes = [24, 18, 18, 16, 5]
+        self.weight_sets = [WeightSet(layer_sizes=self.layer_sizes) for _ in range(20)]
+        self.population = Population.from_weight_sets(self.weight_sets)
+
+    def test_from_weight_sets(self):
+        """
+            Test if the stacked layers hold the weights of every WeightSet
+        """
+        self.assertEqual(len(self.weight_sets), len(self.population))
+        self.assertEqual(self.layer_sizes, self.population.layer_sizes)
+        self.assertEqual((20, Population.n_params(self.layer_sizes)), self.population.params.shape)
+
+        for index, weight_set in enumerate(self.weight_sets):
+            for (weights, biases), layer in zip(self.population.layers, weight_set.weights):
+                np.testing.assert_array_equal(layer[0], weights[index])
+                np.testing.assert_array_equal(layer[1], biases[index])
+
+    def test_layers_are_views(self):
+        """
+            Test if changing the parameter matrix changes the layers
+        """
+        self.population.params[3] = 0.5
+        for weights, biases in self.population.layers:
+            self.assertTrue(np.all(weights[3] == 0.5))
+            self.assertTrue(np.all(biases[3] == 0.5))
+
+    def test_feedforward(self):
+        """
+            Test if every agent takes the same action as its WeightSet
+        """
+        for _ in range(10):
+            observations = np.random.uniform(-999, 999, (len(self.population), self.layer_sizes[0]))
+            actions = self.population.feedforward(observations)
+
+            self.assertEqual((len(self.population),), actions.shape)
+            for action, weight_set, observation in zip(actions, self.weight_sets, observations):
+                self.assertEqual(weight_set.feedforward(observation), action)
+
+    def test_feedforward_batch(self):
+        """
+            Test if a batch of observations per agent gives the same actions as one at a time
+        """
+        observations = np.random.uniform(-999, 999, (len(self.population), 4, self.layer_sizes[0]))
+        actions = self.population.feedforward(observations)
+
+        self.assertEqual((len(self.population), 4), actions.shape)
+        for game in range(4):
+            np.testing.assert_array_equal(self.population.feedforward(observations[:, game]), actions[:, game])
+
+    def test_weight_set(self):
+        """
+            Test if a single agent can be taken out of the population
+        """
+        weight_set = self.population.weight_set(7)
+        observation = np.random.uniform(-999, 999, self.layer_sizes[0])
+
+        self.assertIsInstance(weight_set, WeightSet)
+        self.assertEqual(self.weight_sets[7].feedforward(observation), weight_set.feedforward(observation))
+
+    def test_weight_set_view(self):
+        """
+            Test if a single agent can be changed in the population through a view
+        """
+        weight_set = self.population.weight_set(3, copy=False)
+        weight_set.mutate(0.5)
+
+        np.testing.assert_array_equal(weight_set.params, self.population.params[3])
+        self.assertFalse(np.array_equal(self.weight_sets[3].params, self.population.params[3]))
+
+    def test_crossbreed(self):
+        """
+            Test if every array of a child is the start of the first and the end of the second parent
+        """
+        first, second = np.arange(10), np.arange(10, 20)
+        children = self.population.crossbreed(first, second)
+        self.assertEqual((10, self.population.params.shape[1]), children.params.shape)
+
+        starts, sizes, _ = self.population.segments()
+        for child, parent_first, parent_second in zip(children.params, first, second):
+            for start, size in zip(starts, sizes):
+                values = child[start:start + size]
+                from_first = values == self.population.params[parent_first, start:start + size]
+                from_second = values == self.population.params[parent_second, start:start + size]
+                self.assertTrue(np.all(from_first | from_second))
+                # Once a value is taken from the second parent, the rest is as well
+                break_point = np.argmin(from_first) if not from_first.all() else size
+                self.assertTrue(np.all(from_second[break_point:]))
+
+    def test_mutate(self):
+        """
+            Test if mutation changes the parameters in-place within the weight limits
+        """
+        params = self.population.params
+        before = params.copy()
+        self.population.mutate(0.5)
+
+        self.assertIs(params, self.population.params)
+        self.assertFalse(np.array_equal(before, params))
+        self.assertTrue(np.all(np.abs(params) <= 1.0))
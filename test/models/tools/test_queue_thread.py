@@ -0,0 +1,56 @@
+"""
+Test script for queue_thread.py.
+"""
+import unittest
+
+from models.tools.queue_thread import QueueThread
+
+
+class TestQueueThread(unittest.TestCase):
+    """
+        Test class for the QueueThread.
+    """
+    def test_handle(self):
+        """
+            Test if the items are handled in order on the thread
+        """
+        class Collect(QueueThread):
+            def __init__(self):
+                super().__init__()
+                self.items = []
+
+            def handle(self, *args):
+                self.items.append(args)
+
+        thread = Collect()
+        thread.submit(1, 2)
+        thread.submit(3)
+        thread.close()
+        self.assertEqual([(1, 2), (3,)], thread.items)
+
+    def test_abstract(self):
+        """
+            Test if a QueueThread that does not implement handle can not be created
+        """
+        class Forgetful(QueueThread):
+            pass
+
+        with self.assertRaises(TypeError):
+            Forgetful()
+
+    def test_error(self):
+        """
+            Test if an error on the thread is raised again on the next call
+        """
+        class Failing(QueueThread):
+            def handle(self, *args):
+                raise ValueError(args)
+
+        thread = Failing()
+        thread.submit(1)
+        with self.assertRaises(ValueError):
+            thread.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
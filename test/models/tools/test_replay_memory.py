@@ -2,8 +2,10 @@
 Test script for the ReplayMemory
 """
 
+import os
+import tempfile
 import unittest
-from models.tools.replay_memory import ReplayMemory
+from models.tools.replay_memory import MemmapReplayMemory, ReplayMemory
 import numpy as np
 
 
@@ -82,10 +84,12 @@ class TestReplayMemory(unittest.TestCase):
         last_tuple = self.dummy_agent.get_next_tuple()
         self.memory.remember(*last_tuple)
 
-        self.assertEqual(self.memory[0], first_tuple)
-        self.assertEqual(self.memory[1], second_tuple)
-        self.assertEqual(self.memory[2], last_tuple)
-        self.assertEqual(self.memory[-1], last_tuple)
+        self.assertTransitionEqual(self.memory[0], first_tuple)
+        self.assertTransitionEqual(self.memory[1], second_tuple)
+        self.assertTransitionEqual(self.memory[2], last_tuple)
+        self.assertTransitionEqual(self.memory[-1], last_tuple)
+        with self.assertRaises(IndexError):
+            self.memory[3]
 
     def test_set(self):
         """"
@@ -95,9 +99,10 @@ class TestReplayMemory(unittest.TestCase):
         self.memory.remember(*self.dummy_agent.get_next_tuple())
         self.memory.remember(*self.dummy_agent.get_next_tuple())
 
-        self.memory[1] = (0, 1, 2, 3, 4)
+        new_tuple = (np.zeros(self.memory.input_shape), 1, 2, 3 * np.ones(self.memory.input_shape), True)
+        self.memory[1] = new_tuple
 
-        self.assertEqual(self.memory[1], (0, 1, 2, 3, 4))
+        self.assertTransitionEqual(self.memory[1], new_tuple)
 
     def test_length(self):
         """"
@@ -132,16 +137,163 @@ class TestReplayMemory(unittest.TestCase):
         """"
         Test if the random sample function returns the correct number of tuples, and whether these tuples exists.
         """
-        pass
+        for _ in range(505):
+            self.memory.remember(*self.dummy_agent.get_next_tuple())
+
+        sample = self.memory.get_random_sample(32)
+        self.assertEqual(32, len(sample))
+        self.assertEqual(32, len({transition[2] for transition in sample}))
+        for transition in sample:
+            self.assertTransitionEqual(self.memory[int(transition[2]) - 5], transition)
+
+        with self.assertRaises(ValueError):
+            self.memory.get_random_sample(501)
+
+    def test_random_batch(self):
+        """"
+        Test if the random batch function returns arrays of different transitions that exist in the memory.
+        """
+        for _ in range(505):
+            self.memory.remember(*self.dummy_agent.get_next_tuple())
+
+        states, actions, rewards, next_states, dones = self.memory.get_random_batch(32)
+        self.assertEqual((32, 20, 20, 1), states.shape)
+        self.assertEqual((32,), actions.shape)
+
+        # Every sampled transition is a different transition in the memory
+        self.assertEqual(32, len(set(rewards)))
+        self.assertTrue(np.all((5 <= rewards) & (rewards < 505)))
+        np.testing.assert_array_equal(states[:, 0, 0, 0], rewards)
+        np.testing.assert_array_equal(next_states[:, 0, 0, 0], rewards + 1)
+        np.testing.assert_array_equal(dones, rewards % 100 == 0)
+
+        with self.assertRaises(ValueError):
+            self.memory.get_random_batch(501)
 
     def test_load(self):
         """"
         Test the load function for the ReplayMemory.
         """
-        pass
+        for _ in range(505):
+            self.memory.remember(*self.dummy_agent.get_next_tuple())
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "memory.npz")
+            self.memory.save(path)
+            memory = ReplayMemory(500, (20, 20, 1), 4)
+            memory.load(path)
+
+            # A smaller memory keeps the most recent transitions
+            small = ReplayMemory(10, (20, 20, 1), 4)
+            small.load(path)
+
+        self.assertEqual(len(self.memory), len(memory))
+        for idx in [0, 1, 250, 499]:
+            self.assertTransitionEqual(self.memory[idx], memory[idx])
+        self.assertEqual(10, len(small))
+        self.assertTransitionEqual(self.memory[-1], small[-1])
+
+        # The loaded memory continues after the last transition
+        memory.remember(*self.dummy_agent.get_next_tuple())
+        self.assertEqual(505, memory[-1][2])
+        self.assertEqual(6, memory[0][2])
+
+    def test_set_without_states(self):
+        """"
+        Test if the states are allocated when a transition is set in a memory that holds no states yet.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "memory.npz")
+            np.savez(path, action=np.arange(3), reward=np.zeros(3), done=np.zeros(3, dtype=bool))
+            memory = ReplayMemory(10, (20, 20, 1), 4)
+            memory.load(path)
+
+        new_tuple = (np.ones(memory.input_shape, dtype=np.uint8), 1, 2, 3 * np.ones(memory.input_shape), True)
+        memory[1] = new_tuple
+        self.assertEqual(np.uint8, memory.states.dtype)
+        self.assertTransitionEqual(memory[1], new_tuple)
 
     def test_save(self):
         """"
         Test the save function for the ReplayMemory.
         """
-        pass
+        for _ in range(3):
+            self.memory.remember(*self.dummy_agent.get_next_tuple())
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "memory.npz")
+            self.memory.save(path)
+            with np.load(path) as arrays:
+                self.assertEqual((3, 20, 20, 1), arrays["state"].shape)
+                np.testing.assert_array_equal([0, 1, 2], arrays["reward"])
+
+    def assertTransitionEqual(self, first, second):
+        """
+        Assert that two transition tuples hold the same values.
+        """
+        self.assertEqual(len(first), len(second))
+        for first_value, second_value in zip(first, second):
+            np.testing.assert_array_equal(first_value, second_value)
+
+
+class TestMemmapReplayMemory(unittest.TestCase):
+    """
+    Testing class for the memory mapped ReplayMemory.
+    """
+
+    def setUp(self):
+        """
+        Set-up a memory in a temporary directory.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.dummy_agent = DummyTupleGenerator((20, 20, 1), 4)
+        self.memory = MemmapReplayMemory(self.directory.name, 500, (20, 20, 1), 4)
+
+    def tearDown(self):
+        self.memory.close()
+        self.directory.cleanup()
+
+    def test_files(self):
+        """
+        Test if the transitions are written into a .npy file per field.
+        """
+        for _ in range(3):
+            self.memory.remember(*self.dummy_agent.get_next_tuple())
+        self.memory.save()
+
+        rewards = np.load(os.path.join(self.directory.name, "reward.npy"))
+        self.assertEqual((500,), rewards.shape)
+        np.testing.assert_array_equal([0, 1, 2], rewards[:3])
+        self.assertEqual((500, 20, 20, 1), np.load(os.path.join(self.directory.name, "state.npy"), mmap_mode="r").shape)
+
+    def test_restore(self):
+        """
+        Test if a memory on the same directory continues from the last save.
+        """
+        for _ in range(505):
+            self.memory.remember(*self.dummy_agent.get_next_tuple())
+        self.memory.save()
+
+        memory = MemmapReplayMemory(self.directory.name, 500, (20, 20, 1), 4)
+        self.assertEqual(500, len(memory))
+        self.assertEqual(5, memory[0][2])
+        self.assertEqual(504, memory[-1][2])
+        self.assertEqual(np.float64, memory.states.dtype)
+
+        states, _, rewards, next_states, _ = memory.get_random_batch(32)
+        np.testing.assert_array_equal(states[:, 0, 0, 0], rewards)
+        np.testing.assert_array_equal(next_states[:, 0, 0, 0], rewards + 1)
+        memory.close()
+
+    def test_mismatch(self):
+        """
+        Test if a memory with other shapes or types can not be opened on a saved memory.
+        """
+        self.memory.remember(*self.dummy_agent.get_next_tuple())
+        self.memory.save()
+
+        with self.assertRaises(ValueError):
+            MemmapReplayMemory(self.directory.name, 100, (20, 20, 1), 4)
+        with self.assertRaises(ValueError):
+            MemmapReplayMemory(self.directory.name, 500, (20, 20, 1), 4, dtype=np.uint8)
+
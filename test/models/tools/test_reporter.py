@@ -0,0 +1,62 @@
+"""
+Test script for reporter.py.
+"""
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from models.tools.reporter import StatsReporter
+from models.tools.weight_set import WeightSet
+
+
+class TestStatsReporter(unittest.TestCase):
+    """
+        Test class for the background reporting of generation stats.
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.scores_path = os.path.join(self.directory.name, 'scores.csv')
+        self.plot_path = os.path.join(self.directory.name, 'scores.png')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_log(self):
+        """
+            Test if every generation is appended as a row to a single csv file
+        """
+        reporter = StatsReporter(scores_path=self.scores_path)
+        for generation_id in range(3):
+            reporter.report(generation_id, [np.float64(generation_id), 1, 2.5, 3, 4])
+        reporter.close()
+
+        data = np.genfromtxt(self.scores_path, delimiter=',', names=True)
+        self.assertEqual(('generation', 'min', 'q25', 'avg', 'q75', 'max'), data.dtype.names)
+        self.assertEqual([0, 1, 2], data['generation'].tolist())
+        self.assertEqual([0, 1, 2], data['min'].tolist())
+        self.assertEqual([2.5] * 3, data['avg'].tolist())
+
+    def test_plot_and_weight_sets(self):
+        """
+            Test if the plot and the best WeightSets are written
+        """
+        weight_set = WeightSet(layer_sizes=[3, 2])
+        reporter = StatsReporter(plot_path=self.plot_path, weightsets_dir=self.directory.name)
+        reporter.report(0, [0, 1, 2, 3, 4], weight_set)
+        reporter.report(1, [1, 2, 3, 4, 5], weight_set)
+        reporter.close()
+
+        self.assertTrue(os.path.getsize(self.plot_path) > 0)
+        saved = WeightSet(layer_sizes=[3, 2])
+        saved.load(os.path.join(self.directory.name, 'weightset_gen_1.npz'))
+        self.assertEqual(weight_set.params.tolist(), saved.params.tolist())
+
+        # The points of every generation are added to the same lines
+        _, _, lines = reporter._plot
+        self.assertEqual(5, len(lines))
+        self.assertEqual([0, 1], list(lines[0].get_xdata()))
+
+
+if __name__ == '__main__':
+    unittest.main()
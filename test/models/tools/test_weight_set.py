@@ -1,6 +1,8 @@
 """
 Test script for weight_set.py.
 """
+import os
+import tempfile
 import unittest
 import numpy as np
 np.random.seed(1234)
@@ -158,3 +160,54 @@ class TestWeightSet(unittest.TestCase):
                 result2 = act_func(bias_array)
                 self.assertIsInstance(result1, np.ndarray)
                 self.assertIsInstance(result2, np.ndarray)
+
+    def test_params(self):
+        """
+            Test if the weights and biases are views on the flat parameter vector
+        """
+        n_params = WeightSet.n_params(self.weightset.layer_sizes)
+        self.assertEqual((n_params,), self.weightset.params.shape)
+        for layer in self.weightset.weights:
+            for arr in layer:
+                self.assertTrue(np.shares_memory(arr, self.weightset.params))
+
+        # Mutations are written into the parameter vector
+        params_before = self.weightset.params.copy()
+        self.weightset.mutate(0.5)
+        self.assertFalse(np.array_equal(params_before, self.weightset.params))
+        self.assertTrue(np.shares_memory(self.weightset.weights[0][0], self.weightset.params))
+
+        # Clones get their own parameter vector
+        clone = self.weightset.clone()
+        np.testing.assert_array_equal(self.weightset.params, clone.params)
+        self.assertFalse(np.shares_memory(self.weightset.params, clone.params))
+
+    def test_from_buffer(self):
+        """
+            Test if a WeightSet can use an existing buffer as storage
+        """
+        layer_sizes = self.weightset.layer_sizes
+        buffer = bytearray(8 + self.weightset.params.nbytes)
+        weightset = WeightSet.from_buffer(buffer, layer_sizes, offset=8)
+        weightset.params[:] = self.weightset.params
+
+        model_input = np.random.uniform(-999, 999, self.input_size)
+        self.assertEqual(self.weightset.feedforward(model_input), weightset.feedforward(model_input))
+        np.testing.assert_array_equal(self.weightset.params, np.frombuffer(buffer, offset=8))
+
+    def test_save_load(self):
+        """
+            Test if a saved WeightSet loads the same weights and biases
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'weightset.npz')
+            self.weightset.save(path)
+
+            weightset = WeightSet(layer_sizes=[2, 3])
+            weightset.load(path)
+
+        self.assertEqual(list(self.weightset.layer_sizes), weightset.layer_sizes)
+        np.testing.assert_array_equal(self.weightset.params, weightset.params)
+        for layer, layer_loaded in zip(self.weightset.weights, weightset.weights):
+            for arr, arr_loaded in zip(layer, layer_loaded):
+                np.testing.assert_array_equal(arr, arr_loaded)
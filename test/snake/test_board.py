@@ -1,7 +1,11 @@
 
 import unittest
+import numpy as np
 
+from snake.boards import rays
 from snake.boards.classic import Board
+from snake.env import SnakeEnv
+from snake.objects.ground import Ground
 from snake.objects.utils import Point
 from snake.objects import constants
 
@@ -49,3 +53,91 @@ class TestBoard(unittest.TestCase):
 
         self.assertEqual([o.__class__.__name__ for x in state for o in x],
                          [o.__class__.__name__ for x in self.board.board for o in x], "Unable to reproduce same board")
+
+    def test_independent_seed(self):
+        """ Test if boards with the same seed produce the same games while being played side by side.  """
+        other = Board(width=self.board.width, height=self.board.height)
+        other.seed(self.board.seed())
+
+        for _ in range(10):
+            self.board.reset()
+            other.reset()
+            for _ in range(20):
+                self.board.step(self.board.random_step(), values=False)
+                other.step(other.random_step(), values=False)
+            self.assertEqual([o.__class__.__name__ for x in self.board.board for o in x],
+                             [o.__class__.__name__ for x in other.board for o in x], "Boards disturb each other")
+
+    def test_obs(self):
+        """ Test if the rendered grid matches the display attributes of the objects.  """
+        self.board.reset()
+        for _ in range(5):
+            self.board.add_object("snake")
+            self.board.add_object("wall")
+
+        for attribute in ["rgb", "ansi", "ansi_fancy"]:
+            expected = [[list(item.rgb) if attribute == "rgb" else getattr(item, attribute) for item in row]
+                        for row in self.board.board]
+            self.assertEqual(expected, self.board.obs(attribute).tolist(), f"Rendered {attribute} differs")
+
+        out = np.zeros((self.board.width, self.board.height, 3), dtype=np.uint8)
+        self.assertIs(out, self.board.obs(out=out), "Grid is not written into the given array")
+
+    def test_env_obs(self):
+        """ Test the image and text observations of the environment.  """
+        env = SnakeEnv(mode='rgb_array', width=10, height=12)
+        obs = env.reset()
+        image = np.array([[item.rgb for item in row] for row in env.env.board.board], dtype=np.uint8)
+        np.testing.assert_array_equal(image.transpose(1, 0, 2), obs)
+
+        env = SnakeEnv(mode='ansi', obs_type='text', width=10, height=12)
+        env.reset()
+        text = "\n".join("".join(item.ansi for item in row) for row in env.env.board.board)
+        self.assertEqual(text, env._observation_ansi())
+
+    def test_fast_step(self):
+        """ Test if the fast step mode plays the same game, with the observation in a buffer.  """
+        for mode, obs_type in [('gen', 'gen'), ('rgb_array', 'image')]:
+            env = SnakeEnv(mode=mode, obs_type=obs_type, width=10, height=12)
+            fast = SnakeEnv(mode=mode, obs_type=obs_type, width=10, height=12, fast_step=True)
+            fast.seed(env.seed())
+            env.reset()
+            fast.reset()
+
+            done = False
+            while not done:
+                action = env.action_space.sample()
+                obs, reward, done, info = env.step(action)
+                fast_obs, fast_reward, fast_done, fast_info = fast.step(action)
+
+                np.testing.assert_array_equal(obs, fast_obs)
+                self.assertEqual((reward, done), (fast_reward, fast_done), "Reward or done differs")
+                self.assertEqual(0, len(fast_info), "Info should only be computed on request")
+                self.assertEqual(info, fast.info(), "Info differs")
+
+            out = np.zeros_like(fast_obs)
+            fast.reset()
+            self.assertIs(out, fast.step(0, out=out)[0], "Observation is not written into the given array")
+
+    def test_vision(self):
+        """ Test if the vision matches scanning the board cell by cell.  """
+        object_types = [v for k, v in self.board.object_types.items() if k != "ground"]
+        for _ in range(20):
+            self.board.reset()
+            for _ in range(5):
+                self.board.add_object("snake")
+                self.board.add_object("apple")
+                self.board.add_object("wall")
+            for _ in range(10):
+                self.board.step(self.board.random_step(), values=False)
+
+            vision = self.board.vision()
+            for idx_snake, snake in enumerate(self.board.objects['snake']):
+                for idx_direction, (dx, dy) in enumerate(rays.DIRECTIONS):
+                    scan_counter = 1
+                    while isinstance(self.board.board[snake.position.x + dx * scan_counter,
+                                                      snake.position.y + dy * scan_counter], Ground):
+                        scan_counter += 1
+                    item = self.board.board[snake.position.x + dx * scan_counter, snake.position.y + dy * scan_counter]
+                    expected = [scan_counter if isinstance(item, object_type) else 0 for object_type in object_types]
+                    self.assertEqual(expected, vision[idx_snake, :, idx_direction].tolist(), "Vision is incorrect")
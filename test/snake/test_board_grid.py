@@ -0,0 +1,168 @@
+
+import unittest
+import numpy as np
+from mock import patch
+
+from snake.boards.classic import Board
+from snake.boards.grid import GridBoard
+from snake.objects.snake import Snake
+from snake.objects.utils import Point
+from snake.objects import constants
+from snake.env import SnakeEnv
+from snake import constants as game_constants
+
+
+class TestGridBoard(unittest.TestCase):
+    def setUp(self) -> None:
+        self.board = GridBoard(width=25, height=25)
+
+    def test_add_snake_specific(self):
+        self.board.add_object("snake", Point(x=10, y=15))
+
+        self.assertEqual(Point(10, 15), self.board.get_head(), "Position not set correctly")
+        self.assertEqual(constants.LEN_SNAKE_START, self.board.get_length(), "Snake is not start length")
+
+    def test_add_object_collision(self):
+        self.board.add_object("snake", Point(x=20, y=20))
+        self.board.add_object("apple", Point(x=20, y=20))
+
+        self.assertEqual(1, np.sum(self.board.cells == constants.CELL_APPLE), "Apple not moved to a free cell")
+        self.assertEqual(constants.CELL_SNAKE, self.board.cells[20, 20], "Snake overwritten by the apple")
+
+    def test_snake_eat_apple(self):
+        self.board.add_object("snake", Point(x=20, y=20))
+        self.board.add_object("apple", Point(x=20, y=19))
+        _, reward, done, _ = self.board.step(self.board.action_set.index("UP"))
+
+        self.assertEqual(1001, reward, "Snake eating apple incorrect points awarded")
+        self.assertEqual(False, done, "Snake died eating an apple")
+        self.assertEqual(constants.LEN_SNAKE_START + 1, self.board.get_length(), "Snake did not grow")
+        self.assertEqual(1, np.sum(self.board.cells == constants.CELL_APPLE), "No new apple spawned")
+
+    def test_snake_eat_apple_max_length(self):
+        """ A snake of maximum length that eats moves its tail along, so it leaves no snake cells behind.  """
+        with patch.object(Snake, "LEN_SNAKE_MAX", constants.LEN_SNAKE_START):
+            for snakes in [1, 2]:
+                board = GridBoard(width=25, height=25)
+                for x in [10, 5][:snakes]:
+                    board.add_object("snake", Point(x=x, y=20))
+                for _ in range(constants.LEN_SNAKE_START):
+                    board.step(board.action_set.index("UP"))
+                head = board.get_head()
+                board.add_object("apple", Point(x=head.x, y=head.y - 1))
+                _, reward, done, _ = board.step(board.action_set.index("UP"))
+
+                self.assertEqual(False, done, "Snake died eating an apple")
+                self.assertEqual(constants.LEN_SNAKE_START, board.get_length(), "Snake grew beyond its maximum")
+                self.assertEqual(snakes * constants.LEN_SNAKE_START, np.sum(board.cells == constants.CELL_SNAKE),
+                                 "The tail left a snake cell behind")
+                self.assertEqual(np.sum(board.cells == constants.CELL_GROUND), len(board.free_cells),
+                                 "The free cells do not match the board")
+
+    def test_grow(self):
+        """ Growing a snake adds segments without giving it more life, on both boards.  """
+        for board in [Board(width=25, height=25), GridBoard(width=25, height=25)]:
+            board.add_object("snake", Point(x=10, y=20))
+            for _ in range(3):
+                board.step(board.action_set.index("UP"))
+            life_left = board.info()["life_left"]
+            board.grow(0, 2)
+            self.assertEqual(life_left, board.info()["life_left"], "Growing gave the snake more life")
+
+            board.step(board.action_set.index("UP"))
+            board.step(board.action_set.index("UP"))
+            self.assertEqual(constants.LEN_SNAKE_START + 2, np.sum(board.cells == constants.CELL_SNAKE),
+                             "The snake did not grow")
+
+    def test_snake_wall(self):
+        self.board.add_object("snake", Point(x=1, y=12))
+        _, _, done, _ = self.board.step(self.board.action_set.index("LEFT"))
+
+        self.assertEqual(True, done, "Game over is not detected upon dying")
+
+    def test_head_to_head(self):
+        """ Snakes moving into the same cell all die, no matter their order.  """
+        for board in [Board(width=25, height=25), GridBoard(width=25, height=25)]:
+            board.add_object("snake", Point(x=10, y=10))
+            board.add_object("snake", Point(x=12, y=10))
+            board.add_object("snake", Point(x=20, y=20))
+            actions = [board.action_set.index(name) for name in ["RIGHT", "LEFT", "UP"]]
+            _, reward, done, info = board.step(actions)
+
+            self.assertEqual(1, info["snakes_alive"], "Snakes survived a head to head collision")
+            self.assertEqual(["UP"], info["direction"], "The surviving snake lost its direction")
+            self.assertEqual(1, reward, "Only the surviving snake should get the step reward")
+            self.assertEqual(constants.CELL_GROUND, board.cells[11, 10], "The dead snakes moved their heads")
+
+    def test_same_multi_snake_game_as_classic(self):
+        """ With many snakes, every snake has its own action and the boards still play the same game.  """
+        classic, grid = Board(width=20, height=20), GridBoard(width=20, height=20)
+        for seed in range(5):
+            classic.seed(seed)
+            grid.seed(seed)
+            classic.setup(snakes=8, apples=4)
+            grid.setup(snakes=8, apples=4)
+            for actions in np.random.randint(0, classic.action_space, size=(200, 8)):
+                classic.step(actions, values=False)
+                grid.step(actions, values=False)
+                self.assertEqual(classic.cells.tolist(), grid.cells.tolist())
+                self.assertEqual(classic.reward(), grid.reward())
+                self.assertEqual(classic.info(), grid.info())
+                if classic.done():
+                    break
+
+    def test_same_game_as_classic(self):
+        """ Both boards use the same rules, so the same seed has to lead to the same game.  """
+        classic = Board(width=12, height=14)
+        seed = classic.seed()
+
+        for game in range(5):
+            actions = np.random.randint(0, classic.action_space, size=2000)
+
+            # Both boards get the same seed, so they spawn the same objects
+            classic.seed(seed)
+            classic.reset()
+            classic_steps = []
+            for action in actions:
+                obs, reward, done, info = classic.step(action)
+                classic_steps.append((obs.tolist(), reward, done, info, classic.vision().tolist()))
+                if done:
+                    break
+
+            self.board = GridBoard(width=12, height=14)
+            self.board.seed(seed)
+            self.board.reset()
+            for action, classic_step in zip(actions, classic_steps):
+                obs, reward, done, info = self.board.step(action)
+                self.assertEqual(classic_step[0], obs.tolist(), "Boards are no longer the same")
+                self.assertEqual(classic_step[1:4], (reward, done, info), "Reward, done or info differ")
+                self.assertEqual(classic_step[4], self.board.vision().tolist(), "Vision differs")
+            seed = classic.seed()
+
+    def test_env_opt_in(self):
+        env = SnakeEnv(mode='gen', obs_type='gen', width=16, height=21, board='grid')
+        obs = env.reset()
+        done = False
+        while not done:
+            obs, reward, done, info = env.step(env.action_space.sample())
+            self.assertEqual((24,), obs.shape, "Observation dimensions are not as expected")
+
+    def test_detect_cycles(self):
+        """ A snake that runs in a square ends as soon as it loops, with the score of running until its life is up.  """
+        square = [game_constants.GET_ACTION_MEANING.index(each) for each in ["LEFT", "DOWN", "RIGHT", "UP"]]
+        results = []
+        for detect_cycles in [False, True]:
+            board = GridBoard(16, 21, detect_cycles=detect_cycles)
+            board.seed(3)
+            board.reset()
+            score, steps = 0, 0
+            while not board.done():
+                board.step(square[steps % len(square)], values=False)
+                score += board.reward()
+                steps += 1
+            results.append((score, steps))
+
+        self.assertEqual(results[0][0], results[1][0], "Scores differ")
+        self.assertLess(results[1][1], results[0][1] // 10, "Loop is not detected")
+        with self.assertRaises(ValueError):
+            Board(16, 21, detect_cycles=True)
@@ -0,0 +1,65 @@
+import unittest
+import numpy as np
+
+from snake.boards.classic import Board
+from snake.boards.free_cells import FreeCells
+from snake.boards.grid import GridBoard
+from snake.vec_env import SnakeVecEnv
+from snake.objects import constants
+
+
+class TestFreeCells(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cells = GridBoard._create_board(6, 5)
+        self.free_cells = FreeCells(self.cells)
+
+    def test_start(self):
+        self.assertEqual(4 * 3, len(self.free_cells), "Only the cells inside the walls are free")
+        self.assertEqual(np.flatnonzero(self.cells == constants.CELL_GROUND).tolist(),
+                         self.free_cells.cells[:len(self.free_cells)].tolist(), "Free cells start in order")
+
+    def test_add_remove(self):
+        index = 2 * 5 + 2
+        self.free_cells.remove(index)
+        self.free_cells.remove(index)
+        self.assertEqual(11, len(self.free_cells), "Removing twice should only remove once")
+        self.assertNotIn(index, self.free_cells)
+
+        self.free_cells.add(index)
+        self.free_cells.add(index)
+        self.assertEqual(12, len(self.free_cells), "Adding twice should only add once")
+        self.assertIn(index, self.free_cells)
+
+    def test_random(self):
+        rng = np.random.default_rng(0)
+        for _ in range(len(self.free_cells) - 1):
+            self.free_cells.remove(self.free_cells.random(rng))
+        self.assertEqual(1, len(self.free_cells))
+
+        self.free_cells.remove(self.free_cells.random(rng))
+        with self.assertRaises(ValueError):
+            self.free_cells.random(rng)
+
+    def assertFreeCells(self, cells, free, count):
+        self.assertEqual(sorted(np.flatnonzero(cells == constants.CELL_GROUND).tolist()), sorted(free[:count].tolist()),
+                         "Free cells are not the ground cells of the board")
+
+    def test_boards(self):
+        """ The free cells have to follow the ground cells while playing.  """
+        for board in [Board(width=8, height=9), GridBoard(width=8, height=9)]:
+            for _ in range(10):
+                board.reset()
+                for _ in range(4):
+                    board.add_object("snake")
+                    board.add_object("apple")
+                for _ in range(30):
+                    board.step(board.random_step(), values=False)
+                self.assertFreeCells(board.cells, board.free_cells.cells, len(board.free_cells))
+
+    def test_vec_env(self):
+        env = SnakeVecEnv(16, width=8, height=9)
+        env.reset()
+        for _ in range(100):
+            env.step(np.random.randint(0, env.action_space.n, size=env.num_envs))
+            for idx in range(env.num_envs):
+                self.assertFreeCells(env.cells[idx], env._free[idx], env._free_count[idx])
@@ -0,0 +1,52 @@
+import random
+import unittest
+from collections import deque
+
+from snake.objects.body import Body
+from snake.objects.utils import Point
+
+
+class TestBody(unittest.TestCase):
+    def setUp(self) -> None:
+        self.body = Body(maxlen=5)
+
+    def test_folded(self):
+        """ Body parts on the same position are counted, so the position stays taken until all are gone.  """
+        for _ in range(3):
+            self.body.append(Point(2, 3))
+
+        self.assertEqual(3, len(self.body))
+        self.body.pop()
+        self.body.pop()
+        self.assertIn(Point(2, 3), self.body, "Position is released too early")
+        self.body.pop()
+        self.assertNotIn(Point(2, 3), self.body, "Position is not released")
+
+    def test_same_as_deque(self):
+        """ The body behaves like a deque with a maxlen.  """
+        expected = deque(maxlen=self.body.maxlen)
+        for _ in range(2000):
+            operation = random.choice(["append", "appendleft", "pop", "popleft"])
+            if operation.startswith("pop"):
+                if not expected:
+                    continue
+                self.assertEqual(getattr(expected, operation)(), getattr(self.body, operation)())
+            else:
+                point = Point(random.randint(-3, 3), random.randint(-3, 3))
+                getattr(expected, operation)(point)
+                getattr(self.body, operation)(point)
+
+            self.assertEqual(list(expected), list(self.body), "Body differs from a deque")
+            if expected:
+                self.assertEqual(expected[-1], self.body[-1], "Tail differs")
+                self.assertEqual(expected[0], self.body[0], "Head differs")
+            for x in range(-3, 4):
+                self.assertEqual(Point(x, 0) in expected, Point(x, 0) in self.body, "Membership differs")
+
+    def test_index_error(self):
+        self.body.append(Point(1, 1))
+        with self.assertRaises(IndexError):
+            self.body[1]
+        self.body.pop()
+        with self.assertRaises(IndexError):
+            self.body.pop()
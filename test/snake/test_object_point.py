@@ -0,0 +1,29 @@
+import unittest
+
+from snake.objects.utils import Point, board_points
+
+
+class TestPoint(unittest.TestCase):
+    def test_immutable(self):
+        point = Point(3, 4)
+        with self.assertRaises(AttributeError):
+            point.x = 5
+        with self.assertRaises(AttributeError):
+            point.z = 5
+        self.assertIs(point, point.clone(), "Immutable points do not have to be copied")
+
+    def test_value(self):
+        self.assertEqual(Point(3, 4), Point(x=3, y=4))
+        self.assertEqual(hash(Point(3, 4)), hash(Point(3, 4)))
+        self.assertNotEqual(Point(3, 4), Point(4, 3))
+        self.assertEqual((3, 4), Point(3, 4).as_value())
+        self.assertEqual("(x=3, y=4)", str(Point(3, 4)))
+
+    def test_interned(self):
+        self.assertIs(Point.at(3, 4), Point.at(3, 4), "Points are not interned")
+        self.assertEqual(Point(3, 4), Point.at(3, 4))
+
+    def test_board_points(self):
+        points = board_points(5, 7)
+        self.assertEqual(5 * 7, len(points))
+        self.assertIs(Point.at(2, 6), points[2 * 7 + 6], "Flat index does not match the point")
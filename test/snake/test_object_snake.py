@@ -3,6 +3,7 @@ import unittest
 
 from snake.objects.snake import Snake
 from snake.objects.utils import Point
+from snake.objects.constants import DIRECTION_VALID
 
 
 class TestSnake(unittest.TestCase):
@@ -140,3 +141,15 @@ class TestSnake(unittest.TestCase):
 
                 if direction in ["LEFT", "RIGHT"]:
                     self.assertEqual("LEFT", self.snake.direction, "Direction not countered")
+
+    def test_turn(self):
+        """ Integer directions follow DIRECTION_VALID, negative directions keep the direction.  """
+        self.snake.turn(-1)
+        self.assertEqual("UP", self.snake.direction, "Negative direction should not turn")
+
+        self.snake.turn(DIRECTION_VALID.index("DOWN"))
+        self.assertEqual("UP", self.snake.direction, "Direction not countered")
+
+        self.snake.turn(DIRECTION_VALID.index("LEFT"))
+        self.assertEqual("LEFT", self.snake.direction, "Snake did not turn")
+        self.assertEqual(Point(self.pos_start.x - 1, self.pos_start.y), self.snake.next_step_head())
@@ -0,0 +1,31 @@
+
+import unittest
+import numpy as np
+
+from snake.boards import rays
+from snake.boards.grid import GridBoard
+from snake.objects import constants
+
+
+class TestRays(unittest.TestCase):
+    def test_ray_table_cached(self):
+        self.assertIs(rays.ray_table(16, 21), rays.ray_table(16, 21), "Table is computed more than once")
+
+    def test_ray_table_on_board(self):
+        table = rays.ray_table(16, 21)
+
+        self.assertEqual((16 * 21, 8, 20), table.shape, "Unexpected table dimensions")
+        self.assertTrue(np.all((table >= 0) & (table < 16 * 21)), "Ray leaves the board")
+
+    def test_wall_distances(self):
+        """ On an empty board the distances to the walls follow from the position.  """
+        cells = GridBoard._create_board(16, 21)
+        x, y = 3, 7
+        seen = cells.reshape(-1)[rays.ray_table(16, 21)[[x * 21 + y]]]
+        out = rays.distances(seen)[0]
+
+        expected = [min(x if dx < 0 else 15 - x if dx > 0 else 99, y if dy < 0 else 20 - y if dy > 0 else 99)
+                    for dx, dy in rays.DIRECTIONS]
+        self.assertEqual(expected, out[constants.CELL_WALL - 1].tolist(), "Wall distances are incorrect")
+        self.assertEqual([0] * 8, out[constants.CELL_SNAKE - 1].tolist(), "No snake should be seen")
+        self.assertEqual([0] * 8, out[constants.CELL_APPLE - 1].tolist(), "No apple should be seen")
@@ -0,0 +1,152 @@
+
+import unittest
+import numpy as np
+from mock import patch
+
+from snake.boards.free_cells import FreeCells
+from snake.boards.grid import GridBoard
+from snake.vec_env import SnakeVecEnv
+from snake.objects import constants
+from snake import constants as game_constants
+
+
+class TestSnakeVecEnv(unittest.TestCase):
+    def setUp(self) -> None:
+        self.env = SnakeVecEnv(8, width=16, height=21)
+
+    def test_reset(self):
+        obs = self.env.reset()
+
+        self.assertEqual((8, 24), obs.shape, "Observation dimensions are not as expected")
+        self.assertEqual([1] * 8, np.sum(self.env.cells == constants.CELL_SNAKE, axis=(1, 2)).tolist(),
+                         "Every board should start with a folded snake")
+        self.assertEqual([1] * 8, np.sum(self.env.cells == constants.CELL_APPLE, axis=(1, 2)).tolist(),
+                         "Every board should start with an apple")
+
+    def test_image_obs(self):
+        env = SnakeVecEnv(3, width=16, height=21, obs_type='image')
+        self.assertEqual((3, 21, 16, 3), env.reset().shape, "Image dimensions are not as expected")
+
+    def test_same_rules_as_grid_board(self):
+        """ Copy every game onto a GridBoard and check both step the same until a random apple spawns.  """
+        self.env.reset()
+        boards = []
+        for idx in range(self.env.num_envs):
+            board = GridBoard(self.env.width, self.env.height)
+            board.cells = self.env.cells[idx].copy()
+            board._apples = np.flatnonzero(board.cells == constants.CELL_APPLE).tolist()
+            board.free_cells = FreeCells(board.cells)
+            board._add_snake(self.env._body[idx, 0])
+            boards.append(board)
+        synced = np.ones(self.env.num_envs, dtype=bool)
+
+        for _ in range(100):
+            actions = np.random.randint(0, self.env.action_space.n, size=self.env.num_envs)
+            obs, rewards, dones, info = self.env.step(actions)
+
+            for idx in np.flatnonzero(synced):
+                boards[idx].step(actions[idx], values=False)
+                self.assertEqual(boards[idx].reward(), rewards[idx], "Rewards differ")
+                self.assertEqual(boards[idx].done(), dones[idx], "Done flags differ")
+
+                # Games are reset or spawn apples at random, after that they can no longer be compared
+                synced[idx] = not dones[idx] and rewards[idx] == game_constants.DEFAULT_REWARD_PER_STEP
+                if synced[idx]:
+                    self.assertEqual(boards[idx].cells.tolist(), self.env.cells[idx].tolist(), "Boards differ")
+                    self.assertEqual(boards[idx].vision().flatten().tolist(), obs[idx].tolist(),
+                                     "Observations differ")
+
+    def test_eat_apple_max_length(self):
+        """ Snakes of maximum length that eat move their tail along, so they leave no snake cells behind.  """
+        with patch.object(constants, "LEN_SNAKE_MAX", constants.LEN_SNAKE_START):
+            env = SnakeVecEnv(4, width=16, height=21)
+            env.seed(0)
+            env.reset()
+
+            # Every snake runs towards the side wall furthest away, so it unfolds without dying
+            x = env._body[env._rows, env._head] // env.height
+            actions = np.where(x < env.width // 2, game_constants.GET_ACTION_MEANING.index("RIGHT"),
+                               game_constants.GET_ACTION_MEANING.index("LEFT"))
+            for _ in range(constants.LEN_SNAKE_START):
+                env.step(actions)
+
+            # Put an apple in front of every snake
+            for idx in env._rows:
+                cell = env._body[idx, env._head[idx]] + env._step_offset[env._direction[idx]]
+                if env._flat[idx, cell] != constants.CELL_APPLE:
+                    env._flat[idx, cell] = constants.CELL_APPLE
+                    env._remove_free(np.array([idx]), np.array([cell]))
+            _, rewards, dones, _ = env.step(actions)
+
+        self.assertEqual([False] * 4, dones.tolist(), "Snakes died eating an apple")
+        self.assertTrue(np.all(rewards > game_constants.DEFAULT_REWARD_PER_STEP), "Snakes did not eat")
+        self.assertEqual([constants.LEN_SNAKE_START] * 4, env._length.tolist(), "Snakes grew beyond their maximum")
+        self.assertEqual([constants.LEN_SNAKE_START] * 4,
+                         np.sum(env.cells == constants.CELL_SNAKE, axis=(1, 2)).tolist(),
+                         "The tails left snake cells behind")
+        self.assertEqual(np.sum(env.cells == constants.CELL_GROUND, axis=(1, 2)).tolist(), env._free_count.tolist(),
+                         "The free cells do not match the boards")
+
+    def test_seed(self):
+        """ Every game plays the same as a GridBoard with the seed of that game.  """
+        seeds = self.env.seed(1234)
+        self.env.reset()
+        boards = []
+        for seed in seeds:
+            board = GridBoard(self.env.width, self.env.height)
+            board.seed(seed)
+            board.reset()
+            boards.append(board)
+        playing = np.ones(self.env.num_envs, dtype=bool)
+
+        for _ in range(300):
+            actions = np.random.randint(0, self.env.action_space.n, size=self.env.num_envs)
+            _, rewards, dones, _ = self.env.step(actions)
+
+            for idx in np.flatnonzero(playing):
+                boards[idx].step(actions[idx], values=False)
+                self.assertEqual(boards[idx].reward(), rewards[idx], "Rewards differ")
+                self.assertEqual(boards[idx].done(), dones[idx], "Done flags differ")
+                playing[idx] = not dones[idx]
+                if playing[idx]:
+                    self.assertEqual(boards[idx].cells.tolist(), self.env.cells[idx].tolist(), "Boards differ")
+
+    def test_auto_reset(self):
+        self.env.reset()
+        left = game_constants.GET_ACTION_MEANING.index("LEFT")
+
+        done = False
+        for _ in range(self.env.width):
+            obs, rewards, dones, info = self.env.step(np.full(self.env.num_envs, left))
+            done = dones[0]
+            if done:
+                break
+
+        self.assertEqual(True, done, "Running left should end at the wall")
+        self.assertIn(0, info["finished"], "Finished game is not reported")
+        self.assertEqual(len(info["finished"]), len(info["terminal_observation"]))
+        self.assertEqual(0, rewards[0], "Dying should not be rewarded")
+        self.assertEqual(constants.LEN_SNAKE_START, self.env._length[0], "Game is not reset")
+        self.assertEqual(0, self.env._life_time[0], "Game is not reset")
+
+    def test_detect_cycles(self):
+        """ Games of looping snakes end early, with the scores they get when their life is up.  """
+        weights = np.random.default_rng(0).integers(0, 100, size=24)
+        results = []
+        for detect_cycles in [False, True]:
+            env = SnakeVecEnv(32, width=16, height=21, detect_cycles=detect_cycles)
+            env.seed(99)
+            obs = env.reset()
+
+            # The actions only depend on the observations, like the actions of a genetic agent
+            scores, steps, playing = np.zeros(env.num_envs), 0, np.ones(env.num_envs, dtype=bool)
+            while playing.any():
+                obs, rewards, dones, _ = env.step((obs @ weights) % env.action_space.n)
+                scores += rewards * playing
+                steps += playing.sum()
+                playing &= ~dones
+            results.append((scores, steps))
+
+        np.testing.assert_array_equal(results[0][0], results[1][0], "Scores differ")
+        self.assertLess(results[1][1], results[0][1], "No loop is detected")
+
@@ -0,0 +1,70 @@
+"""
+Test script for benchmark.py
+"""
+import json
+import os
+import tempfile
+import unittest
+
+import gym
+
+import benchmark
+from snake.env import SnakeEnv
+
+
+class TestBenchmark(unittest.TestCase):
+    """
+    Testing class for the benchmark harness, with small benchmarks only.
+    """
+    def test_env(self):
+        """
+        Test if the steps of a grown snake are measured on both boards.
+        """
+        for board in ["classic", "grid"]:
+            result = benchmark.benchmark_env("SnakeGen-v1", 10, 12, length=8, board=board, steps=50)
+            self.assertEqual(8, result["length"])
+            self.assertGreater(result["steps_per_sec"], 0)
+            self.assertGreaterEqual(result["peak_bytes_per_step"], 0)
+
+    def test_grow(self):
+        """
+        Test if growing the snake does not give it more life.
+        """
+        for board in ["classic", "grid"]:
+            env = SnakeEnv(**dict(gym.spec("SnakeGen-v1")._kwargs, width=16, height=21, board=board))
+            env.reset()
+            for _ in range(3):
+                env.step(0)
+            life_left = env.env.board.info()["life_left"]
+            benchmark._grow(env, 8)
+            self.assertEqual(life_left, env.env.board.info()["life_left"])
+
+    def test_compare(self):
+        """
+        Test if only changes beyond the threshold in the wrong direction are regressions.
+        """
+        old = [dict(suite="env", name="Snake-v0", steps_per_sec=100.0, peak_bytes_per_step=10.0)]
+        new = [dict(suite="env", name="Snake-v0", steps_per_sec=95.0, peak_bytes_per_step=20.0),
+               dict(suite="env", name="Snake-v1", steps_per_sec=1.0)]
+        rows = benchmark.compare(new, old, threshold=0.1)
+        self.assertEqual({"steps_per_sec": False, "peak_bytes_per_step": True},
+                         {row[1]: row[-1] for row in rows})
+
+    def test_main(self):
+        """
+        Test if the results are written as json and compared with earlier results.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.json")
+            args = ["-s", "feedforward", "generation", "--hidden", "4", "--population", "4", "--generations", "1"]
+            self.assertEqual(0, benchmark.main(args + ["-o", output]))
+            with open(output) as file:
+                results = json.load(file)
+            self.assertEqual(["feedforward", "generation"], [result["suite"] for result in results["results"]])
+            self.assertIn("commit", results["metadata"])
+
+            self.assertIn(benchmark.main(args + ["-o", output, "-c", output]), [0, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Test script for tools/finder.py
+"""
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from models.random_model import RandomModel
+from tools import finder
+
+
+class TestFinder(unittest.TestCase):
+    """
+    Testing class for finding the models.
+    """
+    def setUp(self):
+        """
+        Set-up a models folder with a few modules and a cache file for its index.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.models_dir = self.directory.name
+        self.index_path = os.path.join(self.models_dir, "__pycache__", "model_index.json")
+        self.write("base_model.py", "class BaseModel:\n    pass\n")
+        self.write("a_model.py", "import os\n\n\ndef helper():\n    pass\n\n\nclass AModel:\n    pass\n")
+        self.write("no_class.py", "VALUE = 1\n")
+        self.write("_private.py", "class Private:\n    pass\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, source):
+        with open(os.path.join(self.models_dir, name), "w") as file:
+            file.write(source)
+
+    def test_model_index(self):
+        """
+        Test if the first class of every model module is found, base_model and private modules are skipped.
+        """
+        index = finder.model_index(self.models_dir, self.index_path)
+        self.assertEqual({"a_model": "AModel", "no_class": None}, index)
+        self.assertTrue(os.path.exists(self.index_path))
+
+    def test_cached(self):
+        """
+        Test if only modules that changed are read again.
+        """
+        finder.model_index(self.models_dir, self.index_path)
+        with mock.patch.object(finder, "_first_class", wraps=finder._first_class) as first_class:
+            self.assertEqual("AModel", finder.model_index(self.models_dir, self.index_path)["a_model"])
+            first_class.assert_not_called()
+
+            self.write("a_model.py", "class ChangedModel:\n    pass\n")
+            self.assertEqual("ChangedModel", finder.model_index(self.models_dir, self.index_path)["a_model"])
+            first_class.assert_called_once()
+
+    def test_class_definition(self):
+        """
+        Test if only whole class definitions at the top level are found.
+        """
+        self.write("a_model.py", '"""\nclass of the model\n"""\n\n\nclass AModel(object):\n    pass\n')
+        self.write("no_class.py", "classes = []\n\n\ndef helper():\n    class Inner:\n        pass\n")
+        self.assertEqual({"a_model": "AModel", "no_class": None}, finder.model_index(self.models_dir, self.index_path))
+
+    def test_failed_save(self):
+        """
+        Test if a failed write of the index leaves neither a cache nor a temporary file behind.
+        """
+        with mock.patch.object(finder.os, "replace", side_effect=OSError):
+            finder.model_index(self.models_dir, self.index_path)
+        self.assertEqual([], os.listdir(os.path.dirname(self.index_path)))
+
+    def test_model_finder(self):
+        """
+        Test if models are found on module and on class name.
+        """
+        self.assertIs(RandomModel, finder.model_finder("random_model"))
+        self.assertIs(RandomModel, finder.model_finder("RandomModel"))
+
+        # Names only match whole module or class names
+        for name in ["random_modelX", "RandomModelX", "random"]:
+            with contextlib.redirect_stdout(io.StringIO()), self.assertRaises(SystemExit):
+                finder.model_finder(name)
+
+
+if __name__ == '__main__':
+    unittest.main()
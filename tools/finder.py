@@ -1,8 +1,56 @@
 import os
-import glob
-import pyclbr
+import re
+import json
+import tempfile
 import importlib
 
+# Go up to retro_baseline folder
+MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models")
+
+# The index of the models is cached next to the compiled modules
+INDEX_PATH = os.path.join(MODELS_DIR, "__pycache__", "model_index.json")
+
+# A class definition at the top level of a module, the whole name up to the bases or the colon
+CLASS_DEFINITION = re.compile(r"^class\s+(\w+)\s*[(:]", re.MULTILINE)
+
+
+def model_index(models_dir=MODELS_DIR, index_path=INDEX_PATH):
+    """ Returns the name of the first class of every module located in the models folder.
+
+        Only modules that changed since the index was cached are read again,
+        so normally finding a model only takes a stat of every module.
+
+        :param models_dir: str
+            The folder with the model modules (non-recursive), base_model is skipped
+        :param index_path: str
+            The json file the index is cached in
+        :return dict
+            The module names mapped on the name of their first class, or None if they have no class
+    """
+    try:
+        with open(index_path) as file:
+            cached = json.load(file)
+    except (OSError, ValueError):
+        cached = dict()
+
+    # Every entry holds the modification time and size of the module and the name of its first class
+    index = dict()
+    for entry in sorted(os.scandir(models_dir), key=lambda each: each.name):
+        name, extension = os.path.splitext(entry.name)
+        if extension != ".py" or name.startswith("_") or name == "base_model" or not entry.is_file():
+            continue
+
+        stat = entry.stat()
+        key = [stat.st_mtime_ns, stat.st_size]
+        if name in cached and cached[name][:2] == key:
+            index[name] = cached[name]
+        else:
+            index[name] = key + [_first_class(entry.path)]
+
+    if index != cached:
+        _save_index(index, index_path)
+    return {name: class_name for name, (_, _, class_name) in index.items()}
+
 
 def model_finder(game_mode):
     """ Returns an initialized model.
@@ -15,47 +63,53 @@ def model_finder(game_mode):
             In case there are multiple classes inside a module, the first
             one will be selected.
     """
+    index = {name: class_name for name, class_name in model_index().items() if class_name is not None}
 
-    # Go up to retro_baseline folder
-    path_file = os.path.dirname(os.path.dirname(__file__))
-
-    # Find all modules located in models library (non-recursive), unequal to base_model
-    models = glob.glob(os.path.join(path_file, "models", "[!base_model]*.py"))
-
-    # Extract module name
-    models_name = [os.path.basename(each)[:-3] for each in models]
+    # Check for name as module
+    if game_mode in index:
+        # Import the module and return the class
+        module = importlib.import_module(f"models.{game_mode}")
+        return getattr(module, index[game_mode])
 
-    # Locate all classes inside the module
-    classes = [pyclbr.readmodule_ex("models." + name) for name in models_name]
+    # Check for name as Class Name
+    for module_name, class_name in index.items():
+        if class_name == game_mode:
+            # Import the module and return the class
+            module = importlib.import_module(f"models.{module_name}")
+            return getattr(module, game_mode)
 
-    # Select the first class from the module
-    classes_keys = [next(iter(k)) for k in classes]
+    # Combine the module name and first Class Name from that module and then
+    # make a single string out of them with enters between them.
+    valid = "\n  ".join([f'{k.ljust(25)}{v}' for (k, v) in index.items()])
+    print("\nUnrecognized model, valid inputs were:\n  "
+          f"{valid}")
+    exit(1)
 
-    # Check for name as module
-    if game_mode in models_name:
-        # Get the name of the class that has to be imported
-        to_import_class = classes_keys[models_name.index(game_mode)]
 
-        # Import the module
-        module = importlib.import_module(f"models.{game_mode}")
+def _first_class(path):
+    """ Returns the name of the first class defined at the top level of a module, or None.  """
+    with open(path, encoding="utf-8") as file:
+        match = CLASS_DEFINITION.search(file.read())
+    return match.group(1) if match else None
 
-        # Return class instance
-        return getattr(module, to_import_class)
 
-    # Check for name as Class Name
-    if game_mode in classes_keys:
-        # Get the name of the module that has to be imported
-        to_import_module = models_name[classes_keys.index(game_mode)]
-
-        # Import the module
-        module = importlib.import_module(f"models.{to_import_module}")
-
-        # Return class instance
-        return getattr(module, game_mode)
-    else:
-        # Combine the module name and first Class Name from that module and then
-        # make a single string out of them with enters between them.
-        valid = "\n  ".join([f'{k.ljust(25)}{v}' for (k, v) in zip(models_name, classes_keys)])
-        print("\nUnrecognized model, valid inputs were:\n  "
-              f"{valid}")
-        exit(1)
+def _save_index(index, index_path):
+    """ Atomically writes the index, the index is only a cache so failing to write it is ignored.  """
+    temp_path = None
+    try:
+        directory = os.path.dirname(index_path)
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=directory, suffix=".tmp", delete=False) as file:
+            temp_path = file.name
+            json.dump(index, file)
+        os.replace(temp_path, index_path)
+        temp_path = None
+    except OSError:
+        pass
+    finally:
+        # A failed write leaves no temporary file behind
+        if temp_path is not None:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
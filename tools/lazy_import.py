@@ -0,0 +1,13 @@
+import functools
+
+from tools.suppress import suppress_stdout
+
+
+@functools.lru_cache(maxsize=None)
+def import_pygame():
+    """ Imports pygame on first use, so headless runs never load it.  """
+    # This suppresses the welcome message from pygame
+    # Hello from the pygame community. https://www.pygame.org/contribute.html
+    with suppress_stdout():
+        import pygame
+    return pygame